@@ -91,6 +91,11 @@ public partial class binance : ccxt.binance
             } },
             { "options", new Dictionary<string, object>() {
                 { "returnRateLimits", false },
+                { "subscriptionBatch", new Dictionary<string, object>() {
+                    { "field", "params" },
+                    { "id", "id" },
+                    { "limit", 200 },
+                } },
                 { "streamLimits", new Dictionary<string, object>() {
                     { "spot", 50 },
                     { "margin", 50 },
@@ -945,10 +950,7 @@ public partial class binance : ccxt.binance
 
     public override void handleDeltas(object bookside, object deltas)
     {
-        for (object i = 0; isLessThan(i, getArrayLength(deltas)); postFixIncrement(ref i))
-        {
-            this.handleDelta(bookside, getValue(deltas, i));
-        }
+        this.handleDeltasWithKeys(bookside, deltas);
     }
 
     public virtual object handleOrderBookMessage(WebSocketClient client, object message, object orderbook)
@@ -1117,16 +1119,21 @@ public partial class binance : ccxt.binance
         //
         object id = this.safeString(message, "id");
         object subscriptionsById = this.indexBy(((WebSocketClient)client).subscriptions, "id");
-        object subscription = this.safeValue(subscriptionsById, id, new Dictionary<string, object>() {});
-        object method = this.safeValue(subscription, "method");
-        if (isTrue(!isEqual(method, null)))
-        {
-            DynamicInvoker.InvokeMethod(method, new object[] { client, message, subscription});
-        }
-        object isUnSubMessage = this.safeBool(subscription, "unsubscribe", false);
-        if (isTrue(isUnSubMessage))
+        // a message sent together with others acknowledges all of them, see Client.batchedIds
+        object ids = callDynamically(client as WebSocketClient, "batchedIds", new object[] {id});
+        for (object i = 0; isLessThan(i, getArrayLength(ids)); postFixIncrement(ref i))
         {
-            this.handleUnSubscription(client as WebSocketClient, subscription);
+            object subscription = this.safeValue(subscriptionsById, getValue(ids, i), new Dictionary<string, object>() {});
+            object method = this.safeValue(subscription, "method");
+            if (isTrue(!isEqual(method, null)))
+            {
+                DynamicInvoker.InvokeMethod(method, new object[] { client, message, subscription});
+            }
+            object isUnSubMessage = this.safeBool(subscription, "unsubscribe", false);
+            if (isTrue(isUnSubMessage))
+            {
+                this.handleUnSubscription(client as WebSocketClient, subscription);
+            }
         }
         return message;
     }
@@ -675,7 +675,8 @@ public partial class bitfinex2 : ccxt.bitfinex2
                     object size = ((bool) isTrue((isLessThan(amount, 0)))) ? prefixUnaryNeg(ref amount) : amount;
                     object side = ((bool) isTrue((isLessThan(amount, 0)))) ? "asks" : "bids";
                     object bookside = getValue(orderbook, side);
-                    (bookside as IOrderBookSide).storeArray(new List<object>() {price, size, counter});
+                    // the checksum uses the signed amount
+                    callDynamically(bookside, "storeStringArray", new object[] {new List<object>() {price, size, counter}, new List<object>() {this.numberToString(price), this.numberToString(amount)}});
                 }
             }
             ((IDictionary<string,object>)orderbook)["symbol"] = symbol;
@@ -704,7 +705,8 @@ public partial class bitfinex2 : ccxt.bitfinex2
                 object size = ((bool) isTrue(Precise.stringLt(amount, "0"))) ? Precise.stringNeg(amount) : amount;
                 object side = ((bool) isTrue(Precise.stringLt(amount, "0"))) ? "asks" : "bids";
                 object bookside = getValue(orderbookItem, side);
-                (bookside as IOrderBookSide).storeArray(new List<object> {this.parseNumber(price), this.parseNumber(size), this.parseNumber(counter)});
+                object parsedPrice = this.parseNumber(price);
+                callDynamically(bookside, "storeStringArray", new object[] {new List<object>() {parsedPrice, this.parseNumber(size), this.parseNumber(counter)}, new List<object>() {this.numberToString(parsedPrice), this.numberToString(this.parseNumber(amount))}});
             }
             callDynamically(client as WebSocketClient, "resolve", new object[] {orderbook, messageHash});
         }
@@ -732,20 +734,41 @@ public partial class bitfinex2 : ccxt.bitfinex2
         object isRaw = (isEqual(prec, "R0"));
         object idToCheck = ((bool) isTrue(isRaw)) ? 2 : 0;
         // pepperoni pizza from bitfinex
-        for (object i = 0; isLessThan(i, depth); postFixIncrement(ref i))
+        if (isTrue(isRaw))
         {
-            object bid = this.safeValue(bids, i);
-            object ask = this.safeValue(asks, i);
-            if (isTrue(!isEqual(bid, null)))
+            for (object i = 0; isLessThan(i, depth); postFixIncrement(ref i))
             {
-                ((IList<object>)stringArray).Add(this.numberToString(getValue(getValue(bids, i), idToCheck)));
-                ((IList<object>)stringArray).Add(this.numberToString(getValue(getValue(bids, i), 1)));
+                object bid = this.safeValue(bids, i);
+                object ask = this.safeValue(asks, i);
+                if (isTrue(!isEqual(bid, null)))
+                {
+                    ((IList<object>)stringArray).Add(this.numberToString(getValue(getValue(bids, i), idToCheck)));
+                    ((IList<object>)stringArray).Add(this.numberToString(getValue(getValue(bids, i), 1)));
+                }
+                if (isTrue(!isEqual(ask, null)))
+                {
+                    ((IList<object>)stringArray).Add(this.numberToString(getValue(getValue(asks, i), idToCheck)));
+                    object aski1 = getValue(getValue(asks, i), 1);
+                    ((IList<object>)stringArray).Add(this.numberToString(prefixUnaryNeg(ref aski1)));
+                }
             }
-            if (isTrue(!isEqual(ask, null)))
+        } else
+        {
+            // price level books keep the checksum strings of their top levels
+            object bidStrings = callDynamically(bids, "topStrings", new object[] {depth});
+            object askStrings = callDynamically(asks, "topStrings", new object[] {depth});
+            for (object i = 0; isLessThan(i, depth); postFixIncrement(ref i))
             {
-                ((IList<object>)stringArray).Add(this.numberToString(getValue(getValue(asks, i), idToCheck)));
-                object aski1 = getValue(getValue(asks, i), 1);
-                ((IList<object>)stringArray).Add(this.numberToString(prefixUnaryNeg(ref aski1)));
+                if (isTrue(isLessThan(multiply(i, 2), getArrayLength(bidStrings))))
+                {
+                    ((IList<object>)stringArray).Add(getValue(bidStrings, multiply(i, 2)));
+                    ((IList<object>)stringArray).Add(getValue(bidStrings, add(multiply(i, 2), 1)));
+                }
+                if (isTrue(isLessThan(multiply(i, 2), getArrayLength(askStrings))))
+                {
+                    ((IList<object>)stringArray).Add(getValue(askStrings, multiply(i, 2)));
+                    ((IList<object>)stringArray).Add(getValue(askStrings, add(multiply(i, 2), 1)));
+                }
             }
         }
         object payload = String.Join(":", ((IList<object>)stringArray).ToArray());
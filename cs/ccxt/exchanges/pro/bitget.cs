@@ -723,19 +723,26 @@ public partial class bitget : ccxt.bitget
             // storedOrderBook = this.safeValue (this.orderbooks, symbol);
             if (!isTrue((inOp(this.orderbooks, symbol))))
             {
-                // const ob = this.orderBook ({});
-                object ob = this.countedOrderBook(new Dictionary<string, object>() {});
+                object ob = this.orderBook(new Dictionary<string, object>() {});
                 ((IDictionary<string,object>)ob)["symbol"] = symbol;
                 ((IDictionary<string,object>)this.orderbooks)[(string)symbol] = ob;
             }
             object storedOrderBook = getValue(this.orderbooks, symbol);
             object asks = this.safeValue(rawOrderBook, "asks", new List<object>() {});
             object bids = this.safeValue(rawOrderBook, "bids", new List<object>() {});
-            this.handleDeltas(getValue(storedOrderBook, "asks"), asks);
-            this.handleDeltas(getValue(storedOrderBook, "bids"), bids);
+            object checksum = this.safeBool(this.options, "checksum", true);
+            if (isTrue(checksum))
+            {
+                // keep the price and amount strings for the checksum
+                this.handleDeltas(getValue(storedOrderBook, "asks"), asks);
+                this.handleDeltas(getValue(storedOrderBook, "bids"), bids);
+            } else
+            {
+                this.handleDeltasWithKeys(getValue(storedOrderBook, "asks"), asks);
+                this.handleDeltasWithKeys(getValue(storedOrderBook, "bids"), bids);
+            }
             ((IDictionary<string,object>)storedOrderBook)["timestamp"] = timestamp;
             ((IDictionary<string,object>)storedOrderBook)["datetime"] = this.iso8601(timestamp);
-            object checksum = this.safeBool(this.options, "checksum", true);
             object isSnapshot = isEqual(this.safeString(message, "action"), "snapshot"); // snapshot does not have a checksum
             if (isTrue(!isTrue(isSnapshot) && isTrue(checksum)))
             {
@@ -743,18 +750,20 @@ public partial class bitget : ccxt.bitget
                 object storedBids = getValue(storedOrderBook, "bids");
                 object asksLength = getArrayLength(storedAsks);
                 object bidsLength = getArrayLength(storedBids);
+                object bidStrings = callDynamically(storedBids, "topStrings", new object[] {25});
+                object askStrings = callDynamically(storedAsks, "topStrings", new object[] {25});
                 object payloadArray = new List<object>() {};
                 for (object i = 0; isLessThan(i, 25); postFixIncrement(ref i))
                 {
                     if (isTrue(isLessThan(i, bidsLength)))
                     {
-                        ((IList<object>)payloadArray).Add(getValue(getValue(getValue(storedBids, i), 2), 0));
-                        ((IList<object>)payloadArray).Add(getValue(getValue(getValue(storedBids, i), 2), 1));
+                        ((IList<object>)payloadArray).Add(getValue(bidStrings, multiply(i, 2)));
+                        ((IList<object>)payloadArray).Add(getValue(bidStrings, add(multiply(i, 2), 1)));
                     }
                     if (isTrue(isLessThan(i, asksLength)))
                     {
-                        ((IList<object>)payloadArray).Add(getValue(getValue(getValue(storedAsks, i), 2), 0));
-                        ((IList<object>)payloadArray).Add(getValue(getValue(getValue(storedAsks, i), 2), 1));
+                        ((IList<object>)payloadArray).Add(getValue(askStrings, multiply(i, 2)));
+                        ((IList<object>)payloadArray).Add(getValue(askStrings, add(multiply(i, 2), 1)));
                     }
                 }
                 object payload = String.Join(":", ((IList<object>)payloadArray).ToArray());
@@ -789,11 +798,11 @@ public partial class bitget : ccxt.bitget
 
     public override void handleDelta(object bookside, object delta)
     {
-        object bidAsk = this.parseBidAsk(delta, 0, 1);
         // we store the string representations in the orderbook for checksum calculation
         // this simplifies the code for generating checksums as we do not need to do any complex number transformations
-        ((IList<object>)bidAsk).Add(delta);
-        (bookside as IOrderBookSide).storeArray(bidAsk);
+        object priceString = this.safeString(delta, 0);
+        object amountString = this.safeString(delta, 1);
+        callDynamically(bookside, "storeStringArray", new object[] {new List<object>() {this.parseNumber(priceString), this.parseNumber(amountString)}, new List<object>() {priceString, amountString}});
     }
 
     public override void handleDeltas(object bookside, object deltas)
@@ -99,6 +99,11 @@ public partial class bybit : ccxt.bybit
                 } },
             } },
             { "options", new Dictionary<string, object>() {
+                { "subscriptionBatch", new Dictionary<string, object>() {
+                    { "field", "args" },
+                    { "id", "req_id" },
+                    { "limit", 10 },
+                } },
                 { "watchTicker", new Dictionary<string, object>() {
                     { "name", "tickers" },
                 } },
@@ -1086,10 +1091,7 @@ public partial class bybit : ccxt.bybit
 
     public override void handleDeltas(object bookside, object deltas)
     {
-        for (object i = 0; isLessThan(i, getArrayLength(deltas)); postFixIncrement(ref i))
-        {
-            this.handleDelta(bookside, getValue(deltas, i));
-        }
+        this.handleDeltasWithKeys(bookside, deltas);
     }
 
     public async override Task<object> watchTrades(object symbol, object since = null, object limit = null, object parameters = null)
@@ -2784,6 +2786,8 @@ public partial class bybit : ccxt.bybit
         //     },
         // }
         object reqId = this.safeString(message, "req_id");
+        // a message sent together with others acknowledges all of them, see Client.batchedIds
+        object reqIds = callDynamically(client as WebSocketClient, "batchedIds", new object[] {reqId});
         object keys = new List<object>(((IDictionary<string,object>)((WebSocketClient)client).subscriptions).Keys);
         for (object i = 0; isLessThan(i, getArrayLength(keys)); postFixIncrement(ref i))
         {
@@ -2796,7 +2800,7 @@ public partial class bybit : ccxt.bybit
             {
                 object subscription = getValue(((WebSocketClient)client).subscriptions, messageHash);
                 object subId = this.safeString(subscription, "id");
-                if (isTrue(!isEqual(reqId, subId)))
+                if (!isTrue(this.inArray(subId, reqIds)))
                 {
                     continue;
                 }
@@ -607,18 +607,17 @@ public partial class gate : ccxt.gate
 
     public virtual void handleBidAsks(object bookSide, object bidAsks)
     {
-        for (object i = 0; isLessThan(i, getArrayLength(bidAsks)); postFixIncrement(ref i))
+        object first = this.safeValue(bidAsks, 0);
+        if (isTrue(isEqual(first, null)))
         {
-            object bidAsk = getValue(bidAsks, i);
-            if (isTrue(((bidAsk is IList<object>) || (bidAsk.GetType().IsGenericType && bidAsk.GetType().GetGenericTypeDefinition().IsAssignableFrom(typeof(List<>))))))
-            {
-                (bookSide as IOrderBookSide).storeArray(this.parseBidAsk(bidAsk));
-            } else
-            {
-                object price = this.safeFloat(bidAsk, "p");
-                object amount = this.safeFloat(bidAsk, "s");
-                (bookSide as IOrderBookSide).store(price, amount);
-            }
+            return;
+        }
+        if (isTrue(((first is IList<object>) || (first.GetType().IsGenericType && first.GetType().GetGenericTypeDefinition().IsAssignableFrom(typeof(List<>))))))
+        {
+            this.handleDeltasWithKeys(bookSide, bidAsks);
+        } else
+        {
+            this.handleDeltasWithKeys(bookSide, bidAsks, "p", "s");
         }
     }
 
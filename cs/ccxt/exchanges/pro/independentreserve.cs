@@ -204,40 +204,27 @@ public partial class independentreserve : ccxt.independentreserve
         object orderbook = getValue(this.orderbooks, symbol);
         if (isTrue(isEqual(eventVar, "OrderBookSnapshot")))
         {
-            object snapshot = this.parseOrderBook(orderBook, symbol, timestamp, "Bids", "Offers", "Price", "Volume");
-            (orderbook as IOrderBook).reset(snapshot);
+            // the snapshot levels are stored like deltas to keep their checksum strings
+            (orderbook as IOrderBook).reset(new Dictionary<string, object>() {
+                { "symbol", symbol },
+                { "bids", new List<object>() {} },
+                { "asks", new List<object>() {} },
+            });
             ((IDictionary<string,object>)subscription)["receivedSnapshot"] = true;
-        } else
-        {
-            object asks = this.safeList(orderBook, "Offers", new List<object>() {});
-            object bids = this.safeList(orderBook, "Bids", new List<object>() {});
-            this.handleDeltas(getValue(orderbook, "asks"), asks);
-            this.handleDeltas(getValue(orderbook, "bids"), bids);
-            ((IDictionary<string,object>)orderbook)["timestamp"] = timestamp;
-            ((IDictionary<string,object>)orderbook)["datetime"] = this.iso8601(timestamp);
         }
+        object asks = this.safeList(orderBook, "Offers", new List<object>() {});
+        object bids = this.safeList(orderBook, "Bids", new List<object>() {});
+        this.handleDeltas(getValue(orderbook, "asks"), asks);
+        this.handleDeltas(getValue(orderbook, "bids"), bids);
+        ((IDictionary<string,object>)orderbook)["timestamp"] = timestamp;
+        ((IDictionary<string,object>)orderbook)["datetime"] = this.iso8601(timestamp);
         object checksum = this.handleOption("watchOrderBook", "checksum", true);
         if (isTrue(isTrue(checksum) && isTrue(receivedSnapshot)))
         {
             object storedAsks = getValue(orderbook, "asks");
             object storedBids = getValue(orderbook, "bids");
-            object asksLength = getArrayLength(storedAsks);
-            object bidsLength = getArrayLength(storedBids);
-            object payload = "";
-            for (object i = 0; isLessThan(i, 10); postFixIncrement(ref i))
-            {
-                if (isTrue(isLessThan(i, bidsLength)))
-                {
-                    payload = add(add(payload, this.valueToChecksum(getValue(getValue(storedBids, i), 0))), this.valueToChecksum(getValue(getValue(storedBids, i), 1)));
-                }
-            }
-            for (object i = 0; isLessThan(i, 10); postFixIncrement(ref i))
-            {
-                if (isTrue(isLessThan(i, asksLength)))
-                {
-                    payload = add(add(payload, this.valueToChecksum(getValue(getValue(storedAsks, i), 0))), this.valueToChecksum(getValue(getValue(storedAsks, i), 1)));
-                }
-            }
+            // every level keeps its checksum string, computed once when the level was stored
+            object payload = add(String.Join("", ((IList<object>)callDynamically(storedBids, "topStrings", new object[] {10})).ToArray()), String.Join("", ((IList<object>)callDynamically(storedAsks, "topStrings", new object[] {10})).ToArray()));
             object calculatedChecksum = this.crc32(payload, true);
             object responseChecksum = this.safeInteger(orderBook, "Crc32");
             if (isTrue(!isEqual(calculatedChecksum, responseChecksum)))
@@ -267,7 +254,13 @@ public partial class independentreserve : ccxt.independentreserve
     public override void handleDelta(object bookside, object delta)
     {
         object bidAsk = this.parseBidAsk(delta, "Price", "Volume");
-        (bookside as IOrderBookSide).storeArray(bidAsk);
+        if (isTrue(getValue(bidAsk, 1)))
+        {
+            callDynamically(bookside, "storeStringArray", new object[] {bidAsk, new List<object>() {add(this.valueToChecksum(getValue(bidAsk, 0)), this.valueToChecksum(getValue(bidAsk, 1)))}});
+        } else
+        {
+            callDynamically(bookside, "storeStringArray", new object[] {bidAsk, new List<object>() {}});
+        }
     }
 
     public override void handleDeltas(object bookside, object deltas)
@@ -882,41 +882,24 @@ public partial class kraken : ccxt.kraken
             }
             object storedAsks = getValue(orderbook, "asks");
             object storedBids = getValue(orderbook, "bids");
-            object example = null;
             if (isTrue(!isEqual(a, null)))
             {
                 timestamp = this.customHandleDeltas(storedAsks, a, timestamp);
-                example = this.safeValue(a, 0);
             }
             if (isTrue(!isEqual(b, null)))
             {
                 timestamp = this.customHandleDeltas(storedBids, b, timestamp);
-                example = this.safeValue(b, 0);
             }
             // don't remove this line or I will poop on your face
             (orderbook as IOrderBook).limit();
             object checksum = this.handleOption("watchOrderBook", "checksum", true);
             if (isTrue(checksum))
             {
-                object priceString = this.safeString(example, 0);
-                object amountString = this.safeString(example, 1);
-                object priceParts = ((string)priceString).Split(new [] {((string)".")}, StringSplitOptions.None).ToList<object>();
-                object amountParts = ((string)amountString).Split(new [] {((string)".")}, StringSplitOptions.None).ToList<object>();
-                object priceLength = subtract(((string)getValue(priceParts, 1)).Length, 0);
-                object amountLength = subtract(((string)getValue(amountParts, 1)).Length, 0);
                 object payloadArray = new List<object>() {};
                 if (isTrue(!isEqual(c, null)))
                 {
-                    for (object i = 0; isLessThan(i, 10); postFixIncrement(ref i))
-                    {
-                        object formatted = add(this.formatNumber(getValue(getValue(storedAsks, i), 0), priceLength), this.formatNumber(getValue(getValue(storedAsks, i), 1), amountLength));
-                        ((IList<object>)payloadArray).Add(formatted);
-                    }
-                    for (object i = 0; isLessThan(i, 10); postFixIncrement(ref i))
-                    {
-                        object formatted = add(this.formatNumber(getValue(getValue(storedBids, i), 0), priceLength), this.formatNumber(getValue(getValue(storedBids, i), 1), amountLength));
-                        ((IList<object>)payloadArray).Add(formatted);
-                    }
+                    // every level keeps its checksum string, computed once when the level was stored
+                    payloadArray = this.arrayConcat(callDynamically(storedAsks, "topStrings", new object[] {10}), callDynamically(storedBids, "topStrings", new object[] {10}));
                 }
                 object payload = String.Join("", ((IList<object>)payloadArray).ToArray());
                 object localChecksum = this.crc32(payload, false);
@@ -958,6 +941,19 @@ public partial class kraken : ccxt.kraken
         }
     }
 
+    public virtual object checksumString(object value)
+    {
+        // the checksum is built from the strings received from the exchange
+        // with the decimal point and the leading zeros removed
+        object joined = ((string)value).Replace((string)".", (string)"");
+        object i = 0;
+        while (isTrue((isLessThan(i, ((string)joined).Length))) && isTrue((isEqual(getValue(joined, i), "0"))))
+        {
+            i = add(i, 1);
+        }
+        return slice(joined, i, null);
+    }
+
     public virtual object customHandleDeltas(object bookside, object deltas, object timestamp = null)
     {
         for (object j = 0; isLessThan(j, getArrayLength(deltas)); postFixIncrement(ref j))
@@ -967,7 +963,7 @@ public partial class kraken : ccxt.kraken
             object amount = this.parseNumber(getValue(delta, 1));
             object oldTimestamp = ((bool) isTrue(timestamp)) ? timestamp : 0;
             timestamp = mathMax(oldTimestamp, this.parseToInt(multiply(parseFloat(getValue(delta, 2)), 1000)));
-            (bookside as IOrderBookSide).store(price, amount);
+            callDynamically(bookside, "storeStringArray", new object[] {new List<object>() {price, amount}, new List<object>() {add(this.checksumString(getValue(delta, 0)), this.checksumString(getValue(delta, 1)))}});
         }
         return timestamp;
     }
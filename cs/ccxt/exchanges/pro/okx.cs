@@ -46,6 +46,10 @@ public partial class okx : ccxt.okx
                 } },
             } },
             { "options", new Dictionary<string, object>() {
+                { "subscriptionBatch", new Dictionary<string, object>() {
+                    { "field", "args" },
+                    { "limit", 100 },
+                } },
                 { "watchOrderBook", new Dictionary<string, object>() {
                     { "checksum", true },
                     { "depth", "books" },
@@ -1344,6 +1348,17 @@ public partial class okx : ccxt.okx
         }
     }
 
+    public virtual void handleStringDeltas(object bookside, object deltas)
+    {
+        for (object i = 0; isLessThan(i, getArrayLength(deltas)); postFixIncrement(ref i))
+        {
+            object delta = getValue(deltas, i);
+            object priceString = this.safeString(delta, 0);
+            object amountString = this.safeString(delta, 1);
+            callDynamically(bookside, "storeStringArray", new object[] {new List<object>() {this.parseNumber(priceString), this.parseNumber(amountString)}, new List<object>() {priceString, amountString}});
+        }
+    }
+
     public virtual object handleOrderBookMessage(WebSocketClient client, object message, object orderbook, object messageHash, object market = null)
     {
         //
@@ -1369,11 +1384,20 @@ public partial class okx : ccxt.okx
         object bids = this.safeValue(message, "bids", new List<object>() {});
         object storedAsks = getValue(orderbook, "asks");
         object storedBids = getValue(orderbook, "bids");
-        this.handleDeltas(storedAsks, asks);
-        this.handleDeltas(storedBids, bids);
+        object checksum = this.handleOption("watchOrderBook", "checksum", true);
+        if (isTrue(checksum))
+        {
+            // keep the price and amount strings for the checksum
+            this.handleStringDeltas(storedAsks, asks);
+            this.handleStringDeltas(storedBids, bids);
+        } else
+        {
+            // the levels are [ price, amount, liquidated orders, orders ], no count is stored, as in handleDelta
+            this.handleDeltasWithKeys(storedAsks, asks, 0, 1, 4);
+            this.handleDeltasWithKeys(storedBids, bids, 0, 1, 4);
+        }
         object marketId = this.safeString(message, "instId");
         object symbol = this.safeSymbol(marketId, market);
-        object checksum = this.handleOption("watchOrderBook", "checksum", true);
         object seqId = this.safeInteger(message, "seqId");
         if (isTrue(checksum))
         {
@@ -1381,18 +1405,20 @@ public partial class okx : ccxt.okx
             object nonce = getValue(orderbook, "nonce");
             object asksLength = getArrayLength(storedAsks);
             object bidsLength = getArrayLength(storedBids);
+            object bidStrings = callDynamically(storedBids, "topStrings", new object[] {25});
+            object askStrings = callDynamically(storedAsks, "topStrings", new object[] {25});
             object payloadArray = new List<object>() {};
             for (object i = 0; isLessThan(i, 25); postFixIncrement(ref i))
             {
                 if (isTrue(isLessThan(i, bidsLength)))
                 {
-                    ((IList<object>)payloadArray).Add(this.numberToString(getValue(getValue(storedBids, i), 0)));
-                    ((IList<object>)payloadArray).Add(this.numberToString(getValue(getValue(storedBids, i), 1)));
+                    ((IList<object>)payloadArray).Add(getValue(bidStrings, multiply(i, 2)));
+                    ((IList<object>)payloadArray).Add(getValue(bidStrings, add(multiply(i, 2), 1)));
                 }
                 if (isTrue(isLessThan(i, asksLength)))
                 {
-                    ((IList<object>)payloadArray).Add(this.numberToString(getValue(getValue(storedAsks, i), 0)));
-                    ((IList<object>)payloadArray).Add(this.numberToString(getValue(getValue(storedAsks, i), 1)));
+                    ((IList<object>)payloadArray).Add(getValue(askStrings, multiply(i, 2)));
+                    ((IList<object>)payloadArray).Add(getValue(askStrings, add(multiply(i, 2), 1)));
                 }
             }
             object payload = String.Join(":", ((IList<object>)payloadArray).ToArray());
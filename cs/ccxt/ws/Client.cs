@@ -152,6 +152,13 @@ public partial class Exchange
             }
         }
 
+        public object batchedIds(object id)
+        {
+            // the ids of the messages that were sent as one message with this id
+            // subscriptions are only sent together in python, see options['ws']['coalesceSubscriptions']
+            return new List<object>() { id };
+        }
+
         public void reset(object message2)
         {
             // stub implement this later
@@ -159,6 +159,7 @@ public class OrderBook : CustomConcurrentDictionary<string, object>, IOrderBook
         lock (_syncRoot)
         {
             this._asks._index.Clear();
+            this._asks._strings.Clear();
             this._asks.Clear();
 
             var snapshotAsks = Exchange.SafeValue(snapshot as dict, "asks") as List<object>;
@@ -168,6 +169,7 @@ public class OrderBook : CustomConcurrentDictionary<string, object>, IOrderBook
             }
 
             this._bids._index.Clear();
+            this._bids._strings.Clear();
             this._bids.Clear();
             var snapshotBids = Exchange.SafeValue(snapshot as dict, "bids") as List<object>;
             for (var i = 0; i < snapshotBids.Count; i++)
@@ -273,6 +275,7 @@ public class CountedOrderBook : OrderBook, IOrderBook
         lock (_syncRoot)
         {
             this.asks._index.Clear();
+            this.asks._strings.Clear();
             this.asks.Clear();
 
             var snapshotAsks = Exchange.SafeValue(snapshot as dict, "asks") as List<object>;
@@ -282,6 +285,7 @@ public class CountedOrderBook : OrderBook, IOrderBook
             }
 
             this.bids._index.Clear();
+            this.bids._strings.Clear();
             this.bids.Clear();
             var snapshotBids = Exchange.SafeValue(snapshot as dict, "bids") as List<object>;
             for (var i = 0; i < snapshotBids.Count; i++)
@@ -21,6 +21,8 @@ public interface IOrderBookSide : IList<object>
 {
     void store(object price, object size);
     void storeArray(object delta);
+    void storeStringArray(object delta, object strings);
+    object topStrings(object n);
     void limit();
     void store(object price, object size, object order_id);
     IOrderBookSide Copy();
@@ -85,6 +87,9 @@ public class OrderBookSide : SlimConcurrentList<object>, IOrderBookSide
         }
     }
 
+    // the strings of the levels stored with storeStringArray, by index price
+    public Dictionary<decimal, object> _strings = new Dictionary<decimal, object>();
+
     // public int Count = 0;
 
     private int __depth;
@@ -203,6 +208,48 @@ public class OrderBookSide : SlimConcurrentList<object>, IOrderBookSide
         }
     }
 
+    public void storeStringArray(object delta2, object strings)
+    {
+        lock (_syncRoot)
+        {
+            // same as storeArray but also keeps a list of strings for the level
+            // usually the price and amount exactly as the exchange sent them
+            // so that checksums don't have to format numbers back into strings
+            var delta = (IList<object>)delta2;
+            var price = Convert.ToDecimal(delta[0]);
+            var index_price = (this.side) ? -price : price;
+            this.storeArray(delta);
+            this.storeStrings(index_price, Convert.ToDecimal(delta[1]) != 0, strings);
+        }
+    }
+
+    protected void storeStrings(decimal index_price, bool keep, object strings)
+    {
+        if (keep)
+        {
+            this._strings[index_price] = strings;
+        }
+        else
+        {
+            this._strings.Remove(index_price);
+        }
+    }
+
+    public object topStrings(object n)
+    {
+        lock (_syncRoot)
+        {
+            // the strings of the first n levels flattened into one list
+            var result = new List<object>();
+            var length = Math.Min(Convert.ToInt32(n), this.Count);
+            for (var i = 0; i < length; i++)
+            {
+                result.AddRange((IList<object>)this._strings[this._index[i]]);
+            }
+            return result;
+        }
+    }
+
     public void limit()
     {
         lock (_syncRoot)
@@ -211,6 +258,7 @@ public class OrderBookSide : SlimConcurrentList<object>, IOrderBookSide
             for (var i = 0; i < different; i++)
             {
                 var length = this.Count;
+                this._strings.Remove(this._index[length - 1]);
                 this.RemoveAt(length - 1);
                 this._index.RemoveAt(length - 1); // don't use this.Count because it mutates from one line to the other
             }
@@ -303,6 +351,18 @@ public class CountedOrderBookSide : OrderBookSide, IOrderBookSide
         }
     }
 
+    public void storeStringArray(object delta2, object strings)
+    {
+        lock (_syncRoot)
+        {
+            var delta = (IList<object>)delta2;
+            var price = Convert.ToDecimal(delta[0]);
+            var index_price = (this.side) ? -price : price;
+            this.storeArray(delta);
+            this.storeStrings(index_price, Convert.ToDecimal(delta[1]) != 0 && Convert.ToDecimal(delta[2]) != 0, strings);
+        }
+    }
+
     public void storeArray(object deltaArra2)
     {
         lock (_syncRoot)
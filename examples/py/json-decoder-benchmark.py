@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import random
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.base.json_decoder import DECODERS, get_decoder, decode_quoted_json  # noqa: E402
+
+# compares the JSON decoders on binance depth and ticker messages
+# as they come from the websocket, in bytes, and on a REST depth response
+# decoders that aren't installed fall back to json and show the same numbers
+# usage: python json-decoder-benchmark.py [number of messages]
+
+
+def depth_update(levels):
+    def side(mid, direction):
+        return [['%.2f' % (mid + direction * i * 0.01), '%.8f' % random.uniform(0, 5)] for i in range(levels)]
+    return {
+        'e': 'depthUpdate',
+        'E': 1700000000000 + random.randint(0, 100000),
+        's': 'BTCUSDT',
+        'U': 40000000000,
+        'u': 40000000000 + levels,
+        'b': side(37000, -1),
+        'a': side(37000.01, 1),
+    }
+
+
+def ticker():
+    return {
+        'stream': 'btcusdt@ticker',
+        'data': {
+            'e': '24hrTicker', 'E': 1700000000000, 's': 'BTCUSDT', 'p': '-120.01000000', 'P': '-0.323',
+            'w': '37050.12345678', 'x': '37120.00000000', 'c': '37000.01000000', 'Q': '0.00100000',
+            'b': '37000.00000000', 'B': '1.23400000', 'a': '37000.01000000', 'A': '0.56700000',
+            'o': '37120.02000000', 'h': '37500.00000000', 'l': '36800.00000000', 'v': '25000.12345000',
+            'q': '926250000.12345678', 'O': 1699913600000, 'C': 1700000000000, 'F': 3000000000,
+            'L': 3001000000, 'n': 1000001,
+        },
+    }
+
+
+def run(decode, messages):
+    start = time.perf_counter()
+    for message in messages:
+        decode(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    random.seed(42)
+    payloads = {
+        'depth diff (20 levels)': [json.dumps(depth_update(20)).encode() for _ in range(count)],
+        'ticker': [json.dumps(ticker()).encode() for _ in range(count)],
+        'rest depth (1000 levels)': [json.dumps(depth_update(1000)).encode() for _ in range(count // 100)],
+    }
+    print('payload', 'decoder', 'messages/sec')
+    for payload, messages in payloads.items():
+        # what the websocket client did before, a str decode followed by json.loads
+        print(payload, 'decode() + json.loads', int(run(lambda message: json.loads(message.decode()), messages)))
+        for name in DECODERS:
+            print(payload, name, int(run(get_decoder(name), messages)))
+        print(payload, 'json with quoteJsonNumbers', int(run(lambda message: decode_quoted_json(message.decode()), messages)))
+
+
+main()
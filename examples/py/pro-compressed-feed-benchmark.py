@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import gzip
+import json
+import random
+import time
+import zlib
+from gzip import GzipFile
+from io import BytesIO
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from aiohttp import WSMsgType  # noqa: E402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: E402
+
+# measures messages/sec through the websocket client for compressed feeds
+# gzip like htx, huobijp, bingx, bitrue, coinex and raw deflate like bitmart, okcoin
+# compared with the previous GzipFile + str + json.loads path
+# usage: python pro-compressed-feed-benchmark.py [number of messages]
+
+
+class Message:
+    type = WSMsgType.BINARY
+
+    def __init__(self, data):
+        self.data = data
+
+
+def depth_message(levels):
+    return json.dumps({
+        'ch': 'market.btcusdt.depth.step0',
+        'ts': 1700000000000 + random.randint(0, 100000),
+        'tick': {
+            'bids': [[37000 - i / 100, round(random.uniform(0, 5), 6)] for i in range(levels)],
+            'asks': [[37000.01 + i / 100, round(random.uniform(0, 5), 6)] for i in range(levels)],
+        },
+    }, separators=(',', ':')).encode()
+
+
+def deflate(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def previous_gunzip(data):
+    return json.loads(GzipFile('', 'rb', 9, BytesIO(data)).read().decode('utf-8'))
+
+
+def previous_inflate(data):
+    return json.loads(zlib.decompress(data, -zlib.MAX_WBITS).decode())
+
+
+def run(handle, messages):
+    start = time.perf_counter()
+    for message in messages:
+        handle(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    random.seed(42)
+    print('feed', 'implementation', 'messages/sec')
+    for levels in [20, 150]:
+        raw = [depth_message(levels) for _ in range(count)]
+        for feed, compress, previous in [('gzip', gzip.compress, previous_gunzip), ('deflate', deflate, previous_inflate)]:
+            compressed = [compress(message) for message in raw]
+            client = AiohttpClient('wss://example.com', lambda client, message: None, None, None, None, {
+                'gunzip': feed == 'gzip',
+                'inflate': feed == 'deflate',
+            })
+            messages = [Message(data) for data in compressed]
+            print(feed, levels, 'previous', int(run(previous, compressed)))
+            print(feed, levels, 'client', int(run(client.handle_message, messages)))
+
+
+main()
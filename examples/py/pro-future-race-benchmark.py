@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt import ExchangeClosedByUser  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCache  # noqa: E402
+from ccxt.async_support.base.ws.future import Future  # noqa: E402
+
+# measures watch_trades_for_symbols loops with Future.race, a callback on each future,
+# against the previous Future.race that ran asyncio.wait in a new task on every call
+# the trades are resolved locally, one per loop iteration, without a connection
+# usage: python pro-future-race-benchmark.py [number of updates]
+
+url = 'wss://example.com/ws'
+
+
+def wait_race(futures):
+    # the previous implementation
+    future = Future()
+    for f in futures:
+        f.is_race_future = True
+    task = asyncio.create_task(asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED))
+
+    def callback(done):
+        try:
+            complete, pending = done.result()
+            for i, f in enumerate(complete):
+                try:
+                    f.result()
+                except ExchangeClosedByUser as e:
+                    if len(pending) == 0 and i == len(complete) - 1:
+                        future.reject(e)
+                    continue
+                except asyncio.CancelledError:
+                    continue
+                except Exception as e:
+                    future.reject(e)
+                    return
+            futures_list = list(complete)
+            if all([f.cancelled() for f in futures_list]):
+                future.reject(ExchangeClosedByUser('Connection closed by the user'))
+                return
+            future.resolve(futures_list[0].result())
+        except Exception as e:
+            future.reject(e)
+    task.add_done_callback(callback)
+    return future
+
+
+class LocalExchange(Exchange):
+    # the same steps as the watch_trades_for_symbols of the exchanges
+    async def watch_trades_for_symbols(self, symbols, since=None, limit=None, params={}):
+        message_hashes = ['trade::' + symbol for symbol in symbols]
+        trades = await self.watch_multiple(url, message_hashes, None, message_hashes)
+        if self.newUpdates:
+            first = self.safe_value(trades, 0)
+            limit = trades.getLimit(first['symbol'], limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
+
+async def produce(client, symbols):
+    caches = {symbol: ArrayCache(1000) for symbol in symbols}
+    i = 0
+    while True:
+        symbol = symbols[i % len(symbols)]
+        caches[symbol].append({'symbol': symbol, 'id': str(i), 'timestamp': 1700000000000 + i, 'price': 37000.0, 'amount': 0.1})
+        client.resolve(caches[symbol], 'trade::' + symbol)
+        i += 1
+        await asyncio.sleep(0)
+
+
+async def run(count, symbols):
+    exchange = LocalExchange({'id': 'local'})
+    client = exchange.client(url)
+    client.connected.resolve(url)
+    producer = asyncio.ensure_future(produce(client, symbols))
+    start = time.perf_counter()
+    for _ in range(count):
+        await exchange.watch_trades_for_symbols(symbols)
+    elapsed = time.perf_counter() - start
+    producer.cancel()
+    await exchange.close()
+    return elapsed / count * 1000000
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    race = Future.__dict__['race']
+    print('symbols', 'race', 'us per update')
+    for symbols in [['BTC/USDT'], ['BTC/USDT', 'ETH/USDT', 'SOL/USDT'], ['S%d/USDT' % i for i in range(20)]]:
+        Future.race = staticmethod(wait_race)
+        print(len(symbols), 'asyncio.wait task', round(await run(count, symbols), 2))
+        Future.race = race
+        print(len(symbols), 'callbacks', round(await run(count, symbols), 2))
+
+
+asyncio.run(main())
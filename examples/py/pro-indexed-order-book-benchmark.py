@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import random
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.async_support.base.ws import order_book_side  # noqa: E402
+
+# measures updates/sec of the indexed (L3) order book sides
+# on books where hundreds of orders share the same price level
+# usage: python pro-indexed-order-book-benchmark.py [number of updates]
+
+
+def generate_events(levels, orders_per_level, count):
+    orders = {}
+    snapshot = []
+    for level in range(levels):
+        price = 1000 + level
+        for i in range(orders_per_level):
+            order_id = str(level * orders_per_level + i).zfill(8)
+            orders[order_id] = price
+            snapshot.append([price, random.randint(1, 100), order_id])
+    order_ids = list(orders.keys())
+    events = []
+    for _ in range(count):
+        order_id = random.choice(order_ids)
+        action = random.random()
+        if action < 0.6:
+            # amend the size in place
+            events.append([orders[order_id], random.randint(1, 100), order_id])
+        elif action < 0.8:
+            # move the order to another price level
+            orders[order_id] = 1000 + random.randint(0, levels - 1)
+            events.append([orders[order_id], random.randint(1, 100), order_id])
+        else:
+            # delete the order and add it back
+            events.append([orders[order_id], 0, order_id])
+            events.append([orders[order_id], random.randint(1, 100), order_id])
+    return snapshot, events
+
+
+def run(side_class, snapshot, events):
+    side = side_class(snapshot)
+    start = time.perf_counter()
+    for event in events:
+        side.storeArray(list(event))
+    elapsed = time.perf_counter() - start
+    return len(events) / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    random.seed(42)
+    print('levels', 'orders per level', 'implementation', 'updates/sec')
+    for levels, orders_per_level in [(100, 10), (20, 200), (5, 1000)]:
+        snapshot, events = generate_events(levels, orders_per_level, count)
+        for side_class in [order_book_side.IndexedAsks, order_book_side.IndexedBids, order_book_side.ChunkedIndexedAsks]:
+            rate = run(side_class, snapshot, events)
+            print(levels, orders_per_level, side_class.__name__, int(rate))
+
+
+main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import random
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.async_support.base.ws import order_book_side  # noqa: E402
+
+# compares the deltas/sec of the list-backed order book sides
+# with the chunked ones on books of different depth
+# usage: python pro-order-book-side-benchmark.py [number of deltas]
+
+
+def generate_deltas(depth, count):
+    # a deep snapshot around a mid price followed by random updates, inserts and deletes
+    snapshot = [[1000 + i / 100, random.randint(1, 100)] for i in range(depth)]
+    deltas = []
+    for _ in range(count):
+        price = 1000 + random.randint(0, depth * 2) / 100
+        size = random.choice([0, random.randint(1, 100)])
+        deltas.append([price, size])
+    return snapshot, deltas
+
+
+def run(side_class, snapshot, deltas):
+    side = side_class(snapshot)
+    start = time.perf_counter()
+    for delta in deltas:
+        side.store(delta[0], delta[1])
+    elapsed = time.perf_counter() - start
+    return len(deltas) / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    random.seed(42)
+    print('depth', 'implementation', 'deltas/sec')
+    for depth in [100, 1000, 5000, 20000]:
+        snapshot, deltas = generate_deltas(depth, count)
+        for side_class in [order_book_side.Asks, order_book_side.ChunkedAsks, order_book_side.Bids, order_book_side.ChunkedBids]:
+            rate = run(side_class, snapshot, deltas)
+            print(depth, side_class.__name__, int(rate))
+
+
+main()
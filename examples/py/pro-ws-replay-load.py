@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import asyncio
+import multiprocessing
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+from ccxt.pro.test.base.ws_replay import FEEDS, ReplayServer, exchange_for, load  # noqa: E402
+
+# load tests the websocket handlers of an exchange without the exchange, a local server
+# in another process answers the subscriptions and replays trades and order book deltas
+# at a given rate per stream, see python/ccxt/pro/test/base/ws_replay.py
+# usage: python pro-ws-replay-load.py [binance,okx,bybit,kraken,htx] [messages/sec per stream, 0 for as fast as it can] [messages per stream] [fast|protocol] [recording.jsonl]
+
+
+def serve(id, rate, count, recording, port, ready):
+
+    async def main():
+        await ReplayServer(FEEDS[id](), rate, count, recording).start(port=port)
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+async def run(id, url, count, client, streams):
+    feed = FEEDS[id]()
+    exchange = exchange_for(feed, url, {'ws': {'client': client}})
+    try:
+        return await load(exchange, feed, streams, count, timeout=600)
+    finally:
+        await exchange.close()
+
+
+def main():
+    ids = sys.argv[1].split(',') if len(sys.argv) > 1 else list(FEEDS)
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 50000
+    client = sys.argv[4] if len(sys.argv) > 4 else 'fast'
+    recording = sys.argv[5] if len(sys.argv) > 5 else None
+    # a recording replaces the trades
+    streams = ('trades',) if recording else ('trades', 'book')
+    context = multiprocessing.get_context('spawn')
+    print('exchange', 'messages', 'messages/sec', 'total ms p50/p90/p99', 'exchange ms p50/p99', 'max rss MB')
+    for index, id in enumerate(ids):
+        port = 18780 + index
+        ready = context.Event()
+        server = context.Process(target=serve, args=(id, rate, count, recording, port, ready), daemon=True)
+        server.start()
+        ready.wait(30)
+        try:
+            report = asyncio.run(run(id, 'ws://127.0.0.1:' + str(port), count, client, streams))
+            total = report['latency']['total']
+            exchange = report['latency']['exchange']
+            print(id, report['messages'], int(report['rate']),
+                  '/'.join(str(round(total.get(p, 0), 3)) for p in ['p50', 'p90', 'p99']),
+                  '/'.join(str(round(exchange[p], 1)) for p in ['p50', 'p99']) if exchange['count'] else '-',
+                  round(report['maxrss'] or 0, 1))
+        except Exception as e:
+            print(id, 'failed:', type(e).__name__, e)
+        finally:
+            server.terminate()
+
+
+if __name__ == '__main__':
+    main()
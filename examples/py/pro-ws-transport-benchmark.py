@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import asyncio
+import multiprocessing
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root + '/python')
+
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: E402
+from ccxt.async_support.base.ws.fast_client import FastClient  # noqa: E402
+from ccxt.async_support.base.ws.protocol_client import ProtocolClient  # noqa: E402
+
+# compares frames/sec and cpu time of the websocket clients on a local server
+# that sends binance-like trades as fast as it can, the server runs in another process
+# options['ws']['client'] = 'protocol' selects ProtocolClient, FastClient is the default
+# usage: python pro-ws-transport-benchmark.py [number of frames]
+
+CLIENTS = [
+    ('aiohttp', AiohttpClient),
+    ('fast', FastClient),
+    ('protocol', ProtocolClient),
+]
+
+
+def trade(i):
+    return json.dumps({
+        'e': 'trade',
+        'E': 1700000000000 + i,
+        's': 'BTCUSDT',
+        't': i,
+        'p': '37000.10',
+        'q': '0.00100000',
+        'T': 1700000000000 + i,
+        'm': True,
+        'M': True,
+    }, separators=(',', ':'))
+
+
+def serve(port, ready):
+    frames = [trade(i) for i in range(1000)]
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        count = int(request.query.get('count', 1000))
+        for i in range(count):
+            await ws.send_str(frames[i % 1000])
+        await ws.send_str('done')
+        async for message in ws:
+            pass
+        return ws
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', port).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+async def run(client_class, url, count):
+    received = [0]
+    done = asyncio.get_running_loop().create_future()
+
+    def on_message(client, message):
+        if message == 'done':
+            done.set_result(True)
+        else:
+            received[0] += 1
+
+    def on_error(client, error):
+        if not done.done():
+            done.set_exception(error)
+
+    client = client_class(url + '?count=' + str(count), on_message, on_error, lambda client, code: None, lambda client: None, {
+        'asyncio_loop': asyncio.get_running_loop(),
+        'keepAlive': False,
+    })
+    session = aiohttp.ClientSession()
+    try:
+        start = time.perf_counter()
+        cpu = time.process_time()
+        asyncio.ensure_future(client.connect(session))
+        await asyncio.wait_for(done, 120)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+        return received[0] / elapsed, cpu * 1000000 / received[0]
+    finally:
+        await client.close()
+        await session.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    port = 18765
+    context = multiprocessing.get_context('spawn')
+    ready = context.Event()
+    server = context.Process(target=serve, args=(port, ready), daemon=True)
+    server.start()
+    ready.wait(30)
+    url = 'ws://127.0.0.1:' + str(port) + '/'
+    print('client', 'frames/sec', 'cpu us/frame')
+    try:
+        for name, client_class in CLIENTS:
+            try:
+                rate, cpu = asyncio.run(run(client_class, url, count))
+                print(name, int(rate), round(cpu, 2))
+            except Exception as e:
+                print(name, 'failed:', type(e).__name__, e)
+    finally:
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
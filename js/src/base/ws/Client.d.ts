@@ -32,6 +32,7 @@ export default class Client {
     future(messageHash: string): any;
     resolve(result: any, messageHash: Str): any;
     reject(result: any, messageHash?: Str): any;
+    batchedIds(id: Str): Str[];
     log(...args: any[]): void;
     connect(backoffDelay?: number): void;
     isOpen(): boolean;
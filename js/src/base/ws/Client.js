@@ -121,6 +121,11 @@ export default class Client {
         }
         return result;
     }
+    batchedIds(id) {
+        // the ids of the messages that were sent as one message with this id
+        // subscriptions are only sent together in python, see options['ws']['coalesceSubscriptions']
+        return [id];
+    }
     log(...args) {
         console.log(...args);
         // console.dir (args, { depth: null })
@@ -63,6 +63,9 @@ class OrderBook {
     reset(snapshot = {}) {
         this.asks.index.fill(Number.MAX_VALUE);
         this.asks.length = 0;
+        if (this.asks.strings !== undefined) {
+            this.asks.strings.clear();
+        }
         if (snapshot.asks) {
             for (let i = 0; i < snapshot.asks.length; i++) {
                 this.asks.storeArray(snapshot.asks[i]);
@@ -70,6 +73,9 @@ class OrderBook {
         }
         this.bids.index.fill(Number.MAX_VALUE);
         this.bids.length = 0;
+        if (this.bids.strings !== undefined) {
+            this.bids.strings.clear();
+        }
         if (snapshot.bids) {
             for (let i = 0; i < snapshot.bids.length; i++) {
                 this.bids.storeArray(snapshot.bids[i]);
@@ -1,16 +1,22 @@
 interface IOrderBookSide<T> extends Array<T> {
     store(price: any, size: any): any;
     storeArray(array: any[]): any;
+    storeStringArray?(array: any[], strings: string[]): any;
+    topStrings?(n: number): string[];
     limit(): any;
 }
 declare class OrderBookSide extends Array implements IOrderBookSide<any> {
     constructor(deltas?: any[], depth?: any);
     storeArray(delta: any): void;
     store(price: any, size: any): void;
+    storeStringArray(delta: any, strings: any): void;
+    keepsLevel(delta: any): any;
+    topStrings(n: any): any[];
     limit(): void;
 }
 declare class CountedOrderBookSide extends OrderBookSide {
     store(price: any, size: any): void;
+    keepsLevel(delta: any): any;
     storeArray(delta: any): void;
 }
 declare class IndexedOrderBookSide extends Array implements IOrderBookSide<any> {
@@ -45,6 +45,12 @@ class OrderBookSide extends Array {
             value: depth || Number.MAX_SAFE_INTEGER,
             writable: true,
         });
+        // the strings of the levels stored with storeStringArray, by index price
+        Object.defineProperty(this, 'strings', {
+            __proto__: null,
+            value: new Map(),
+            writable: true,
+        });
         // sort upon initiation
         this.length = 0;
         for (let i = 0; i < deltas.length; i++) {
@@ -86,10 +92,39 @@ class OrderBookSide extends Array {
     store(price, size) {
         this.storeArray([price, size]);
     }
+    // same as storeArray but also keeps a list of strings for the level
+    // usually the price and amount exactly as the exchange sent them
+    // so that checksums don't have to format numbers back into strings
+    storeStringArray(delta, strings) {
+        const index_price = this.side ? -delta[0] : delta[0];
+        this.storeArray(delta);
+        if (this.keepsLevel(delta)) {
+            this.strings.set(index_price, strings);
+        }
+        else {
+            this.strings.delete(index_price);
+        }
+    }
+    keepsLevel(delta) {
+        return delta[1];
+    }
+    // the strings of the first n levels flattened into one list
+    topStrings(n) {
+        const result = [];
+        const length = Math.min(n, this.length);
+        for (let i = 0; i < length; i++) {
+            const strings = this.strings.get(this.index[i]);
+            for (let j = 0; j < strings.length; j++) {
+                result.push(strings[j]);
+            }
+        }
+        return result;
+    }
     // replace stored orders with new values
     limit() {
         if (this.length > this.depth) {
             for (let i = this.depth; i < this.length; i++) {
+                this.strings.delete(this.index[i]);
                 this.index[i] = Number.MAX_VALUE;
             }
             this.length = this.depth;
@@ -104,6 +139,9 @@ class CountedOrderBookSide extends OrderBookSide {
     store(price, size) {
         throw new Error('CountedOrderBookSide.store() is not supported, use storeArray([price, size, count]) instead');
     }
+    keepsLevel(delta) {
+        return delta[1] && delta[2];
+    }
     storeArray(delta) {
         const price = delta[0];
         const size = delta[1];
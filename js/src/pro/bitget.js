@@ -659,34 +659,42 @@ export default class bitget extends bitgetRest {
         if (incrementalBook) {
             // storedOrderBook = this.safeValue (this.orderbooks, symbol);
             if (!(symbol in this.orderbooks)) {
-                // const ob = this.orderBook ({});
-                const ob = this.countedOrderBook({});
+                const ob = this.orderBook({});
                 ob['symbol'] = symbol;
                 this.orderbooks[symbol] = ob;
             }
             const storedOrderBook = this.orderbooks[symbol];
             const asks = this.safeValue(rawOrderBook, 'asks', []);
             const bids = this.safeValue(rawOrderBook, 'bids', []);
-            this.handleDeltas(storedOrderBook['asks'], asks);
-            this.handleDeltas(storedOrderBook['bids'], bids);
+            const checksum = this.safeBool(this.options, 'checksum', true);
+            if (checksum) {
+                // keep the price and amount strings for the checksum
+                this.handleDeltas(storedOrderBook['asks'], asks);
+                this.handleDeltas(storedOrderBook['bids'], bids);
+            }
+            else {
+                this.handleDeltasWithKeys(storedOrderBook['asks'], asks);
+                this.handleDeltasWithKeys(storedOrderBook['bids'], bids);
+            }
             storedOrderBook['timestamp'] = timestamp;
             storedOrderBook['datetime'] = this.iso8601(timestamp);
-            const checksum = this.safeBool(this.options, 'checksum', true);
             const isSnapshot = this.safeString(message, 'action') === 'snapshot'; // snapshot does not have a checksum
             if (!isSnapshot && checksum) {
                 const storedAsks = storedOrderBook['asks'];
                 const storedBids = storedOrderBook['bids'];
                 const asksLength = storedAsks.length;
                 const bidsLength = storedBids.length;
+                const bidStrings = storedBids.topStrings(25);
+                const askStrings = storedAsks.topStrings(25);
                 const payloadArray = [];
                 for (let i = 0; i < 25; i++) {
                     if (i < bidsLength) {
-                        payloadArray.push(storedBids[i][2][0]);
-                        payloadArray.push(storedBids[i][2][1]);
+                        payloadArray.push(bidStrings[i * 2]);
+                        payloadArray.push(bidStrings[i * 2 + 1]);
                     }
                     if (i < asksLength) {
-                        payloadArray.push(storedAsks[i][2][0]);
-                        payloadArray.push(storedAsks[i][2][1]);
+                        payloadArray.push(askStrings[i * 2]);
+                        payloadArray.push(askStrings[i * 2 + 1]);
                     }
                 }
                 const payload = payloadArray.join(':');
@@ -716,11 +724,11 @@ export default class bitget extends bitgetRest {
         client.reject(error, messageHash);
     }
     handleDelta(bookside, delta) {
-        const bidAsk = this.parseBidAsk(delta, 0, 1);
         // we store the string representations in the orderbook for checksum calculation
         // this simplifies the code for generating checksums as we do not need to do any complex number transformations
-        bidAsk.push(delta);
-        bookside.storeArray(bidAsk);
+        const priceString = this.safeString(delta, 0);
+        const amountString = this.safeString(delta, 1);
+        bookside.storeStringArray([this.parseNumber(priceString), this.parseNumber(amountString)], [priceString, amountString]);
     }
     handleDeltas(bookside, deltas) {
         for (let i = 0; i < deltas.length; i++) {
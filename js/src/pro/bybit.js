@@ -102,6 +102,12 @@ export default class bybit extends bybitRest {
                 },
             },
             'options': {
+                // options['ws']['coalesceSubscriptions'] merges the args of the subscriptions sent together, spot takes 10 per message
+                'subscriptionBatch': {
+                    'field': 'args',
+                    'id': 'req_id',
+                    'limit': 10,
+                },
                 'watchTicker': {
                     'name': 'tickers', // 'tickers' for 24hr statistical ticker or 'tickers_lt' for leverage token ticker
                 },
@@ -995,9 +1001,7 @@ export default class bybit extends bybitRest {
         bookside.storeArray(bidAsk);
     }
     handleDeltas(bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta(bookside, deltas[i]);
-        }
+        this.handleDeltasWithKeys(bookside, deltas);
     }
     async watchTrades(symbol, since = undefined, limit = undefined, params = {}) {
         /**
@@ -2524,6 +2528,8 @@ export default class bybit extends bybitRest {
         //     },
         // }
         const reqId = this.safeString(message, 'req_id');
+        // a message sent together with others acknowledges all of them, see Client.batchedIds
+        const reqIds = client.batchedIds(reqId);
         const keys = Object.keys(client.subscriptions);
         for (let i = 0; i < keys.length; i++) {
             const messageHash = keys[i];
@@ -2534,7 +2540,7 @@ export default class bybit extends bybitRest {
             if (messageHash.startsWith('unsubscribe')) {
                 const subscription = client.subscriptions[messageHash];
                 const subId = this.safeString(subscription, 'id');
-                if (reqId !== subId) {
+                if (!this.inArray(subId, reqIds)) {
                     continue;
                 }
                 const messageHashes = this.safeList(subscription, 'messageHashes', []);
@@ -539,16 +539,16 @@ export default class gate extends gateRest {
         return cache.length;
     }
     handleBidAsks(bookSide, bidAsks) {
-        for (let i = 0; i < bidAsks.length; i++) {
-            const bidAsk = bidAsks[i];
-            if (Array.isArray(bidAsk)) {
-                bookSide.storeArray(this.parseBidAsk(bidAsk));
-            }
-            else {
-                const price = this.safeFloat(bidAsk, 'p');
-                const amount = this.safeFloat(bidAsk, 's');
-                bookSide.store(price, amount);
-            }
+        // spot levels are [ price, amount ], swap levels are { "p": price, "s": amount }
+        const first = this.safeValue(bidAsks, 0);
+        if (first === undefined) {
+            return;
+        }
+        if (Array.isArray(first)) {
+            this.handleDeltasWithKeys(bookSide, bidAsks);
+        }
+        else {
+            this.handleDeltasWithKeys(bookSide, bidAsks, 'p', 's');
         }
     }
     handleDelta(orderbook, delta) {
@@ -190,35 +190,26 @@ export default class independentreserve extends independentreserveRest {
         }
         const orderbook = this.orderbooks[symbol];
         if (event === 'OrderBookSnapshot') {
-            const snapshot = this.parseOrderBook(orderBook, symbol, timestamp, 'Bids', 'Offers', 'Price', 'Volume');
-            orderbook.reset(snapshot);
+            // the snapshot levels are stored like deltas to keep their checksum strings
+            orderbook.reset({
+                'symbol': symbol,
+                'bids': [],
+                'asks': [],
+            });
             subscription['receivedSnapshot'] = true;
         }
-        else {
-            const asks = this.safeList(orderBook, 'Offers', []);
-            const bids = this.safeList(orderBook, 'Bids', []);
-            this.handleDeltas(orderbook['asks'], asks);
-            this.handleDeltas(orderbook['bids'], bids);
-            orderbook['timestamp'] = timestamp;
-            orderbook['datetime'] = this.iso8601(timestamp);
-        }
+        const asks = this.safeList(orderBook, 'Offers', []);
+        const bids = this.safeList(orderBook, 'Bids', []);
+        this.handleDeltas(orderbook['asks'], asks);
+        this.handleDeltas(orderbook['bids'], bids);
+        orderbook['timestamp'] = timestamp;
+        orderbook['datetime'] = this.iso8601(timestamp);
         const checksum = this.handleOption('watchOrderBook', 'checksum', true);
         if (checksum && receivedSnapshot) {
             const storedAsks = orderbook['asks'];
             const storedBids = orderbook['bids'];
-            const asksLength = storedAsks.length;
-            const bidsLength = storedBids.length;
-            let payload = '';
-            for (let i = 0; i < 10; i++) {
-                if (i < bidsLength) {
-                    payload = payload + this.valueToChecksum(storedBids[i][0]) + this.valueToChecksum(storedBids[i][1]);
-                }
-            }
-            for (let i = 0; i < 10; i++) {
-                if (i < asksLength) {
-                    payload = payload + this.valueToChecksum(storedAsks[i][0]) + this.valueToChecksum(storedAsks[i][1]);
-                }
-            }
+            // every level keeps its checksum string, computed once when the level was stored
+            const payload = storedBids.topStrings(10).join('') + storedAsks.topStrings(10).join('');
             const calculatedChecksum = this.crc32(payload, true);
             const responseChecksum = this.safeInteger(orderBook, 'Crc32');
             if (calculatedChecksum !== responseChecksum) {
@@ -242,7 +233,12 @@ export default class independentreserve extends independentreserveRest {
     }
     handleDelta(bookside, delta) {
         const bidAsk = this.parseBidAsk(delta, 'Price', 'Volume');
-        bookside.storeArray(bidAsk);
+        if (bidAsk[1]) {
+            bookside.storeStringArray(bidAsk, [this.valueToChecksum(bidAsk[0]) + this.valueToChecksum(bidAsk[1])]);
+        }
+        else {
+            bookside.storeStringArray(bidAsk, []);
+        }
     }
     handleDeltas(bookside, deltas) {
         for (let i = 0; i < deltas.length; i++) {
@@ -803,35 +803,20 @@ export default class kraken extends krakenRest {
             }
             const storedAsks = orderbook['asks'];
             const storedBids = orderbook['bids'];
-            let example = undefined;
             if (a !== undefined) {
                 timestamp = this.customHandleDeltas(storedAsks, a, timestamp);
-                example = this.safeValue(a, 0);
             }
             if (b !== undefined) {
                 timestamp = this.customHandleDeltas(storedBids, b, timestamp);
-                example = this.safeValue(b, 0);
             }
             // don't remove this line or I will poop on your face
             orderbook.limit();
             const checksum = this.handleOption('watchOrderBook', 'checksum', true);
             if (checksum) {
-                const priceString = this.safeString(example, 0);
-                const amountString = this.safeString(example, 1);
-                const priceParts = priceString.split('.');
-                const amountParts = amountString.split('.');
-                const priceLength = priceParts[1].length - 0;
-                const amountLength = amountParts[1].length - 0;
-                const payloadArray = [];
+                let payloadArray = [];
                 if (c !== undefined) {
-                    for (let i = 0; i < 10; i++) {
-                        const formatted = this.formatNumber(storedAsks[i][0], priceLength) + this.formatNumber(storedAsks[i][1], amountLength);
-                        payloadArray.push(formatted);
-                    }
-                    for (let i = 0; i < 10; i++) {
-                        const formatted = this.formatNumber(storedBids[i][0], priceLength) + this.formatNumber(storedBids[i][1], amountLength);
-                        payloadArray.push(formatted);
-                    }
+                    // every level keeps its checksum string, computed once when the level was stored
+                    payloadArray = this.arrayConcat(storedAsks.topStrings(10), storedBids.topStrings(10));
                 }
                 const payload = payloadArray.join('');
                 const localChecksum = this.crc32(payload, false);
@@ -867,6 +852,16 @@ export default class kraken extends krakenRest {
             return joined;
         }
     }
+    checksumString(value) {
+        // the checksum is built from the strings received from the exchange
+        // with the decimal point and the leading zeros removed
+        const joined = value.replace('.', '');
+        let i = 0;
+        while ((i < joined.length) && (joined[i] === '0')) {
+            i += 1;
+        }
+        return joined.slice(i);
+    }
     customHandleDeltas(bookside, deltas, timestamp = undefined) {
         for (let j = 0; j < deltas.length; j++) {
             const delta = deltas[j];
@@ -874,7 +869,7 @@ export default class kraken extends krakenRest {
             const amount = this.parseNumber(delta[1]);
             const oldTimestamp = timestamp ? timestamp : 0;
             timestamp = Math.max(oldTimestamp, this.parseToInt(parseFloat(delta[2]) * 1000));
-            bookside.store(price, amount);
+            bookside.storeStringArray([price, amount], [this.checksumString(delta[0]) + this.checksumString(delta[1])]);
         }
         return timestamp;
     }
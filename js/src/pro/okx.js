@@ -49,6 +49,11 @@ export default class okx extends okxRest {
                 },
             },
             'options': {
+                // options['ws']['coalesceSubscriptions'] merges the args of the subscriptions sent together, up to 64kb per message
+                'subscriptionBatch': {
+                    'field': 'args',
+                    'limit': 100,
+                },
                 'watchOrderBook': {
                     'checksum': true,
                     //
@@ -1213,6 +1218,14 @@ export default class okx extends okxRest {
             this.handleDelta(bookside, deltas[i]);
         }
     }
+    handleStringDeltas(bookside, deltas) {
+        for (let i = 0; i < deltas.length; i++) {
+            const delta = deltas[i];
+            const priceString = this.safeString(delta, 0);
+            const amountString = this.safeString(delta, 1);
+            bookside.storeStringArray([this.parseNumber(priceString), this.parseNumber(amountString)], [priceString, amountString]);
+        }
+    }
     handleOrderBookMessage(client, message, orderbook, messageHash, market = undefined) {
         //
         //     {
@@ -1237,26 +1250,36 @@ export default class okx extends okxRest {
         const bids = this.safeValue(message, 'bids', []);
         const storedAsks = orderbook['asks'];
         const storedBids = orderbook['bids'];
-        this.handleDeltas(storedAsks, asks);
-        this.handleDeltas(storedBids, bids);
+        const checksum = this.handleOption('watchOrderBook', 'checksum', true);
+        if (checksum) {
+            // keep the price and amount strings for the checksum
+            this.handleStringDeltas(storedAsks, asks);
+            this.handleStringDeltas(storedBids, bids);
+        }
+        else {
+            // the levels are [ price, amount, liquidated orders, orders ], no count is stored, as in handleDelta
+            this.handleDeltasWithKeys(storedAsks, asks, 0, 1, 4);
+            this.handleDeltasWithKeys(storedBids, bids, 0, 1, 4);
+        }
         const marketId = this.safeString(message, 'instId');
         const symbol = this.safeSymbol(marketId, market);
-        const checksum = this.handleOption('watchOrderBook', 'checksum', true);
         const seqId = this.safeInteger(message, 'seqId');
         if (checksum) {
             const prevSeqId = this.safeInteger(message, 'prevSeqId');
             const nonce = orderbook['nonce'];
             const asksLength = storedAsks.length;
             const bidsLength = storedBids.length;
+            const bidStrings = storedBids.topStrings(25);
+            const askStrings = storedAsks.topStrings(25);
             const payloadArray = [];
             for (let i = 0; i < 25; i++) {
                 if (i < bidsLength) {
-                    payloadArray.push(this.numberToString(storedBids[i][0]));
-                    payloadArray.push(this.numberToString(storedBids[i][1]));
+                    payloadArray.push(bidStrings[i * 2]);
+                    payloadArray.push(bidStrings[i * 2 + 1]);
                 }
                 if (i < asksLength) {
-                    payloadArray.push(this.numberToString(storedAsks[i][0]));
-                    payloadArray.push(this.numberToString(storedAsks[i][1]));
+                    payloadArray.push(askStrings[i * 2]);
+                    payloadArray.push(askStrings[i * 2 + 1]);
                 }
             }
             const payload = payloadArray.join(':');
@@ -345,5 +345,18 @@ function testWsOrderBook() {
     resetBook.reset(orderBookInput);
     resetBook.limit();
     assert(equals(resetBook, orderBookTarget));
+    // --------------------------------------------------------------------------------------------------------------------
+    const stringsBook = new OrderBook({}, 2);
+    const stringAsks = stringsBook['asks'];
+    stringAsks.storeStringArray([1.3, 1], ['1.30', '1']);
+    stringAsks.storeStringArray([1.1, 1], ['1.10', '1']);
+    stringAsks.storeStringArray([1.2, 2], ['1.20', '2']);
+    assert(equals(stringAsks.topStrings(2), ['1.10', '1', '1.20', '2']));
+    stringAsks.storeStringArray([1.1, 0], ['1.10', '0']);
+    stringAsks.storeStringArray([1.4, 1], ['1.40', '1']);
+    stringsBook.limit();
+    assert(equals(stringAsks.topStrings(5), ['1.20', '2', '1.30', '1']));
+    stringsBook.reset({});
+    assert(equals(stringAsks.topStrings(5), []));
 }
 export default testWsOrderBook;
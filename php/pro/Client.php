@@ -135,6 +135,16 @@ class Client {
         return $result;
     }
 
+    public function batched_ids($id) {
+        // the ids of the messages that were sent as one message with this id
+        // subscriptions are only sent together in python, see options['ws']['coalesceSubscriptions']
+        return array($id);
+    }
+
+    public function batchedIds($id) {
+        return $this->batched_ids($id);
+    }
+
     public function __construct(
             $url,
             callable $on_message_callback,
@@ -19,6 +19,7 @@ class OrderBookSide extends \ArrayObject implements \JsonSerializable {
     public $index;
     public $depth;
     public $n;
+    public $strings = array(); // the strings of the levels stored with storeStringArray, by index price
 
     public function __construct($deltas = array(), $depth = null) {
         parent::__construct();
@@ -64,9 +65,49 @@ class OrderBookSide extends \ArrayObject implements \JsonSerializable {
         $this->storeArray(array($price, $size));
     }
 
+    public function store_string_array($delta, $strings) {
+        return $this->storeStringArray($delta, $strings);
+    }
+
+    public function storeStringArray($delta, $strings) {
+        // same as storeArray but also keeps a list of strings for the level
+        // usually the price and amount exactly as the exchange sent them
+        // so that checksums don't have to format numbers back into strings
+        $index_price = static::$side ? -$delta[0] : $delta[0];
+        $this->storeArray($delta);
+        if ($this->keepsLevel($delta)) {
+            $this->strings[strval($index_price)] = $strings;
+        } else {
+            unset($this->strings[strval($index_price)]);
+        }
+    }
+
+    public function keepsLevel($delta) {
+        return $delta[1];
+    }
+
+    public function top_strings($n) {
+        return $this->topStrings($n);
+    }
+
+    public function topStrings($n) {
+        // the strings of the first n levels flattened into one list
+        $result = array();
+        $length = min($n, count($this));
+        for ($i = 0; $i < $length; $i++) {
+            foreach ($this->strings[strval($this->index[$i])] as $string) {
+                $result[] = $string;
+            }
+        }
+        return $result;
+    }
+
     public function limit() {
         $difference = count($this) - $this->depth;
         if ($difference > 0) {
+            foreach (array_slice($this->index, -$difference) as $index_price) {
+                unset($this->strings[strval($index_price)]);
+            }
             array_splice($this->index, -$difference);
             $tmp = $this->exchangeArray(tmp);
             array_splice($tmp, -$difference);
@@ -122,6 +163,10 @@ class CountedOrderBookSide extends OrderBookSide {
         $this->storeArray(array($price, $size, $id));
     }
 
+    public function keepsLevel($delta) {
+        return $delta[1] && $delta[2];
+    }
+
     public function storeArray($delta) {
         $price = $delta[0];
         $size = $delta[1];
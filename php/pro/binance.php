@@ -98,6 +98,12 @@ class binance extends \ccxt\async\binance {
             ),
             'options' => array(
                 'returnRateLimits' => false,
+                // options['ws']['coalesceSubscriptions'] merges the params of the subscriptions sent together
+                'subscriptionBatch' => array(
+                    'field' => 'params',
+                    'id' => 'id',
+                    'limit' => 200,
+                ),
                 'streamLimits' => array(
                     'spot' => 50, // max 1024
                     'margin' => 50, // max 1024
@@ -880,9 +886,7 @@ class binance extends \ccxt\async\binance {
     }
 
     public function handle_deltas($bookside, $deltas) {
-        for ($i = 0; $i < count($deltas); $i++) {
-            $this->handle_delta($bookside, $deltas[$i]);
-        }
+        $this->handle_deltas_with_keys($bookside, $deltas);
     }
 
     public function handle_order_book_message(Client $client, $message, $orderbook) {
@@ -1026,14 +1030,18 @@ class binance extends \ccxt\async\binance {
         //
         $id = $this->safe_string($message, 'id');
         $subscriptionsById = $this->index_by($client->subscriptions, 'id');
-        $subscription = $this->safe_value($subscriptionsById, $id, array());
-        $method = $this->safe_value($subscription, 'method');
-        if ($method !== null) {
-            $method($client, $message, $subscription);
-        }
-        $isUnSubMessage = $this->safe_bool($subscription, 'unsubscribe', false);
-        if ($isUnSubMessage) {
-            $this->handle_un_subscription($client, $subscription);
+        // a $message sent together with others acknowledges all of them, see Client.batchedIds
+        $ids = $client->batchedIds ($id);
+        for ($i = 0; $i < count($ids); $i++) {
+            $subscription = $this->safe_value($subscriptionsById, $ids[$i], array());
+            $method = $this->safe_value($subscription, 'method');
+            if ($method !== null) {
+                $method($client, $message, $subscription);
+            }
+            $isUnSubMessage = $this->safe_bool($subscription, 'unsubscribe', false);
+            if ($isUnSubMessage) {
+                $this->handle_un_subscription($client, $subscription);
+            }
         }
         return $message;
     }
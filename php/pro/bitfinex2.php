@@ -631,7 +631,8 @@ class bitfinex2 extends \ccxt\async\bitfinex2 {
                     $size = ($amount < 0) ? -$amount : $amount;
                     $side = ($amount < 0) ? 'asks' : 'bids';
                     $bookside = $orderbook[$side];
-                    $bookside->storeArray (array( $price, $size, $counter ));
+                    // the checksum uses the signed $amount
+                    $bookside->storeStringArray (array( $price, $size, $counter ), array( $this->number_to_string($price), $this->number_to_string($amount) ));
                 }
             }
             $orderbook['symbol'] = $symbol;
@@ -657,7 +658,8 @@ class bitfinex2 extends \ccxt\async\bitfinex2 {
                 $size = Precise::string_lt($amount, '0') ? Precise::string_neg($amount) : $amount;
                 $side = Precise::string_lt($amount, '0') ? 'asks' : 'bids';
                 $bookside = $orderbookItem[$side];
-                $bookside->storeArray (array( $this->parse_number($price), $this->parse_number($size), $this->parse_number($counter) ));
+                $parsedPrice = $this->parse_number($price);
+                $bookside->storeStringArray (array( $parsedPrice, $this->parse_number($size), $this->parse_number($counter) ), array( $this->number_to_string($parsedPrice), $this->number_to_string($this->parse_number($amount)) ));
             }
             $client->resolve ($orderbook, $messageHash);
         }
@@ -683,17 +685,33 @@ class bitfinex2 extends \ccxt\async\bitfinex2 {
         $isRaw = ($prec === 'R0');
         $idToCheck = $isRaw ? 2 : 0;
         // pepperoni pizza from bitfinex
-        for ($i = 0; $i < $depth; $i++) {
-            $bid = $this->safe_value($bids, $i);
-            $ask = $this->safe_value($asks, $i);
-            if ($bid !== null) {
-                $stringArray[] = $this->number_to_string($bids[$i][$idToCheck]);
-                $stringArray[] = $this->number_to_string($bids[$i][1]);
+        if ($isRaw) {
+            for ($i = 0; $i < $depth; $i++) {
+                $bid = $this->safe_value($bids, $i);
+                $ask = $this->safe_value($asks, $i);
+                if ($bid !== null) {
+                    $stringArray[] = $this->number_to_string($bids[$i][$idToCheck]);
+                    $stringArray[] = $this->number_to_string($bids[$i][1]);
+                }
+                if ($ask !== null) {
+                    $stringArray[] = $this->number_to_string($asks[$i][$idToCheck]);
+                    $aski1 = $asks[$i][1];
+                    $stringArray[] = $this->number_to_string(-$aski1);
+                }
             }
-            if ($ask !== null) {
-                $stringArray[] = $this->number_to_string($asks[$i][$idToCheck]);
-                $aski1 = $asks[$i][1];
-                $stringArray[] = $this->number_to_string(-$aski1);
+        } else {
+            // price level books keep the checksum strings of their top levels
+            $bidStrings = $bids->topStrings ($depth);
+            $askStrings = $asks->topStrings ($depth);
+            for ($i = 0; $i < $depth; $i++) {
+                if ($i * 2 < count($bidStrings)) {
+                    $stringArray[] = $bidStrings[$i * 2];
+                    $stringArray[] = $bidStrings[$i * 2 + 1];
+                }
+                if ($i * 2 < count($askStrings)) {
+                    $stringArray[] = $askStrings[$i * 2];
+                    $stringArray[] = $askStrings[$i * 2 + 1];
+                }
             }
         }
         $payload = implode(':', $stringArray);
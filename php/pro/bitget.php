@@ -676,34 +676,41 @@ class bitget extends \ccxt\async\bitget {
         if ($incrementalBook) {
             // $storedOrderBook = $this->safe_value($this->orderbooks, $symbol);
             if (!(is_array($this->orderbooks) && array_key_exists($symbol, $this->orderbooks))) {
-                // $ob = $this->order_book(array());
-                $ob = $this->counted_order_book(array());
+                $ob = $this->order_book(array());
                 $ob['symbol'] = $symbol;
                 $this->orderbooks[$symbol] = $ob;
             }
             $storedOrderBook = $this->orderbooks[$symbol];
             $asks = $this->safe_value($rawOrderBook, 'asks', array());
             $bids = $this->safe_value($rawOrderBook, 'bids', array());
-            $this->handle_deltas($storedOrderBook['asks'], $asks);
-            $this->handle_deltas($storedOrderBook['bids'], $bids);
+            $checksum = $this->safe_bool($this->options, 'checksum', true);
+            if ($checksum) {
+                // keep the price and amount strings for the $checksum
+                $this->handle_deltas($storedOrderBook['asks'], $asks);
+                $this->handle_deltas($storedOrderBook['bids'], $bids);
+            } else {
+                $this->handle_deltas_with_keys($storedOrderBook['asks'], $asks);
+                $this->handle_deltas_with_keys($storedOrderBook['bids'], $bids);
+            }
             $storedOrderBook['timestamp'] = $timestamp;
             $storedOrderBook['datetime'] = $this->iso8601($timestamp);
-            $checksum = $this->safe_bool($this->options, 'checksum', true);
             $isSnapshot = $this->safe_string($message, 'action') === 'snapshot'; // snapshot does not have a $checksum
             if (!$isSnapshot && $checksum) {
                 $storedAsks = $storedOrderBook['asks'];
                 $storedBids = $storedOrderBook['bids'];
                 $asksLength = count($storedAsks);
                 $bidsLength = count($storedBids);
+                $bidStrings = $storedBids->topStrings (25);
+                $askStrings = $storedAsks->topStrings (25);
                 $payloadArray = array();
                 for ($i = 0; $i < 25; $i++) {
                     if ($i < $bidsLength) {
-                        $payloadArray[] = $storedBids[$i][2][0];
-                        $payloadArray[] = $storedBids[$i][2][1];
+                        $payloadArray[] = $bidStrings[$i * 2];
+                        $payloadArray[] = $bidStrings[$i * 2 + 1];
                     }
                     if ($i < $asksLength) {
-                        $payloadArray[] = $storedAsks[$i][2][0];
-                        $payloadArray[] = $storedAsks[$i][2][1];
+                        $payloadArray[] = $askStrings[$i * 2];
+                        $payloadArray[] = $askStrings[$i * 2 + 1];
                     }
                 }
                 $payload = implode(':', $payloadArray);
@@ -736,11 +743,11 @@ class bitget extends \ccxt\async\bitget {
     }
 
     public function handle_delta($bookside, $delta) {
-        $bidAsk = $this->parse_bid_ask($delta, 0, 1);
         // we store the string representations in the orderbook for checksum calculation
         // this simplifies the code for generating checksums do not need to do any complex number transformations
-        $bidAsk[] = $delta;
-        $bookside->storeArray ($bidAsk);
+        $priceString = $this->safe_string($delta, 0);
+        $amountString = $this->safe_string($delta, 1);
+        $bookside->storeStringArray (array( $this->parse_number($priceString), $this->parse_number($amountString) ), array( $priceString, $amountString ));
     }
 
     public function handle_deltas($bookside, $deltas) {
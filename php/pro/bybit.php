@@ -107,6 +107,12 @@ class bybit extends \ccxt\async\bybit {
                 ),
             ),
             'options' => array(
+                // options['ws']['coalesceSubscriptions'] merges the args of the subscriptions sent together, spot takes 10 per message
+                'subscriptionBatch' => array(
+                    'field' => 'args',
+                    'id' => 'req_id',
+                    'limit' => 10,
+                ),
                 'watchTicker' => array(
                     'name' => 'tickers', // 'tickers' for 24hr statistical ticker or 'tickers_lt' for leverage token ticker
                 ),
@@ -1019,9 +1025,7 @@ class bybit extends \ccxt\async\bybit {
     }
 
     public function handle_deltas($bookside, $deltas) {
-        for ($i = 0; $i < count($deltas); $i++) {
-            $this->handle_delta($bookside, $deltas[$i]);
-        }
+        $this->handle_deltas_with_keys($bookside, $deltas);
     }
 
     public function watch_trades(string $symbol, ?int $since = null, ?int $limit = null, $params = array ()): PromiseInterface {
@@ -2573,6 +2577,8 @@ class bybit extends \ccxt\async\bybit {
         //     ),
         // }
         $reqId = $this->safe_string($message, 'req_id');
+        // a $message sent together with others acknowledges all of them, see Client.batchedIds
+        $reqIds = $client->batchedIds ($reqId);
         $keys = is_array($client->subscriptions) ? array_keys($client->subscriptions) : array();
         for ($i = 0; $i < count($keys); $i++) {
             $messageHash = $keys[$i];
@@ -2583,7 +2589,7 @@ class bybit extends \ccxt\async\bybit {
             if (str_starts_with($messageHash, 'unsubscribe')) {
                 $subscription = $client->subscriptions[$messageHash];
                 $subId = $this->safe_string($subscription, 'id');
-                if ($reqId !== $subId) {
+                if (!$this->in_array($subId, $reqIds)) {
                     continue;
                 }
                 $messageHashes = $this->safe_list($subscription, 'messageHashes', array());
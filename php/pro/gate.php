@@ -556,15 +556,15 @@ class gate extends \ccxt\async\gate {
     }
 
     public function handle_bid_asks($bookSide, $bidAsks) {
-        for ($i = 0; $i < count($bidAsks); $i++) {
-            $bidAsk = $bidAsks[$i];
-            if (gettype($bidAsk) === 'array' && array_keys($bidAsk) === array_keys(array_keys($bidAsk))) {
-                $bookSide->storeArray ($this->parse_bid_ask($bidAsk));
-            } else {
-                $price = $this->safe_float($bidAsk, 'p');
-                $amount = $this->safe_float($bidAsk, 's');
-                $bookSide->store ($price, $amount);
-            }
+        // spot levels are [ price, amount ], swap levels are array( "p" => price, "s" => amount )
+        $first = $this->safe_value($bidAsks, 0);
+        if ($first === null) {
+            return;
+        }
+        if (gettype($first) === 'array' && array_keys($first) === array_keys(array_keys($first))) {
+            $this->handle_deltas_with_keys($bookSide, $bidAsks);
+        } else {
+            $this->handle_deltas_with_keys($bookSide, $bidAsks, 'p', 's');
         }
     }
 
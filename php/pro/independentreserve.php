@@ -200,34 +200,26 @@ class independentreserve extends \ccxt\async\independentreserve {
         }
         $orderbook = $this->orderbooks[$symbol];
         if ($event === 'OrderBookSnapshot') {
-            $snapshot = $this->parse_order_book($orderBook, $symbol, $timestamp, 'Bids', 'Offers', 'Price', 'Volume');
-            $orderbook->reset ($snapshot);
+            // the snapshot levels are stored like deltas to keep their $checksum strings
+            $orderbook->reset (array(
+                'symbol' => $symbol,
+                'bids' => array(),
+                'asks' => array(),
+            ));
             $subscription['receivedSnapshot'] = true;
-        } else {
-            $asks = $this->safe_list($orderBook, 'Offers', array());
-            $bids = $this->safe_list($orderBook, 'Bids', array());
-            $this->handle_deltas($orderbook['asks'], $asks);
-            $this->handle_deltas($orderbook['bids'], $bids);
-            $orderbook['timestamp'] = $timestamp;
-            $orderbook['datetime'] = $this->iso8601($timestamp);
         }
+        $asks = $this->safe_list($orderBook, 'Offers', array());
+        $bids = $this->safe_list($orderBook, 'Bids', array());
+        $this->handle_deltas($orderbook['asks'], $asks);
+        $this->handle_deltas($orderbook['bids'], $bids);
+        $orderbook['timestamp'] = $timestamp;
+        $orderbook['datetime'] = $this->iso8601($timestamp);
         $checksum = $this->handle_option('watchOrderBook', 'checksum', true);
         if ($checksum && $receivedSnapshot) {
             $storedAsks = $orderbook['asks'];
             $storedBids = $orderbook['bids'];
-            $asksLength = count($storedAsks);
-            $bidsLength = count($storedBids);
-            $payload = '';
-            for ($i = 0; $i < 10; $i++) {
-                if ($i < $bidsLength) {
-                    $payload = $payload . $this->value_to_checksum($storedBids[$i][0]) . $this->value_to_checksum($storedBids[$i][1]);
-                }
-            }
-            for ($i = 0; $i < 10; $i++) {
-                if ($i < $asksLength) {
-                    $payload = $payload . $this->value_to_checksum($storedAsks[$i][0]) . $this->value_to_checksum($storedAsks[$i][1]);
-                }
-            }
+            // every level keeps its $checksum string, computed once when the level was stored
+            $payload = implode('', $storedBids->topStrings (10)) . implode('', $storedAsks->topStrings (10));
             $calculatedChecksum = $this->crc32($payload, true);
             $responseChecksum = $this->safe_integer($orderBook, 'Crc32');
             if ($calculatedChecksum !== $responseChecksum) {
@@ -253,7 +245,11 @@ class independentreserve extends \ccxt\async\independentreserve {
 
     public function handle_delta($bookside, $delta) {
         $bidAsk = $this->parse_bid_ask($delta, 'Price', 'Volume');
-        $bookside->storeArray ($bidAsk);
+        if ($bidAsk[1]) {
+            $bookside->storeStringArray ($bidAsk, array( $this->value_to_checksum($bidAsk[0]) . $this->value_to_checksum($bidAsk[1]) ));
+        } else {
+            $bookside->storeStringArray ($bidAsk, array());
+        }
     }
 
     public function handle_deltas($bookside, $deltas) {
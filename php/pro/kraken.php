@@ -835,35 +835,20 @@ class kraken extends \ccxt\async\kraken {
             }
             $storedAsks = $orderbook['asks'];
             $storedBids = $orderbook['bids'];
-            $example = null;
             if ($a !== null) {
                 $timestamp = $this->custom_handle_deltas($storedAsks, $a, $timestamp);
-                $example = $this->safe_value($a, 0);
             }
             if ($b !== null) {
                 $timestamp = $this->custom_handle_deltas($storedBids, $b, $timestamp);
-                $example = $this->safe_value($b, 0);
             }
             // don't remove this line or I will poop on your face
             $orderbook->limit ();
             $checksum = $this->handle_option('watchOrderBook', 'checksum', true);
             if ($checksum) {
-                $priceString = $this->safe_string($example, 0);
-                $amountString = $this->safe_string($example, 1);
-                $priceParts = explode('.', $priceString);
-                $amountParts = explode('.', $amountString);
-                $priceLength = strlen($priceParts[1]) - 0;
-                $amountLength = strlen($amountParts[1]) - 0;
                 $payloadArray = array();
                 if ($c !== null) {
-                    for ($i = 0; $i < 10; $i++) {
-                        $formatted = $this->format_number($storedAsks[$i][0], $priceLength) . $this->format_number($storedAsks[$i][1], $amountLength);
-                        $payloadArray[] = $formatted;
-                    }
-                    for ($i = 0; $i < 10; $i++) {
-                        $formatted = $this->format_number($storedBids[$i][0], $priceLength) . $this->format_number($storedBids[$i][1], $amountLength);
-                        $payloadArray[] = $formatted;
-                    }
+                    // every level keeps its $checksum string, computed once when the level was stored
+                    $payloadArray = $this->array_concat($storedAsks->topStrings (10), $storedBids->topStrings (10));
                 }
                 $payload = implode('', $payloadArray);
                 $localChecksum = $this->crc32($payload, false);
@@ -900,6 +885,17 @@ class kraken extends \ccxt\async\kraken {
         }
     }
 
+    public function checksum_string($value) {
+        // the checksum is built from the strings received from the exchange
+        // with the decimal point and the leading zeros removed
+        $joined = str_replace('.', '', $value);
+        $i = 0;
+        while (($i < strlen($joined)) && ($joined[$i] === '0')) {
+            $i += 1;
+        }
+        return mb_substr($joined, $i);
+    }
+
     public function custom_handle_deltas($bookside, $deltas, $timestamp = null) {
         for ($j = 0; $j < count($deltas); $j++) {
             $delta = $deltas[$j];
@@ -907,7 +903,7 @@ class kraken extends \ccxt\async\kraken {
             $amount = $this->parse_number($delta[1]);
             $oldTimestamp = $timestamp ? $timestamp : 0;
             $timestamp = max ($oldTimestamp, $this->parse_to_int(floatval($delta[2]) * 1000));
-            $bookside->store ($price, $amount);
+            $bookside->storeStringArray (array( $price, $amount ), array( $this->checksum_string($delta[0]) . $this->checksum_string($delta[1]) ));
         }
         return $timestamp;
     }
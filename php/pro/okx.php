@@ -55,6 +55,11 @@ class okx extends \ccxt\async\okx {
                 ),
             ),
             'options' => array(
+                // options['ws']['coalesceSubscriptions'] merges the args of the subscriptions sent together, up to 64kb per message
+                'subscriptionBatch' => array(
+                    'field' => 'args',
+                    'limit' => 100,
+                ),
                 'watchOrderBook' => array(
                     'checksum' => true,
                     //
@@ -1250,6 +1255,15 @@ class okx extends \ccxt\async\okx {
         }
     }
 
+    public function handle_string_deltas($bookside, $deltas) {
+        for ($i = 0; $i < count($deltas); $i++) {
+            $delta = $deltas[$i];
+            $priceString = $this->safe_string($delta, 0);
+            $amountString = $this->safe_string($delta, 1);
+            $bookside->storeStringArray (array( $this->parse_number($priceString), $this->parse_number($amountString) ), array( $priceString, $amountString ));
+        }
+    }
+
     public function handle_order_book_message(Client $client, $message, $orderbook, $messageHash, $market = null) {
         //
         //     {
@@ -1274,26 +1288,35 @@ class okx extends \ccxt\async\okx {
         $bids = $this->safe_value($message, 'bids', array());
         $storedAsks = $orderbook['asks'];
         $storedBids = $orderbook['bids'];
-        $this->handle_deltas($storedAsks, $asks);
-        $this->handle_deltas($storedBids, $bids);
+        $checksum = $this->handle_option('watchOrderBook', 'checksum', true);
+        if ($checksum) {
+            // keep the price and amount strings for the $checksum
+            $this->handle_string_deltas($storedAsks, $asks);
+            $this->handle_string_deltas($storedBids, $bids);
+        } else {
+            // the levels are [ price, amount, liquidated orders, orders ], no count is stored, as in handleDelta
+            $this->handle_deltas_with_keys($storedAsks, $asks, 0, 1, 4);
+            $this->handle_deltas_with_keys($storedBids, $bids, 0, 1, 4);
+        }
         $marketId = $this->safe_string($message, 'instId');
         $symbol = $this->safe_symbol($marketId, $market);
-        $checksum = $this->handle_option('watchOrderBook', 'checksum', true);
         $seqId = $this->safe_integer($message, 'seqId');
         if ($checksum) {
             $prevSeqId = $this->safe_integer($message, 'prevSeqId');
             $nonce = $orderbook['nonce'];
             $asksLength = count($storedAsks);
             $bidsLength = count($storedBids);
+            $bidStrings = $storedBids->topStrings (25);
+            $askStrings = $storedAsks->topStrings (25);
             $payloadArray = array();
             for ($i = 0; $i < 25; $i++) {
                 if ($i < $bidsLength) {
-                    $payloadArray[] = $this->number_to_string($storedBids[$i][0]);
-                    $payloadArray[] = $this->number_to_string($storedBids[$i][1]);
+                    $payloadArray[] = $bidStrings[$i * 2];
+                    $payloadArray[] = $bidStrings[$i * 2 + 1];
                 }
                 if ($i < $asksLength) {
-                    $payloadArray[] = $this->number_to_string($storedAsks[$i][0]);
-                    $payloadArray[] = $this->number_to_string($storedAsks[$i][1]);
+                    $payloadArray[] = $askStrings[$i * 2];
+                    $payloadArray[] = $askStrings[$i * 2 + 1];
                 }
             }
             $payload = implode(':', $payloadArray);
@@ -329,4 +329,17 @@ function test_ws_order_book() {
     $reset_book->reset($order_book_input);
     $reset_book->limit();
     assert(equals($reset_book, $order_book_target));
+    // --------------------------------------------------------------------------------------------------------------------
+    $strings_book = new OrderBook(array(), 2);
+    $string_asks = $strings_book['asks'];
+    $string_asks->storeStringArray([1.3, 1], ['1.30', '1']);
+    $string_asks->storeStringArray([1.1, 1], ['1.10', '1']);
+    $string_asks->storeStringArray([1.2, 2], ['1.20', '2']);
+    assert(equals($string_asks->topStrings(2), ['1.10', '1', '1.20', '2']));
+    $string_asks->storeStringArray([1.1, 0], ['1.10', '0']);
+    $string_asks->storeStringArray([1.4, 1], ['1.40', '1']);
+    $strings_book->limit();
+    assert(equals($string_asks->topStrings(5), ['1.20', '2', '1.30', '1']));
+    $strings_book->reset(array());
+    assert(equals($string_asks->topStrings(5), []));
 }
@@ -8,6 +8,8 @@ __version__ = '4.4.7'
 
 import asyncio
 import concurrent.futures
+import functools
+import inspect
 import socket
 import certifi
 import aiohttp
@@ -15,6 +17,7 @@ import ssl
 import sys
 import yarl
 import math
+from contextvars import ContextVar
 from typing import Any, List
 from ccxt.base.types import Int, Str, Num, Strings
 
@@ -30,13 +33,20 @@ from ccxt.base.types import OrderType, OrderSide, OrderRequest, CancellationRequ
 # -----------------------------------------------------------------------------
 
 from ccxt.base.exchange import Exchange as BaseExchange, ArgumentsRequired
+from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE
 
 # -----------------------------------------------------------------------------
 
 from ccxt.async_support.base.ws.functions import inflate, inflate64, gunzip
 from ccxt.async_support.base.ws.fast_client import FastClient
+from ccxt.async_support.base.ws.protocol_client import ProtocolClient
 from ccxt.async_support.base.ws.future import Future
-from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook
+from ccxt.async_support.base.ws.worker import WorkerPool
+from ccxt.async_support.base.ws.stream import Stream, streaming
+from ccxt.async_support.base.ws.coalescer import Coalescer
+from ccxt.async_support.base.ws import hub
+from ccxt.async_support.base.ws import hooks
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook, ChunkedOrderBook, ChunkedIndexedOrderBook, ChunkedCountedOrderBook, BoundedOrderBook, BoundedCountedOrderBook, OrderBooks
 
 
 # -----------------------------------------------------------------------------
@@ -55,6 +65,48 @@ __all__ = [
 
 # -----------------------------------------------------------------------------
 
+# the connections used by the authenticate method of an exchange while it runs, or in a watch
+# method the scope of that call, {'private': True} after an authenticate that used no connection,
+# then the next watch of that call is private, like with a token in the url, see
+# Exchange.authenticated_connection
+authenticated = ContextVar('authenticated', default=None)
+
+
+def marks_private(method):
+    # the connections that authenticate logs in on are private
+    @functools.wraps(method)
+    async def authenticate(self, *args, **kwargs):
+        used = []
+        token = authenticated.set(used)
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            authenticated.reset(token)
+            outer = authenticated.get()
+            if isinstance(outer, list):
+                # called from the authenticate method of a subclass
+                outer.extend(used)
+            elif isinstance(outer, dict) and not used:
+                outer['private'] = True
+    return authenticate
+
+
+def private_scope(method):
+    # an authenticate that used no connection only makes a watch of the same call private
+    @functools.wraps(method)
+    async def scoped(self, *args, **kwargs):
+        if authenticated.get() is not None:
+            # called from another watch method or from authenticate
+            return await method(self, *args, **kwargs)
+        token = authenticated.set({'private': False})
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            authenticated.reset(token)
+    return scoped
+
+# -----------------------------------------------------------------------------
+
 
 class Exchange(BaseExchange):
     synchronous = False
@@ -65,8 +117,31 @@ class Exchange(BaseExchange):
     ping = None
     newUpdates = True
     clients = {}
+    # an exchange can define classify_message(client, message) to look at a websocket
+    # message before it is decoded, it returns False to drop the message, a method
+    # to handle the decoded message instead of handle_message, or None to decode
+    # and handle it as usual, see peek_json_string and ws/hooks.py
+    classify_message = None
+    # an exchange can define conflation_key(client, message) to return a key for messages
+    # that only the latest one of matters, like the ticker of a symbol, with
+    # options['ws']['maxQueueSize'] a message that waits to be handled is replaced by
+    # the next one with the same key, see FastClient and ws/hooks.py
+    conflation_key = None
+    ws_workers = None  # see worker_pool
+    ws_direct_urls = None  # the urls used through client(url) instead of watch, see shard_client
+    ws_hub = None  # the market data hub the public watch methods go to, see ws/hub.py
     timeout_on_exit = 250  # needed for: https://github.com/ccxt/ccxt/pull/23470
 
+    def __init_subclass__(cls, **kwargs):
+        super(Exchange, cls).__init_subclass__(**kwargs)
+        for name, method in list(cls.__dict__.items()):
+            if not inspect.iscoroutinefunction(method):
+                continue
+            if name == 'authenticate':
+                setattr(cls, name, marks_private(method))
+            elif name.startswith('watch_') or name.endswith('_ws'):
+                setattr(cls, name, private_scope(method))
+
     def __init__(self, config={}):
         if 'asyncio_loop' in config:
             self.asyncio_loop = config['asyncio_loop']
@@ -75,10 +150,14 @@ class Exchange(BaseExchange):
         self.own_session = 'session' not in config
         self.cafile = config.get('cafile', certifi.where())
         super(Exchange, self).__init__(config)
+        self.orderbooks = OrderBooks(self.orderbooks, self.on_order_book)
         self.throttle = None
         self.init_rest_rate_limiter()
         self.markets_loading = None
         self.reloading_markets = False
+        hub_name = self.safe_value(self.safe_value(self.options, 'ws', {}), 'hub')
+        if hub_name:
+            hub.attach(self, 'default' if hub_name is True else hub_name)
 
     def init_rest_rate_limiter(self):
         self.throttle = Throttler(self.tokenBucket, self.asyncio_loop)
@@ -101,6 +180,12 @@ class Exchange(BaseExchange):
         async def __aexit__(self, exc_type, exc, tb):
             await self.close()
 
+    def get_ssl_context(self):
+        if self.ssl_context is None:
+            # Create our SSL context object with our CA cert file
+            self.ssl_context = ssl.create_default_context(cafile=self.cafile) if self.verify else self.verify
+        return self.ssl_context
+
     def open(self):
         if self.asyncio_loop is None:
             if sys.version_info >= (3, 7):
@@ -109,9 +194,7 @@ class Exchange(BaseExchange):
                 self.asyncio_loop = asyncio.get_event_loop()
             self.throttle.loop = self.asyncio_loop
 
-        if self.ssl_context is None:
-            # Create our SSL context object with our CA cert file
-            self.ssl_context = ssl.create_default_context(cafile=self.cafile) if self.verify else self.verify
+        self.get_ssl_context()
 
         if self.own_session and self.session is None:
             # Pass this SSL context to aiohttp and create a TCPConnector
@@ -352,18 +435,184 @@ class Exchange(BaseExchange):
     def gunzip(data):
         return gunzip(data)
 
+    @staticmethod
+    def peek_json_string(message, key, limit=256):
+        # the value of the first "key":"value" within the first limit characters of a JSON
+        # message that hasn't been decoded yet, bytes or str, None if it isn't there
+        if isinstance(message, bytes):
+            needle = b'"' + key.encode() + b'":"'
+            start = message.find(needle, 0, limit)
+            if start < 0:
+                return None
+            start += len(needle)
+            end = message.find(b'"', start)
+            return message[start:end].decode() if end >= 0 else None
+        if not isinstance(message, str):
+            return None
+        needle = '"' + key + '":"'
+        start = message.find(needle, 0, limit)
+        if start < 0:
+            return None
+        start += len(needle)
+        end = message.find('"', start)
+        return message[start:end] if end >= 0 else None
+
+    # options['watchOrderBook']['orderBookSpill'] keeps books created with a depth bounded
+    # to that depth plus orderBookSpill spare levels, see BoundedOrderBookSide
     def order_book(self, snapshot={}, depth=None):
+        spill = self.handle_option('watchOrderBook', 'orderBookSpill')
+        if depth is not None and spill is not None:
+            return BoundedOrderBook(snapshot, depth, spill)
+        if self.handle_option('watchOrderBook', 'orderBookSide') == 'chunked':
+            return ChunkedOrderBook(snapshot, depth)
         return OrderBook(snapshot, depth)
 
     def indexed_order_book(self, snapshot={}, depth=None):
+        if self.handle_option('watchOrderBook', 'orderBookSide') == 'chunked':
+            return ChunkedIndexedOrderBook(snapshot, depth)
         return IndexedOrderBook(snapshot, depth)
 
     def counted_order_book(self, snapshot={}, depth=None):
+        spill = self.handle_option('watchOrderBook', 'orderBookSpill')
+        if depth is not None and spill is not None:
+            return BoundedCountedOrderBook(snapshot, depth, spill)
+        if self.handle_option('watchOrderBook', 'orderBookSide') == 'chunked':
+            return ChunkedCountedOrderBook(snapshot, depth)
         return CountedOrderBook(snapshot, depth)
 
-    def client(self, url):
+    async def watch_order_book_deltas(self, symbol: str, limit: Int = None, params={}):
+        """
+        watches the levels of an order book that changed since the last call of the same consumer
+        :param str symbol: unified symbol of the market to fetch the order book for
+        :param int [limit]: the maximum amount of order book entries to return
+        :param dict [params]: extra parameters specific to the exchange API endpoint
+        :param object [params.consumer]: any object that can be weakly referenced, every consumer gets all of the changes, defaults to the calling task
+        :returns dict: an `order book structure <https://docs.ccxt.com/#/?id=order-book-structure>` with the changed levels only, removed levels have an amount of 0, the whole book if 'snapshot' is True
+        """
+        consumer = self.safe_value(params, 'consumer')
+        params = self.omit(params, 'consumer')
+        orderbook = await self.watch_order_book(symbol, limit, params)
+        if consumer is None:
+            consumer = asyncio.current_task()
+        return orderbook.get_changes(consumer)
+
+    async def stream_method(self, method, *args, since=None, limit=None):
+        # an async iterator over the updates of the subscription of a watch method
+        # the first one is what the watch method returns, the next ones come from one queue
+        # of the subscription, without calling the watch method and with a future only when
+        # the queue is empty, they are read like the watch method returns them, see Stream.read,
+        # since and limit filter the items of a cache like in the watch methods
+        # it ends with the error the watch method would raise
+        stream = Stream(self.safe_integer(self.safe_value(self.options, 'ws'), 'streamQueueSize', 1000))
+        watch = getattr(self, method)
+        try:
+            while not stream.started:
+                token = streaming.set(stream)
+                try:
+                    result = await watch(*args)
+                finally:
+                    streaming.reset(token)
+                # until a watch of the method subscribes through the client
+                stream.started = stream.client is not None
+                yield result
+            while True:
+                result, end = stream.pop() if stream.ready() else await stream.next()
+                update = stream.read(result, end)
+                key = stream.sort_key(result)
+                if key is not None:
+                    update = self.filter_by_since_limit(update, since, limit, key, True)
+                    if not update:
+                        # nothing was stored since the last one or since filtered it all
+                        continue
+                yield update
+        finally:
+            stream.detach()
+
+    def stream_ticker(self, symbol: str, params={}):
+        return self.stream_method('watch_ticker', symbol, params)
+
+    def stream_tickers(self, symbols: Strings = None, params={}):
+        return self.stream_method('watch_tickers', symbols, params)
+
+    def stream_bids_asks(self, symbols: Strings = None, params={}):
+        return self.stream_method('watch_bids_asks', symbols, params)
+
+    def stream_trades(self, symbol: str, since: Int = None, limit: Int = None, params={}):
+        return self.stream_method('watch_trades', symbol, since, limit, params, since=since, limit=limit)
+
+    def stream_trades_for_symbols(self, symbols: List[str], since: Int = None, limit: Int = None, params={}):
+        return self.stream_method('watch_trades_for_symbols', symbols, since, limit, params, since=since, limit=limit)
+
+    def stream_order_book(self, symbol: str, limit: Int = None, params={}):
+        return self.stream_method('watch_order_book', symbol, limit, params)
+
+    def stream_order_book_for_symbols(self, symbols: List[str], limit: Int = None, params={}):
+        return self.stream_method('watch_order_book_for_symbols', symbols, limit, params)
+
+    def stream_ohlcv(self, symbol: str, timeframe='1m', since: Int = None, limit: Int = None, params={}):
+        return self.stream_method('watch_ohlcv', symbol, timeframe, since, limit, params, since=since, limit=limit)
+
+    def stream_balance(self, params={}):
+        return self.stream_method('watch_balance', params)
+
+    def stream_orders(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        return self.stream_method('watch_orders', symbol, since, limit, params, since=since, limit=limit)
+
+    def stream_my_trades(self, symbol: Str = None, since: Int = None, limit: Int = None, params={}):
+        return self.stream_method('watch_my_trades', symbol, since, limit, params, since=since, limit=limit)
+
+    def stream_positions(self, symbols: Strings = None, since: Int = None, limit: Int = None, params={}):
+        return self.stream_method('watch_positions', symbols, since, limit, params, since=since, limit=limit)
+
+    # with options['watchOrderBook']['orderBookTicks'] = True the order books
+    # are keyed by integer price ticks of the market's price precision
+    def on_order_book(self, symbol, orderbook):
+        if not self.handle_option('watchOrderBook', 'orderBookTicks', False):
+            return
+        tick = self.price_tick(symbol)
+        if tick is not None and isinstance(orderbook, OrderBook):
+            orderbook.set_tick(tick)
+
+    def price_tick(self, symbol):
+        # the price step of a market or None if it isn't known
+        market = self.markets.get(symbol) if self.markets else None
+        if market is None:
+            return None
+        precision = self.safe_value(market['precision'], 'price')
+        if precision is None:
+            return None
+        if self.precisionMode == TICK_SIZE:
+            return float(precision)
+        if self.precisionMode == DECIMAL_PLACES:
+            return 10 ** -int(precision)
+        return None
+
+    def handle_deltas_with_keys(self, bookSide, deltas, priceKey=0, amountKey=1, countOrIdKey=2):
+        # same as the transpiled method, but converts the whole bids or asks array
+        # in one pass and merges it into the side with a single sweep
+        if isinstance(countOrIdKey, int):
+            counted = any(isinstance(delta, list) and len(delta) > countOrIdKey for delta in deltas)
+        else:
+            counted = any(countOrIdKey in delta for delta in deltas)
+        if self.number is float and not counted:
+            try:
+                bidasks = [[float(delta[priceKey]), float(delta[amountKey])] for delta in deltas]
+            except (TypeError, ValueError, KeyError, IndexError):
+                # missing or malformed values, parse_bid_ask turns them into None
+                bidasks = [self.parse_bid_ask(delta, priceKey, amountKey, countOrIdKey) for delta in deltas]
+        else:
+            # levels with a count or id, or numbers that aren't floats
+            bidasks = [self.parse_bid_ask(delta, priceKey, amountKey, countOrIdKey) for delta in deltas]
+        bookSide.store_many(bidasks)
+
+    def client(self, url, key=None):
+        # key tells apart several connections to the same url, see shard_client
+        if key is None:
+            self.ws_direct_urls = self.ws_direct_urls or set()
+            self.ws_direct_urls.add(url)
+            key = url
         self.clients = self.clients or {}
-        if url not in self.clients:
+        if key not in self.clients:
             on_message = self.handle_message
             on_error = self.on_error
             on_close = self.on_close
@@ -376,10 +625,60 @@ class Exchange(BaseExchange):
                 'verbose': self.verbose,
                 'throttle': Throttler(self.tokenBucket, self.asyncio_loop),
                 'asyncio_loop': self.asyncio_loop,
+                'ssl_context': self.get_ssl_context(),
+                'classifier': self.classify_message or hooks.lookup(self, hooks.classifiers),
+                'conflate': self.conflation_key or hooks.lookup(self, hooks.conflation_keys),
+                'on_reconnect_callback': self.on_reconnect,
             }, ws_options)
-            self.clients[url] = FastClient(url, on_message, on_error, on_close, on_connected, options)
-            self.clients[url].proxy = self.get_ws_proxy()
-        return self.clients[url]
+            # options['ws']['client'] = 'protocol' for the client that doesn't depend on the internals of aiohttp
+            client_class = ProtocolClient if self.safe_string(ws_options, 'client') == 'protocol' else FastClient
+            self.clients[key] = client_class(url, on_message, on_error, on_close, on_connected, options)
+            self.clients[key].proxy = self.get_ws_proxy()
+            self.clients[key].key = key
+            window = self.safe_value(ws_options, 'coalesceSubscriptions')
+            batch = self.safe_dict(self.options, 'subscriptionBatch')
+            if window and batch is not None:
+                cost = self.safe_value(ws_options, 'cost', 1) if self.enableRateLimit else None
+                self.clients[key].coalescer = Coalescer(self.clients[key], batch, 10 if window is True else window, cost)
+        if isinstance(authenticated.get(), list):
+            # the connection authenticate logs in on, also when it is logged in already
+            self.authenticated_connection(self.clients[key])
+        return self.clients[key]
+
+    # options['ws']['maxSubscriptionsPerConnection'] spreads the subscriptions to one url
+    # over several connections, and options['ws']['maxMessagesPerConnection'] stops adding
+    # subscriptions to a connection that receives more messages per second than that
+    # only public subscriptions are spread, authenticate and the methods that send requests
+    # use the connection of client(url), so the subscriptions to a url that is used that
+    # way go to that connection, which is the one that logged in
+    def shard_client(self, url, message_hashes, subscribe_hashes=None, subscription=None):
+        ws_options = self.safe_value(self.options, 'ws', {})
+        max_subscriptions = self.safe_integer(ws_options, 'maxSubscriptionsPerConnection')
+        if max_subscriptions is None:
+            return self.client(url, url)
+        max_messages = self.safe_number(ws_options, 'maxMessagesPerConnection')
+        subscribe_hashes = subscribe_hashes or []
+        # an unsubscription goes to the connection of the subscription
+        related = subscribe_hashes + (self.safe_list(subscription, 'subMessageHashes', []) if isinstance(subscription, dict) else [])
+        shards = [client for client in (self.clients or {}).values() if client.url == url]
+        for client in shards:
+            if any(hash in client.subscriptions for hash in related) or any(hash in client.futures for hash in message_hashes):
+                return client
+        if self.ws_direct_urls and url in self.ws_direct_urls:
+            return self.client(url)
+        # new subscriptions go to the least loaded connection that still has room
+        # so connections opened again after a disconnect fill up first
+        needed = len(subscribe_hashes)
+        available = [client for client in shards if len(client.subscriptions) + needed <= max_subscriptions and (max_messages is None or client.message_rate() <= max_messages)]
+        if available:
+            return min(available, key=lambda client: len(client.subscriptions))
+        keys = set(client.key for client in shards)
+        key = url
+        index = 0
+        while key in keys:
+            index += 1
+            key = url + '#' + str(index)
+        return self.client(url, key)
 
     def get_ws_proxy(self):
         httpProxy, httpsProxy, socksProxy = self.check_ws_proxy_settings()
@@ -400,12 +699,25 @@ class Exchange(BaseExchange):
             raise NotSupported(self.id + '.handle_message() not implemented yet')
         return {}
 
+    # options['ws']['workers'] moves the connections to that many processes, see ws/worker.py
+    def worker_pool(self):
+        if self.ws_workers is None:
+            workers = self.safe_integer(self.safe_value(self.options, 'ws'), 'workers')
+            if workers:
+                self.ws_workers = WorkerPool(self, workers)
+        return self.ws_workers
+
     def watch_multiple(self, url, message_hashes, message=None, subscribe_hashes=None, subscription=None):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        workers = self.worker_pool()
+        client = self.client(url) if workers else self.shard_client(url, message_hashes, subscribe_hashes, subscription)
 
+        self.authenticated_connection(client)
+        stream = streaming.get()
+        if stream is not None:
+            stream.watch(client, message_hashes)
         future = Future.race([client.future(message_hash) for message_hash in message_hashes])
 
         missing_subscriptions = []
@@ -415,6 +727,11 @@ class Exchange(BaseExchange):
                     missing_subscriptions.append(subscribe_hash)
                     client.subscriptions[subscribe_hash] = subscription or True
 
+        if workers:
+            if missing_subscriptions:
+                workers.send(url, 'watch_multiple', message_hashes, message, subscribe_hashes, subscription)
+            return future
+
         connected = client.connected if client.connected.done() \
             else asyncio.ensure_future(client.connect(self.session, backoff_delay))
 
@@ -424,10 +741,18 @@ class Exchange(BaseExchange):
             cost = self.safe_value(options, 'cost', 1)
             if message:
                 async def send_message():
+                    if client.coalescer is not None and client.coalescer.accepts(message):
+                        # sent together with the other subscriptions of the window
+                        sent = await client.coalescer.add(message)
+                        if sent and client.reconnect:
+                            self.remember_subscription(client, missing_subscriptions, message)
+                        return
                     if self.enableRateLimit:
                         await client.throttle(cost)
                     try:
                         await client.send(message)
+                        if client.reconnect:
+                            self.remember_subscription(client, missing_subscriptions, message)
                     except ConnectionError as e:
                         client.on_error(e)
                     except Exception as e:
@@ -443,7 +768,12 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        workers = self.worker_pool()
+        client = self.client(url) if workers else self.shard_client(url, [message_hash], None if subscribe_hash is None else [subscribe_hash], subscription)
+        self.authenticated_connection(client)
+        stream = streaming.get()
+        if stream is not None:
+            stream.watch(client, [message_hash])
         if subscribe_hash is None and message_hash in client.futures:
             return client.futures[message_hash]
         future = client.future(message_hash)
@@ -453,6 +783,11 @@ class Exchange(BaseExchange):
         if not subscribed:
             client.subscriptions[subscribe_hash] = subscription or True
 
+        if workers:
+            if not subscribed:
+                workers.send(url, 'watch', message_hash, message, subscribe_hash, subscription)
+            return future
+
         connected = client.connected if client.connected.done() \
             else asyncio.ensure_future(client.connect(self.session, backoff_delay))
 
@@ -462,10 +797,18 @@ class Exchange(BaseExchange):
             cost = self.safe_value(options, 'cost', 1)
             if message:
                 async def send_message():
+                    if client.coalescer is not None and client.coalescer.accepts(message):
+                        # sent together with the other subscriptions of the window
+                        sent = await client.coalescer.add(message)
+                        if sent and client.reconnect:
+                            self.remember_subscription(client, [subscribe_hash], message)
+                        return
                     if self.enableRateLimit:
                         await client.throttle(cost)
                     try:
                         await client.send(message)
+                        if client.reconnect:
+                            self.remember_subscription(client, [subscribe_hash], message)
                     except ConnectionError as e:
                         client.on_error(e)
                     except Exception as e:
@@ -482,9 +825,78 @@ class Exchange(BaseExchange):
         # print('Connected to', client.url)
         pass
 
+    # options['ws']['reconnect'] connects again after the connection is lost, see Client.schedule_reconnect,
+    # the subscriptions that are still there are sent again and their handlers fetch new order book snapshots
+    # the private connections aren't reconnected, their futures are rejected and the next watch authenticates again
+    def authenticated_connection(self, client):
+        # a connection that authenticate used to log in, or the one of the first watch
+        # of a watch method after an authenticate that used no connection in that method,
+        # with a token in the url or in the subscriptions
+        state = authenticated.get()
+        if state is None:
+            return
+        if isinstance(state, dict):
+            if not state['private']:
+                return
+            state['private'] = False
+        elif client in state:
+            return
+        else:
+            state.append(client)
+        client.reconnect = False
+        client.replay = {}
+
+    def remember_subscription(self, client, subscribe_hashes, message):
+        text = message if isinstance(message, str) else self.json(message)
+        credentials = [getattr(self, key, None) for key in self.requiredCredentials]
+        if any(isinstance(value, str) and value and value in text for value in credentials):
+            # requests that carry the api key, like the orders signed one by one, are private too
+            client.reconnect = False
+            client.replay = {}
+            return
+        for subscribe_hash in subscribe_hashes:
+            client.replay[subscribe_hash] = message
+
+    def on_reconnect(self, client):
+        messages = {}
+        for subscribe_hash in list(client.replay):
+            if subscribe_hash in client.subscriptions:
+                message = client.replay[subscribe_hash]
+                messages[id(message)] = message
+            else:
+                # unsubscribed
+                del client.replay[subscribe_hash]
+        options = self.safe_value(self.options, 'ws')
+        cost = self.safe_value(options, 'cost', 1)
+
+        async def send_messages():
+            for message in messages.values():
+                if client.coalescer is not None and client.coalescer.accepts(message):
+                    client.coalescer.add(message)
+                    continue
+                if self.enableRateLimit:
+                    await client.throttle(cost)
+                try:
+                    await client.send(message)
+                except Exception as e:
+                    client.on_error(e)
+                    return
+
+        if messages:
+            asyncio.ensure_future(send_messages())
+
+    # options['ws']['latency'] times the messages of each connection, see ws/latency.py
+    def latency_stats(self, message_hash=None):
+        # client key -> message hash -> stage -> histogram
+        result = {}
+        for key, client in (self.clients or {}).items():
+            if client.latencies is not None:
+                result[key] = client.latencies.stats(message_hash)
+        return result
+
     def on_error(self, client, error):
-        if client.url in self.clients and self.clients[client.url].error:
-            del self.clients[client.url]
+        if client.key in self.clients and self.clients[client.key].error:
+            del self.clients[client.key]
 
     def on_close(self, client, error):
         if client.error:
@@ -492,10 +904,15 @@ class Exchange(BaseExchange):
             pass
         else:
             # server disconnected a working connection
-            if client.url in self.clients:
-                del self.clients[client.url]
+            if client.key in self.clients:
+                del self.clients[client.key]
 
     async def ws_close(self):
+        if self.ws_hub is not None:
+            await self.ws_hub.detach(self)
+        if self.ws_workers:
+            await self.ws_workers.close()
+            self.ws_workers = None
         if self.clients:
             await asyncio.wait([asyncio.create_task(client.close()) for client in self.clients.values()], return_when=asyncio.ALL_COMPLETED)
             for url in self.clients.copy():
@@ -5,7 +5,8 @@ from asyncio import sleep, ensure_future
 from aiohttp import WSMsgType
 from .functions import milliseconds, iso8601, is_json_encoded_object
 from ccxt.async_support.base.ws.client import Client
-from ccxt.async_support.base.ws.functions import gunzip, inflate
+from ccxt.async_support.base.ws.functions import gunzip_bytes, inflate
+from ccxt.async_support.base.ws.keepalive import keepalive_wheel
 from ccxt import NetworkError, RequestTimeout, ExchangeClosedByUser
 
 
@@ -23,19 +24,33 @@ class AiohttpClient(Client):
     def handle_text_or_binary_message(self, data):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'message', data)
+        handler = self.on_message_callback
+        if self.classifier is not None:
+            route = self.classifier(self, data)
+            if route is False:
+                return
+            if route is not None:
+                handler = route
         if isinstance(data, bytes):
-            data = data.decode()
-        decoded = json.loads(data) if is_json_encoded_object(data) else data
-        self.on_message_callback(self, decoded)
+            # the decoder reads bytes, only messages that aren't JSON are decoded to str
+            if len(data) >= 2 and (data[0] == 123 or data[0] == 91):  # { or [
+                decoded = self.decode_json(data)
+            else:
+                decoded = data.decode()
+        else:
+            decoded = self.decode_json(data) if is_json_encoded_object(data) else data
+        handler(self, decoded)
 
     def handle_message(self, message):
         # self.log(iso8601(milliseconds()), message)
+        self.messages += 1
         if message.type == WSMsgType.TEXT:
             self.handle_text_or_binary_message(message.data)
         elif message.type == WSMsgType.BINARY:
             data = message.data
+            # decompressed to bytes that go to the JSON decoder as they are
             if self.gunzip:
-                data = gunzip(data)
+                data = gunzip_bytes(data)
             elif self.inflate:
                 data = inflate(data)
             self.handle_text_or_binary_message(data)
@@ -82,15 +97,26 @@ class AiohttpClient(Client):
             self.log(iso8601(milliseconds()), 'sending', message)
         return await self.connection.send_str(message if isinstance(message, str) else json.dumps(message, separators=(',', ':')))
 
+    def drop_connection(self):
+        connection = super(AiohttpClient, self).drop_connection()
+        if connection is not None and not connection.closed:
+            ensure_future(connection.close(), loop=self.asyncio_loop)
+        return connection
+
     async def close(self, code=1000):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'closing', code)
+        self.reconnect = False
+        if self.reconnecting:
+            self.reconnecting = False
+            self.reconnector.cancel()
         if not self.closed():
             await self.connection.close()
         # these will end automatically once self.closed() = True
         # so we don't need to cancel them
         if self.ping_looper:
             self.ping_looper.cancel()
+        keepalive_wheel(self.asyncio_loop).remove(self)
         if self.receive_looper:
             self.receive_looper.cancel()  # cancel all pending futures stored in self.futures
         for key in self.futures:
@@ -100,26 +126,37 @@ class AiohttpClient(Client):
                     future.cancel()  # this is an "internal" future so we want to cancel it silently
                 else:
                     future.reject(ExchangeClosedByUser('Connection closed by the user'))
+        for streams in list(self.streams.values()):
+            for stream in list(streams):
+                stream.fail(ExchangeClosedByUser('Connection closed by the user'))
 
 
     async def ping_loop(self):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'ping loop')
-        while self.keepAlive and not self.closed():
-            now = milliseconds()
-            self.lastPong = now if self.lastPong is None else self.lastPong
-            if (self.lastPong + self.keepAlive * self.maxPingPongMisses) < now:
-                self.on_error(RequestTimeout('Connection to ' + self.url + ' timed out due to a ping-pong keepalive missing on time'))
-            # the following ping-clause is not necessary with aiohttp's built-in ws
-            # since it has a heartbeat option (see create_connection above)
-            # however some exchanges require a text-type ping message
-            # therefore we need this clause anyway
-            else:
-                if self.ping:
-                    try:
-                        await self.send(self.ping(self))
-                    except Exception as e:
-                        self.on_error(e)
-                else:
-                    await self.connection.ping()
+        while self.keepalive():
             await sleep(self.keepAlive / 1000)
+
+    def keepalive(self):
+        if not self.keepAlive or self.closed():
+            return False
+        now = milliseconds()
+        self.lastPong = now if self.lastPong is None else self.lastPong
+        if (self.lastPong + self.keepAlive * self.maxPingPongMisses) < now:
+            self.on_error(RequestTimeout('Connection to ' + self.url + ' timed out due to a ping-pong keepalive missing on time'))
+        # the following ping-clause is not necessary with aiohttp's built-in ws
+        # since it has a heartbeat option (see create_connection above)
+        # however some exchanges require a text-type ping message
+        # therefore we need this clause anyway
+        else:
+            ensure_future(self.send_ping(), loop=self.asyncio_loop)
+        return not self.closed()
+
+    async def send_ping(self):
+        try:
+            if self.ping:
+                await self.send(self.ping(self))
+            else:
+                await self.connection.ping()
+        except Exception as e:
+            self.on_error(e)
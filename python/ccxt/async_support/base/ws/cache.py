@@ -65,6 +65,21 @@ class ArrayCache(BaseCache):
         self._clear_updates_by_symbol = {}
         self._all_new_updates = 0
         self._clear_all_updates = False
+        # a number for every append, parallel to the items, see Stream.read
+        self._serial = 0
+        self._serials = collections.deque([], max_size)
+
+    def clear(self):
+        self._deque.clear()
+        self._serials.clear()
+
+    def pop(self):
+        self._serials.pop()
+        return self._deque.pop()
+
+    def _count_append(self):
+        self._serial += 1
+        self._serials.append(self._serial)
 
     def getLimit(self, symbol, limit):
         if symbol is None:
@@ -85,6 +100,7 @@ class ArrayCache(BaseCache):
 
     def append(self, item):
         self._deque.append(item)
+        self._count_append()
         if self._clear_all_updates:
             self._clear_all_updates = False
             self._clear_updates_by_symbol.clear()
@@ -146,14 +162,17 @@ class ArrayCacheBySymbolById(ArrayCache):
             index = self._index.index(item['id'])
             del self._deque[index]
             del self._index[index]
+            del self._serials[index]
         else:
             by_id[item['id']] = item
         if len(self._deque) == self._deque.maxlen:
             delete_item = self._deque.popleft()
             self._index.popleft()
+            self._serials.popleft()
             del self.hashmap[delete_item['symbol']][delete_item['id']]
         self._deque.append(item)
         self._index.append(item['id'])
+        self._count_append()
         if self._clear_all_updates:
             self._clear_all_updates = False
             self._clear_updates_by_symbol.clear()
@@ -188,14 +207,17 @@ class ArrayCacheBySymbolBySide(ArrayCache):
             index = self._index.index(item['symbol'] + item['side'])
             del self._deque[index]
             del self._index[index]
+            del self._serials[index]
         else:
             by_side[item['side']] = item
         if len(self._deque) == self._deque.maxlen:
             delete_item = self._deque.popleft()
             self._index.popleft()
+            self._serials.popleft()
             del self.hashmap[delete_item['symbol']][delete_item['side']]
         self._deque.append(item)
         self._index.append(item['symbol'] + item['side'])
+        self._count_append()
         if self._clear_all_updates:
             self._clear_all_updates = False
             self._clear_updates_by_symbol.clear()
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 
 from asyncio import sleep, ensure_future, wait_for, TimeoutError
+from random import uniform
 from .functions import milliseconds, iso8601, deep_extend
 from ccxt import NetworkError, RequestTimeout, NotSupported
 from ccxt.async_support.base.ws.future import Future
+from ccxt.base.json_decoder import get_decoder
+from ccxt.async_support.base.ws.keepalive import keepalive_wheel
+from ccxt.async_support.base.ws.latency import LatencyRecorder
 from collections import deque
 
 class Client(object):
@@ -14,6 +18,7 @@ class Client(object):
     options = {}  # ws-specific options
     subscriptions = {}
     rejections = {}
+    streams = {}  # message hash -> streams that get everything resolved for it, see ws/stream.py
     message_queue = {}
     useMessageQueue = False
     on_message_callback = None
@@ -28,6 +33,7 @@ class Client(object):
     error = None  # low-level networking exception, if any
     connected = None  # connection-related Future
     keepAlive = 5000
+    sharedKeepAlive = True  # the pings of all the clients go from one timer, see ws/keepalive.py, False for a ping_loop per client
     heartbeat = True
     maxPingPongMisses = 2.0  # how many missed pongs to raise a timeout
     lastPong = None
@@ -40,6 +46,27 @@ class Client(object):
     asyncio_loop = None
     ping_looper = None
     receive_looper = None
+    jsonDecoder = None  # orjson, msgspec, ujson or json, the fastest one installed by default
+    classifier = None  # looks at messages before they are decoded, see Exchange.classify_message
+    key = None  # the key of the client in exchange.clients, the url unless there are several connections to it
+    messages = 0  # messages received since the connection was established
+    forward = None  # gets everything resolved or rejected in a worker process, see ws/worker.py
+    session = None
+    reconnect = False  # connect again when the connection is lost instead of rejecting the futures
+    reconnectDelay = 1000  # ms before the first attempt, doubled after each attempt that fails
+    maxReconnectDelay = 30000
+    maxReconnects = None  # attempts in a row before giving up and rejecting the futures, None for no limit
+    reconnecting = False
+    reconnector = None
+    reconnects = 0  # times the connection was established again
+    reconnectAttempts = 0  # attempts since the connection was lost
+    disconnected = None  # when the connection was lost, while reconnecting
+    downtime = 0  # ms without a connection over all the reconnects
+    replay = {}  # subscribe hash -> the message sent for it, sent again after reconnecting
+    on_reconnect_callback = None
+    latency = False  # times the messages through the client, see ws/latency.py
+    coalescer = None  # sends the subscriptions of a short window together, see ws/coalescer.py
+    latencies = None
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         defaults = {
@@ -47,6 +74,8 @@ class Client(object):
             'futures': {},
             'subscriptions': {},
             'rejections': {},
+            'streams': {},
+            'replay': {},
             'on_message_callback': on_message_callback,
             'on_error_callback': on_error_callback,
             'on_close_callback': on_close_callback,
@@ -62,6 +91,9 @@ class Client(object):
                 setattr(self, key, settings[key])
         # connection-related Future
         self.connected = Future()
+        self.decode_json = get_decoder(self.jsonDecoder)
+        if self.latency:
+            self.latencies = LatencyRecorder(self)
 
     def future(self, message_hash):
         if message_hash not in self.futures or self.futures[message_hash].cancelled():
@@ -82,6 +114,8 @@ class Client(object):
     def resolve(self, result, message_hash):
         if self.verbose and message_hash is None:
             self.log(iso8601(milliseconds()), 'resolve received None messageHash')
+        if self.forward is not None:
+            self.forward(self, 'resolve', result, message_hash)
 
         if self.useMessageQueue:
             if message_hash not in self.message_queue:
@@ -97,10 +131,20 @@ class Client(object):
                 future = self.futures[message_hash]
                 future.resolve(result)
                 del self.futures[message_hash]
+        if self.streams and message_hash in self.streams:
+            for stream in self.streams[message_hash]:
+                stream.put(result)
         return result
 
     def reject(self, result, message_hash=None):
         if message_hash:
+            if self.forward is not None:
+                self.forward(self, 'reject', result, message_hash)
+            if self.streams and message_hash in self.streams:
+                for stream in list(self.streams[message_hash]):
+                    stream.fail(result)
+                if message_hash not in self.futures:
+                    return result
             if message_hash in self.futures:
                 future = self.futures[message_hash]
                 future.reject(result)
@@ -111,8 +155,39 @@ class Client(object):
             message_hashes = list(self.futures.keys())
             for message_hash in message_hashes:
                 self.reject(result, message_hash)
+            for streams in list(self.streams.values()):
+                for stream in list(streams):
+                    stream.fail(result)
         return result
 
+    def batched_ids(self, id):
+        # the ids of the messages that were sent as one message with this id
+        if self.coalescer is None:
+            return [id]
+        return self.coalescer.ids(id)
+
+    def batchedIds(self, id):
+        return self.batched_ids(id)
+
+    def message_rate(self):
+        # messages per second since the connection was established
+        if self.connectionEstablished is None:
+            return 0
+        elapsed = milliseconds() - self.connectionEstablished
+        return self.messages * 1000 / elapsed if elapsed > 0 else 0
+
+    def reconnect_stats(self):
+        downtime = self.downtime
+        if self.disconnected is not None:
+            downtime += milliseconds() - self.disconnected
+        return {
+            'reconnects': self.reconnects,
+            'attempts': self.reconnectAttempts,
+            'reconnecting': self.reconnecting,
+            'downtime': downtime,
+            'lastDisconnect': self.disconnected,
+        }
+
     async def receive_loop(self):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'receive loop')
@@ -139,36 +214,100 @@ class Client(object):
             self.connection = await wait_for(coroutine, timeout=int(self.connectionTimeout / 1000))
             self.connecting = False
             self.connectionEstablished = milliseconds()
+            self.messages = 0
             self.isConnected = True
             if self.verbose:
                 self.log(iso8601(milliseconds()), 'connected')
+            reconnected = self.reconnecting
+            if reconnected:
+                self.downtime += self.connectionEstablished - self.disconnected
+                self.reconnects += 1
+                self.reconnectAttempts = 0
+                self.disconnected = None
+                self.reconnecting = False
+                self.reconnector = None
             self.connected.resolve(self.url)
             self.on_connected_callback(self)
             # run both loops forever
-            self.ping_looper = ensure_future(self.ping_loop(), loop=self.asyncio_loop)
+            if not self.sharedKeepAlive:
+                self.ping_looper = ensure_future(self.ping_loop(), loop=self.asyncio_loop)
+            elif self.keepAlive:
+                keepalive_wheel(self.asyncio_loop).add(self, 0)
             self.receive_looper = ensure_future(self.receive_loop(), loop=self.asyncio_loop)
+            if reconnected and self.on_reconnect_callback is not None:
+                self.on_reconnect_callback(self)
         except TimeoutError:
             # connection timeout
+            self.reconnector = None
             error = RequestTimeout('Connection timeout')
             if self.verbose:
                 self.log(iso8601(milliseconds()), 'RequestTimeout', error)
             self.on_error(error)
         except Exception as e:
             # connection failed or rejected (ConnectionRefusedError, ClientConnectorError)
+            self.reconnector = None
             error = NetworkError(e)
             if self.verbose:
                 self.log(iso8601(milliseconds()), 'NetworkError', error)
             self.on_error(error)
 
     def connect(self, session, backoff_delay=0):
+        self.session = session
         if not self.connection and not self.connecting:
             self.connecting = True
             ensure_future(self.open(session, backoff_delay), loop=self.asyncio_loop)
         return self.connected
 
+    def can_reconnect(self):
+        if not self.reconnect or self.session is None:
+            return False
+        if self.maxReconnects is not None and self.reconnectAttempts >= self.maxReconnects:
+            return False
+        # a login can't be sent again as it was signed, the next watch logs in again
+        return 'authenticated' not in self.subscriptions and 'authenticated' not in self.futures
+
+    def schedule_reconnect(self):
+        # the futures, the subscriptions and the streams stay, and
+        # the subscribe messages are sent again once connected, see Exchange.on_reconnect
+        if self.reconnector is not None and not self.reconnector.done():
+            # already reconnecting
+            return
+        if self.disconnected is None:
+            self.disconnected = milliseconds()
+        self.drop_connection()
+        self.message_queue = {}
+        delay = min(self.maxReconnectDelay, self.reconnectDelay * (2 ** self.reconnectAttempts))
+        # half of the delay is random so that the connections lost together don't come back at once
+        delay = uniform(delay / 2, delay)
+        if self.verbose:
+            self.log(iso8601(milliseconds()), 'reconnecting in', int(delay), 'ms')
+        self.reconnectAttempts += 1
+        self.reconnecting = True
+        self.connecting = True
+        if self.connected.done():
+            self.connected = Future()
+        self.reconnector = ensure_future(self.open(self.session, delay / 1000), loop=self.asyncio_loop)
+
+    def drop_connection(self):
+        # stops the loops of the connection without touching the futures
+        connection = self.connection
+        self.connection = None
+        self.isConnected = False
+        self.lastPong = None
+        if self.ping_looper:
+            self.ping_looper.cancel()
+        keepalive_wheel(self.asyncio_loop).remove(self)
+        if self.receive_looper:
+            self.receive_looper.cancel()
+        return connection
+
     def on_error(self, error):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'on_error', error)
+        if self.can_reconnect():
+            self.schedule_reconnect()
+            return
+        self.reconnecting = False
         self.error = error
         self.reset(error)
         self.on_error_callback(self, error)
@@ -178,6 +317,10 @@ class Client(object):
     def on_close(self, code):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'on_close', code)
+        if not self.error and self.can_reconnect():
+            self.schedule_reconnect()
+            return
+        self.reconnecting = False
         if not self.error:
             self.reset(NetworkError('Connection closed by remote server, closing code ' + str(code)))
         self.on_close_callback(self, code)
@@ -192,6 +335,10 @@ class Client(object):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'ping loop')
 
+    def keepalive(self):
+        # pings or times out the connection, returns whether to do it again in keepAlive ms
+        return False
+
     def receive(self):
         raise NotSupported('receive() not implemented')
 
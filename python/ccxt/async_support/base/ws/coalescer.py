@@ -0,0 +1,93 @@
+"""Sends the subscribe and unsubscribe messages of a short window together
+
+With options['ws']['coalesceSubscriptions'] set to True or a window in ms, the
+messages that watch and watch_multiple send within the window are merged into
+as few messages as the exchange accepts, each one throttled once. The exchange
+describes its messages in options['subscriptionBatch']:
+
+    field  the list that is merged, like binance params or okx and bybit args
+    id     the request id, the merged message keeps the id of its first message
+    limit  the most items in the field of one message
+
+Only messages that are the same apart from the field and the id are merged.
+An exchange that matches acknowledgements by id gets the ids of all the merged
+messages from Client.batched_ids."""
+
+import json
+from asyncio import ensure_future, get_running_loop
+from ccxt.async_support.base.ws.future import Future
+
+
+class Coalescer(object):
+
+    def __init__(self, client, batch, window=10, cost=None):
+        self.client = client
+        self.field = batch['field']
+        self.id = batch.get('id')
+        self.limit = batch.get('limit')
+        self.window = window  # ms
+        self.cost = cost  # throttled with this cost, None without the rate limit
+        self.pending = {}  # the message without the field and the id -> [(message, future)]
+        self.timer = None
+        self.batches = {}  # id of a merged message -> the ids of the messages in it
+        self.sent = 0  # merged messages
+
+    def accepts(self, message):
+        return isinstance(message, dict) and isinstance(message.get(self.field), list)
+
+    def add(self, message):
+        # resolves to whether it was sent, the client handles the error otherwise
+        key = json.dumps(dict((k, v) for k, v in message.items() if k != self.field and k != self.id), sort_keys=True, default=str)
+        future = Future()
+        self.pending.setdefault(key, []).append((message, future))
+        if self.timer is None:
+            self.timer = get_running_loop().call_later(self.window / 1000, self.flush)
+        return future
+
+    def flush(self):
+        self.timer = None
+        pending = self.pending
+        self.pending = {}
+        for entries in pending.values():
+            chunk = []
+            size = 0
+            for entry in entries:
+                count = len(entry[0][self.field])
+                if chunk and self.limit is not None and size + count > self.limit:
+                    ensure_future(self.send(chunk))
+                    chunk = []
+                    size = 0
+                chunk.append(entry)
+                size += count
+            ensure_future(self.send(chunk))
+
+    def merge(self, chunk):
+        first = chunk[0][0]
+        if len(chunk) == 1:
+            return first
+        merged = dict(first)
+        merged[self.field] = [item for message, future in chunk for item in message[self.field]]
+        if self.id is not None and self.id in first:
+            if len(self.batches) >= 1000:
+                # not every acknowledgement is looked up
+                del self.batches[next(iter(self.batches))]
+            self.batches[str(first[self.id])] = [str(message.get(self.id)) for message, future in chunk]
+        return merged
+
+    async def send(self, chunk):
+        message = self.merge(chunk)
+        sent = False
+        try:
+            if self.cost is not None:
+                await self.client.throttle(self.cost)
+            await self.client.send(message)
+            self.sent += 1
+            sent = True
+        except Exception as e:
+            self.client.on_error(e)
+        for message, future in chunk:
+            future.resolve(sent)
+
+    def ids(self, id):
+        ids = self.batches.pop(str(id), None)
+        return [id] if ids is None else ids
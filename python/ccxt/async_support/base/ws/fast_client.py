@@ -3,12 +3,23 @@
 import asyncio
 import socket
 import collections
+from aiohttp import WSMsgType
 from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient
 from ccxt.base.errors import NetworkError
 
 
 class FastClient(AiohttpClient):
     transport = None
+    # frames waiting to be handled, None for no limit, past it the oldest frame that has
+    # a conflation key is dropped, or the socket stops being read while there is none
+    maxQueueSize = None
+    conflate = None  # with maxQueueSize, a frame replaces a waiting frame with the same key, see Exchange.conflation_key
+    dropped = 0  # frames with a conflation key dropped at maxQueueSize
+    tombstones = 0  # dropped entries that are still in the stack, they are skipped when they come up
+    paused = False  # reading is paused until the queue is below maxQueueSize again
+    coalesced = 0  # frames that replaced a waiting frame
+    queue_lag = 0  # ms the last frame waited to be handled, with maxQueueSize
+    max_queue_lag = 0
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         super(FastClient, self).__init__(url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config)
@@ -16,13 +27,51 @@ class FastClient(AiohttpClient):
         # https://github.com/aio-libs/aiohttp/blob/1d296d549050aa335ef542421b8b7dad788246d5/aiohttp/streams.py#L534
         self.stack = collections.deque()
         self.callback_scheduled = False
+        self.waiting = {}  # conflation key -> its entry in the stack
+
+    def queue_stats(self):
+        return {
+            'queued': len(self.stack) - self.tombstones,
+            'dropped': self.dropped,
+            'paused': self.paused,
+            'coalesced': self.coalesced,
+            'lag': self.queue_lag,
+            'maxLag': self.max_queue_lag,
+        }
 
     def receive_loop(self):
+        def pop_entry():
+            # with maxQueueSize the stack holds [time, message, conflation key] entries
+            # the message of a dropped entry is None, the last entry is never a dropped one
+            time, message, key = self.stack.popleft()
+            while message is None:
+                self.tombstones -= 1
+                time, message, key = self.stack.popleft()
+            if key is not None:
+                del self.waiting[key]
+            if self.paused and len(self.stack) - self.tombstones < self.maxQueueSize:
+                self.paused = False
+                self.transport.resume_reading()
+            lag = (self.asyncio_loop.time() - time) * 1000
+            self.queue_lag = lag
+            if lag > self.max_queue_lag:
+                self.max_queue_lag = lag
+            if self.latencies is not None:
+                self.latencies.queued = lag
+            return message
+
+        # the frames are only timed with maxQueueSize or the latency option
+        timed = self.maxQueueSize is not None or self.latencies is not None
+        # and only conflated with maxQueueSize
+        conflate = self.conflate if self.maxQueueSize is not None else None
+        pop = pop_entry if timed else self.stack.popleft
+        compressed = self.gunzip or self.inflate
+
         def handler():
             if not self.stack:
                 self.callback_scheduled = False
                 return
-            message = self.stack.popleft()
+            message = pop()
             try:
                 self.handle_message(message)
             except Exception as error:
@@ -35,7 +84,39 @@ class FastClient(AiohttpClient):
                 self.asyncio_loop.call_soon(handler)
             self.stack.append(message)
 
+        def feed_bounded(message, size):
+            if not self.callback_scheduled:
+                self.callback_scheduled = True
+                self.asyncio_loop.call_soon(handler)
+            key = None
+            if conflate is not None and (message.type == WSMsgType.TEXT or (message.type == WSMsgType.BINARY and not compressed)):
+                key = conflate(self, message.data)
+                if key is not None:
+                    entry = self.waiting.get(key)
+                    if entry is not None:
+                        entry[1] = message
+                        self.coalesced += 1
+                        return
+            if self.maxQueueSize is not None and len(self.stack) - self.tombstones >= self.maxQueueSize:
+                if self.waiting:
+                    # only the latest message of a conflation key matters, the others are all handled
+                    # the entry stays in the stack and is skipped by pop_entry
+                    oldest = next(iter(self.waiting))
+                    self.waiting.pop(oldest)[1] = None
+                    self.tombstones += 1
+                    self.dropped += 1
+                elif not self.paused and self.transport is not None:
+                    self.paused = True
+                    self.transport.pause_reading()
+            entry = [self.asyncio_loop.time(), message, key]
+            if key is not None:
+                self.waiting[key] = entry
+            self.stack.append(entry)
+
         def feed_eof():
+            if self.connection is not ws:
+                # the connection was dropped to reconnect
+                return
             if self.connection._close_code == 1000:  # OK close
                 self.on_close(1000)
             else:
@@ -44,7 +125,7 @@ class FastClient(AiohttpClient):
         def wrapper(func):
             def parse_frame(buf):
                 while self.stack:
-                    self.handle_message(self.stack.popleft())
+                    self.handle_message(pop())
                 return func(buf)
             return parse_frame
 
@@ -52,7 +133,7 @@ class FastClient(AiohttpClient):
             # this is needed because our other wrappers break the closing process
             # we also don't wait for a response to the close message to speed it up
             # this code is adapted from aiohttp client_ws.py
-            _self = self.connection
+            _self = ws
             if not _self._closed:
                 _self._cancel_heartbeat()
                 _self._closed = True
@@ -69,7 +150,8 @@ class FastClient(AiohttpClient):
                     _self._exception = exc
             return True
 
-        connection = self.connection._conn
+        ws = self.connection
+        connection = ws._conn
         if connection.closed:
             # connection got terminated after the connection was made and before the receive loop ran
             self.on_close(1006)
@@ -84,14 +166,27 @@ class FastClient(AiohttpClient):
 
         ws_reader = connection.protocol._payload_parser
         ws_reader.parse_frame = wrapper(ws_reader.parse_frame)
-        ws_reader.queue.feed_data = feed_data
+        ws_reader.queue.feed_data = feed_bounded if timed else feed_data
         ws_reader.queue.feed_eof = feed_eof
         self.connection.close = close
         # return a future so super class won't complain
         return asyncio.sleep(0)
 
+    def drop_connection(self):
+        self.stack.clear()
+        self.waiting.clear()
+        self.tombstones = 0
+        self.paused = False
+        if self.transport:
+            self.transport.abort()
+            self.transport = None
+        return super(FastClient, self).drop_connection()
+
     def reset(self, error):
         super(FastClient, self).reset(error)
         self.stack.clear()
+        self.waiting.clear()
+        self.tombstones = 0
+        self.paused = False
         if self.transport:
             self.transport.abort()
@@ -2,8 +2,6 @@
 
 from zlib import decompress, MAX_WBITS
 from base64 import b64decode
-from gzip import GzipFile
-from io import BytesIO
 import time
 import datetime
 
@@ -17,7 +15,14 @@ def inflate64(data):
 
 
 def gunzip(data):
-    return GzipFile('', 'rb', 9, BytesIO(data)).read().decode('utf-8')
+    return gunzip_bytes(data).decode('utf-8')
+
+
+def gunzip_bytes(data):
+    # every message is a gzip stream of its own, so a one-shot decompress is the fastest
+    # a shared zlib.decompressobj can't be reused once its stream ended and copying one
+    # per message is slower than zlib.decompress, GzipFile and BytesIO are avoided
+    return decompress(data, 16 + MAX_WBITS)
 
 
 #  Tmp : added methods below to avoid circular imports between exchange.py and aiohttp.py
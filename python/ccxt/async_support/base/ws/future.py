@@ -26,44 +26,41 @@ class Future(asyncio.Future):
 
     @classmethod
     def race(cls, futures):
+        # resolves with the first of the futures that is resolved and rejects with the
+        # first error, a callback on each future and no task, the callbacks are removed
+        # from the other futures once it is done
         future = Future()
-        for f in futures:
-            f.is_race_future = True
-        coro = asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
-        task = asyncio.create_task(coro)
-
-        def callback(done):
-            try:
-                complete, pending = done.result()
-                # check for exceptions
-                for i, f in enumerate(complete):
-                    try:
-                        f.result()
-                    except ExchangeClosedByUser as e:
-                        if len(pending) == 0 and i == len(complete) - 1:
-                            future.reject(e)
-                        # wait for all the sub promises to be reject before rejecting future
-                        continue
-                    except asyncio.CancelledError as e:
-                        continue
-                    except Exception as e:
-                        future.reject(e)
-                        return
-                # no exceptions return first result
-                futures_list = list(complete)
+        remaining = len(futures)
 
-                are_all_canceled = all([f.cancelled() for f in futures_list])
-                if are_all_canceled:
-                    future.reject(ExchangeClosedByUser('Connection closed by the user'))
-                    return
+        def remove_callbacks(_=None):
+            for f in futures:
+                f.remove_done_callback(callback)
 
-                first = futures_list[0]
+        def callback(f):
+            nonlocal remaining
+            remaining -= 1
+            if future.done():
+                return
+            if f.cancelled():
+                # a cancelled future rejects the race right away
+                future.reject(ExchangeClosedByUser('Connection closed by the user'))
+                remove_callbacks()
+                return
+            error = f.exception()
+            if error is None:
+                future.resolve(f.result())
+            elif isinstance(error, ExchangeClosedByUser):
+                # wait for all the sub promises to be rejected before rejecting future
+                if remaining == 0:
+                    future.reject(error)
+                return
+            else:
+                future.reject(error)
+            remove_callbacks()
 
-                first_result = first.result()
-                future.resolve(first_result)
-            except asyncio.CancelledError as e:
-                future.reject(e)
-            except Exception as e:
-                future.reject(e)
-        task.add_done_callback(callback)
+        for f in futures:
+            f.is_race_future = True
+            f.add_done_callback(callback)
+        # a cancelled race leaves the futures as they are
+        future.add_done_callback(lambda _: future.cancelled() and remove_callbacks())
         return future
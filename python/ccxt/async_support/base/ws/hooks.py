@@ -0,0 +1,57 @@
+"""Python-only hooks that look at the websocket messages of an exchange before they are decoded
+
+The exchange classes are generated from the TypeScript sources, which have no such
+hooks, so they are kept here by exchange id instead. An exchange gets the hooks of
+its own id or of the first class it derives from that has some, binanceusdm gets the
+ones of binance. A classify_message or conflation_key defined on the class wins."""
+
+import functools
+
+classifiers = {}  # exchange id -> classify_message(exchange, client, message), see Exchange.classify_message
+conflation_keys = {}  # exchange id -> conflation_key(exchange, client, message), see Exchange.conflation_key
+
+
+def lookup(exchange, hooks):
+    # the hook bound to the exchange, None if there is none for it
+    for cls in type(exchange).__mro__:
+        hook = hooks.get(cls.__name__)
+        if hook is not None:
+            return functools.partial(hook, exchange)
+    return None
+
+
+# binance --------------------------------------------------------------------
+
+
+def binance_classify_message(exchange, client, message):
+    # ticker events are handed to handle_tickers directly and the ones of a
+    # stream that was unsubscribed are dropped before they are decoded
+    event = exchange.peek_json_string(message, 'e', 64)
+    if event is None or event == 'bookTicker':
+        return None
+    channelName = exchange.safe_string(exchange.options['tickerChannelsMap'], event)
+    if channelName is None:
+        return None
+    if ('!' + channelName + '@arr') in client.subscriptions:
+        return exchange.handle_tickers
+    marketId = exchange.peek_json_string(message, 's', 128)
+    if marketId is not None and not ((marketId.lower() + '@' + channelName) in client.subscriptions):
+        return False
+    return exchange.handle_tickers
+
+
+def binance_conflation_key(exchange, client, message):
+    # only the latest ticker of a symbol is handled when they queue up
+    if message[:5] in ('{"u":', b'{"u":'):
+        # spot book tickers have no event type
+        return 'bookTicker:' + str(exchange.peek_json_string(message, 's', 64))
+    event = exchange.peek_json_string(message, 'e', 64)
+    if event is None or not (event in exchange.options['tickerChannelsMap']):
+        return None
+    if message[:1] in ('[', b'['):
+        return event + '@arr'
+    return event + ':' + str(exchange.peek_json_string(message, 's', 128))
+
+
+classifiers['binance'] = binance_classify_message
+conflation_keys['binance'] = binance_conflation_key
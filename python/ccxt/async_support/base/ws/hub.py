@@ -0,0 +1,234 @@
+"""One set of public websocket connections for the instances of an exchange
+
+With options['ws']['hub'] set to True or a name, the public watch methods of an
+instance go to a hub shared by all the instances of the same exchange id and hub
+name on the event loop. The hub keeps one more instance of the exchange without
+credentials that has the connections, the order books and the caches, so every
+symbol is subscribed and parsed once whatever the number of instances, and the
+watch methods return the same objects to all of them. The private methods stay on
+each instance. An unwatch only unsubscribes once no other instance watches it,
+and the hub closes with the last instance.
+
+The hub instance connects with the proxies, timeout, rate limit, user agent and
+headers of the instances, the instances that set them differently get different
+hubs. The order books are subscribed without a limit, an instance that watches
+one with a limit gets a copy of the shared book with that many levels, of the
+same class as without the hub, see OrderBook.limited, and watch_order_book_deltas
+gets the changes of the shared book whatever the limit."""
+
+import json
+import asyncio
+import inspect
+import weakref
+
+PUBLIC_METHODS = [
+    'watch_ticker',
+    'watch_tickers',
+    'watch_bids_asks',
+    'watch_trades',
+    'watch_trades_for_symbols',
+    'watch_order_book',
+    'watch_order_book_for_symbols',
+    'watch_order_book_deltas',
+    'watch_ohlcv',
+    'watch_ohlcv_for_symbols',
+    'watch_liquidations',
+    'watch_liquidations_for_symbols',
+    'watch_funding_rate',
+    'watch_funding_rates',
+    'watch_mark_price',
+    'watch_mark_prices',
+    'un_watch_ticker',
+    'un_watch_tickers',
+    'un_watch_bids_asks',
+    'un_watch_trades',
+    'un_watch_trades_for_symbols',
+    'un_watch_order_book',
+    'un_watch_order_book_for_symbols',
+    'un_watch_ohlcv',
+    'un_watch_ohlcv_for_symbols',
+]
+
+# the arguments that tell the subscriptions of a watch method apart, an order book
+# is subscribed once per symbol whatever the limit, and unwatched without one
+IDENTIFYING_ARGS = ['symbol', 'symbols', 'symbolsAndTimeframes', 'timeframe']
+
+# the order books the hub subscribes without a limit
+LIMITED_METHODS = ['watch_order_book', 'watch_order_book_for_symbols', 'watch_order_book_deltas']
+
+# the ones that return the book itself, a copy trimmed to the limit
+COPIED_METHODS = ['watch_order_book', 'watch_order_book_for_symbols']
+
+# the watch methods that use the subscriptions of another one and are unwatched with it
+SUBSCRIBED_AS = {
+    'watch_order_book_deltas': 'watch_order_book',
+}
+
+# the settings of the connections and requests, the hub instance gets the ones of its instances
+TRANSPORT_ATTRIBUTES = [
+    'httpProxy',
+    'http_proxy',
+    'httpsProxy',
+    'https_proxy',
+    'wsProxy',
+    'ws_proxy',
+    'wssProxy',
+    'wss_proxy',
+    'socksProxy',
+    'socks_proxy',
+    'proxyUrl',
+    'proxy_url',
+    'timeout',
+    'rateLimit',
+    'userAgent',
+    'user_agent',
+    'headers',
+    'verify',
+]
+
+hubs = weakref.WeakKeyDictionary()  # event loop -> (exchange id, hub name) -> MarketDataHub
+
+
+def attach(exchange, name):
+    # the public methods of the instance in place of the ones of its class
+    for method in PUBLIC_METHODS:
+        if hasattr(exchange, method):
+            setattr(exchange, method, delegate(exchange, name, method))
+
+
+def delegate(exchange, name, method):
+    async def call(*args, **kwargs):
+        return await market_data_hub(exchange, name).call(exchange, method, args, kwargs)
+    return call
+
+
+def market_data_hub(exchange, name):
+    loop = asyncio.get_running_loop()
+    registry = hubs.get(loop)
+    if registry is None:
+        registry = hubs[loop] = {}
+    key = (exchange.id, name, json.dumps(transport(exchange), sort_keys=True, default=str))
+    hub = registry.get(key)
+    if hub is None:
+        hub = registry[key] = MarketDataHub(exchange, loop)
+    if exchange not in hub.members:
+        hub.members.append(exchange)
+        exchange.ws_hub = hub
+    return hub
+
+
+def transport(exchange):
+    return dict((attribute, getattr(exchange, attribute, None)) for attribute in TRANSPORT_ATTRIBUTES)
+
+
+class MarketDataHub(object):
+
+    def __init__(self, exchange, loop):
+        self.exchange = type(exchange)(self.public_config(exchange, loop))
+        self.loop = loop
+        self.members = []  # the instances attached to the hub
+        self.watching = {}  # (watch method, identifying args) -> the instances that watch it
+        self.arguments = {}  # (watch method, identifying args) -> the identifying args, to unwatch it
+
+    @staticmethod
+    def public_config(exchange, loop):
+        ws_options = exchange.safe_value(exchange.options, 'ws', {})
+        config = exchange.extend(transport(exchange), {
+            'options': exchange.extend(exchange.options, {'ws': exchange.omit(ws_options, 'hub')}),
+            'urls': exchange.urls,
+            'enableRateLimit': exchange.enableRateLimit,
+            'newUpdates': exchange.newUpdates,
+            'verbose': exchange.verbose,
+            'asyncio_loop': loop,
+        })
+        if exchange.markets:
+            config['markets'] = exchange.markets
+        return config
+
+    def bind(self, method, args, kwargs):
+        # the arguments of the call by name with the defaults, None if the call raises for them
+        try:
+            bound = inspect.signature(getattr(self.exchange, method)).bind(*args, **kwargs)
+        except TypeError:
+            return None
+        bound.apply_defaults()
+        return bound
+
+    def identity(self, bound):
+        identity = {}
+        for name in IDENTIFYING_ARGS:
+            if name in bound.arguments:
+                identity[name] = bound.arguments[name]
+        return identity
+
+    def key(self, method, args, kwargs, bound=None):
+        # the same for a watch method and its un_watch method
+        watch_method = method[3:] if method.startswith('un_') else method
+        watch_method = SUBSCRIBED_AS.get(watch_method, watch_method)
+        bound = self.bind(method, args, kwargs) if bound is None else bound
+        if bound is None:
+            # the call raises it
+            return (watch_method, json.dumps([args, kwargs], sort_keys=True, default=str))
+        identity = self.identity(bound)
+        if isinstance(identity.get('symbols'), list):
+            identity['symbols'] = sorted(identity['symbols'])
+        return (watch_method, json.dumps(identity, sort_keys=True, default=str))
+
+    async def call(self, exchange, method, args, kwargs):
+        bound = self.bind(method, args, kwargs)
+        key = self.key(method, args, kwargs, bound)
+        if method.startswith('un_'):
+            watching = self.watching.get(key)
+            if watching is not None:
+                watching.discard(exchange)
+                if watching:
+                    # still watched by another instance
+                    return True
+                del self.watching[key]
+                self.arguments.pop(key, None)
+        else:
+            if key not in self.watching:
+                self.watching[key] = set()
+                if bound is not None:
+                    self.arguments[key] = self.identity(bound)
+            self.watching[key].add(exchange)
+            if bound is not None and method in LIMITED_METHODS:
+                # the shared book isn't trimmed to the limit of one of the instances
+                limit = bound.arguments.get('limit')
+                bound.arguments['limit'] = None
+                result = await getattr(self.exchange, method)(*bound.args, **bound.kwargs)
+                return result if limit is None or method not in COPIED_METHODS else result.limited(limit)
+        return await getattr(self.exchange, method)(*args, **kwargs)
+
+    async def unwatch(self, key):
+        # unsubscribes what no instance watches anymore, if the exchange can
+        arguments = self.arguments.pop(key, None)
+        method = 'un_' + key[0]
+        if arguments is None or not hasattr(self.exchange, method):
+            return
+        parameters = inspect.signature(getattr(self.exchange, method)).parameters
+        try:
+            await getattr(self.exchange, method)(**dict((name, value) for name, value in arguments.items() if name in parameters))
+        except Exception:
+            # the subscription stays until the hub closes
+            pass
+
+    async def detach(self, exchange):
+        if exchange not in self.members:
+            return
+        self.members.remove(exchange)
+        exchange.ws_hub = None
+        unwatched = []
+        for key, watching in list(self.watching.items()):
+            watching.discard(exchange)
+            if not watching:
+                del self.watching[key]
+                unwatched.append(key)
+        if not self.members:
+            registry = hubs.get(self.loop, {})
+            for key in [key for key, hub in registry.items() if hub is self]:
+                del registry[key]
+            await self.exchange.close()
+            return
+        for key in unwatched:
+            await self.unwatch(key)
@@ -0,0 +1,99 @@
+"""One timer for the keepalive pings of all the websocket clients on an event loop
+
+Instead of a ping_loop task per connection, Client.open puts the client into the
+wheel of its loop. The deadlines are rounded to slots of `resolution` ms and the
+wheel wakes up once per slot that has clients in it, whatever the number of clients,
+to call their keepalive(), which sends the ping or detects the missing pong."""
+
+import asyncio
+import weakref
+from heapq import heappush, heappop
+
+wheels = weakref.WeakKeyDictionary()  # event loop -> its KeepaliveWheel
+
+
+def keepalive_wheel(loop=None):
+    loop = loop or asyncio.get_event_loop()
+    wheel = wheels.get(loop)
+    if wheel is None:
+        wheel = wheels[loop] = KeepaliveWheel(loop)
+    return wheel
+
+
+class KeepaliveWheel(object):
+
+    def __init__(self, loop, resolution=100):
+        self.loop = loop
+        self.resolution = resolution  # ms
+        self.slots = {}  # slot -> clients due in it
+        self.due = []  # heap of the slots
+        self.clients = {}  # client -> its slot
+        self.timer = None
+        self.timer_slot = None
+        self.running = False
+        self.wakeups = 0
+
+    def __len__(self):
+        return len(self.clients)
+
+    def add(self, client, delay=None):
+        # client.keepalive() runs again in delay ms, client.keepAlive by default
+        delay = client.keepAlive if delay is None else delay
+        now = self.loop.time() * 1000 / self.resolution
+        # the nearest slot, so that a keepAlive of a few slots doesn't grow by one each time
+        slot = max(int(now + delay / self.resolution + 0.5), int(now) + 1)
+        self.remove(client)
+        self.clients[client] = slot
+        clients = self.slots.get(slot)
+        if clients is None:
+            clients = self.slots[slot] = {}
+            heappush(self.due, slot)
+        clients[client] = True
+        if not self.running:
+            self.arm()
+
+    def remove(self, client):
+        slot = self.clients.pop(client, None)
+        if slot is not None:
+            # an empty slot is skipped when it's due, a slot that was due is already gone
+            self.slots.get(slot, {}).pop(client, None)
+
+    def arm(self):
+        while self.due and not self.slots.get(self.due[0]):
+            self.slots.pop(heappop(self.due), None)
+        if not self.due:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            return
+        slot = self.due[0]
+        if self.timer is not None:
+            if self.timer_slot <= slot:
+                return
+            self.timer.cancel()
+        self.timer_slot = slot
+        self.timer = self.loop.call_at(slot * self.resolution / 1000, self.run)
+
+    def run(self):
+        self.timer = None
+        self.wakeups += 1
+        self.running = True
+        now = self.loop.time() * 1000 / self.resolution
+        try:
+            while self.due and self.due[0] <= now:
+                slot = heappop(self.due)
+                clients = self.slots.pop(slot, {})
+                for client in clients:
+                    if self.clients.get(client) != slot:
+                        # removed or added again by the keepalive of a client before it in the slot
+                        continue
+                    del self.clients[client]
+                    try:
+                        again = client.keepalive()
+                    except Exception:
+                        again = False
+                    if again:
+                        self.add(client)
+        finally:
+            self.running = False
+            self.arm()
@@ -0,0 +1,183 @@
+"""Where the time of a websocket message goes, per client and per message hash
+
+With options['ws']['latency'] the client wraps its own handle_message, decode_json
+and resolve, and times each frame from the moment it was received:
+
+    queue       waiting in the FastClient queue, from the socket to handle_message
+    decompress  gunzip or inflate
+    decode      JSON decoding
+    handler     the handler of the exchange, from the decoded message to resolve()
+    total       from the socket to resolve()
+    exchange    local receive time minus the E, ts or T event time of the message
+
+Each message hash that gets resolved gets a histogram per stage, see
+Exchange.latency_stats. Without the option nothing is wrapped."""
+
+from time import perf_counter, time
+
+# upper bounds of the buckets in ms
+BUCKETS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float('inf')]
+STAGES = ['queue', 'decompress', 'decode', 'handler', 'total', 'exchange']
+EVENT_TIME_KEYS = ['E', 'ts', 'T']
+
+
+class Histogram(object):
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        index = 0
+        while value > BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def percentile(self, fraction):
+        # the upper bound of the bucket, or the max for the last one
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(BUCKETS[index], self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean': self.sum / self.count,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'buckets': dict((str(bound), count) for bound, count in zip(BUCKETS, self.counts) if count),
+        }
+
+
+def event_time(message):
+    # the time the exchange put into the message, in ms
+    for i in range(2):
+        if isinstance(message, list):
+            message = message[0] if message else None
+        if not isinstance(message, dict):
+            return None
+        for key in EVENT_TIME_KEYS:
+            value = message.get(key)
+            if value is not None:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                # us and ns
+                while value > 1e14:
+                    value /= 1000
+                return value if value > 1e12 else None
+        # binance combined streams, okx, htx
+        message = message.get('data', message.get('tick'))
+    return None
+
+
+class LatencyRecorder(object):
+
+    def __init__(self, client):
+        self.client = client
+        self.histograms = {}  # message hash -> stage -> Histogram
+        self.frame = None  # the timings of the frame being handled
+        self.queued = None  # ms the frame waited in the queue, set by FastClient
+        handle_message = client.handle_message
+        handle_text_or_binary_message = getattr(client, 'handle_text_or_binary_message', None)
+        decode_json = client.decode_json
+        resolve = client.resolve
+
+        def timed_handle_message(message):
+            queued = self.queued or 0.0
+            self.queued = None
+            start = perf_counter()
+            self.frame = {
+                'start': start,
+                'received': time() * 1000 - queued,
+                'queue': queued,
+                'decompressed': start,
+                'decoded': start,
+                'decode': 0.0,
+                'message': None,
+            }
+            try:
+                return handle_message(message)
+            finally:
+                self.frame = None
+
+        def timed_handle_text_or_binary_message(data):
+            if self.frame is not None:
+                self.frame['decompressed'] = self.frame['decoded'] = perf_counter()
+            return handle_text_or_binary_message(data)
+
+        def timed_decode_json(data):
+            start = perf_counter()
+            message = decode_json(data)
+            frame = self.frame
+            if frame is not None:
+                frame['decoded'] = perf_counter()
+                frame['decode'] = (frame['decoded'] - start) * 1000
+                frame['message'] = message
+            return message
+
+        def timed_resolve(result, message_hash):
+            if self.frame is not None:
+                self.record(message_hash, perf_counter())
+            return resolve(result, message_hash)
+
+        client.handle_message = timed_handle_message
+        if handle_text_or_binary_message is not None:
+            client.handle_text_or_binary_message = timed_handle_text_or_binary_message
+        client.decode_json = timed_decode_json
+        client.resolve = timed_resolve
+
+    def record(self, message_hash, now):
+        frame = self.frame
+        histograms = self.histograms.get(message_hash)
+        if histograms is None:
+            histograms = self.histograms[message_hash] = dict((stage, Histogram()) for stage in STAGES)
+        histograms['queue'].add(frame['queue'])
+        histograms['decompress'].add((frame['decompressed'] - frame['start']) * 1000)
+        histograms['decode'].add(frame['decode'])
+        histograms['handler'].add((now - frame['decoded']) * 1000)
+        histograms['total'].add(frame['queue'] + (now - frame['start']) * 1000)
+        timestamp = event_time(frame['message'])
+        if timestamp is not None:
+            histograms['exchange'].add(max(frame['received'] - timestamp, 0.0))
+
+    def stats(self, message_hash=None):
+        hashes = list(self.histograms) if message_hash is None else [message_hash]
+        result = {}
+        for hash in hashes:
+            histograms = self.histograms.get(hash)
+            if histograms is not None:
+                result[hash] = dict((stage, histograms[stage].summary()) for stage in STAGES)
+        return result
+
+    def reset(self):
+        self.histograms = {}
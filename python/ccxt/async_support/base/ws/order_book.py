@@ -33,14 +33,10 @@ class OrderBook(dict):
         return self
 
     def reset(self, snapshot={}):
-        self['asks']._index.clear()
         self['asks'].clear()
-        for ask in snapshot.get('asks', []):
-            self['asks'].storeArray(ask)
-        self['bids']._index.clear()
+        self['asks'].storeMany(snapshot.get('asks', []))
         self['bids'].clear()
-        for bid in snapshot.get('bids', []):
-            self['bids'].storeArray(bid)
+        self['bids'].storeMany(snapshot.get('bids', []))
         self['nonce'] = snapshot.get('nonce')
         self['timestamp'] = snapshot.get('timestamp')
         self['datetime'] = Exchange.iso8601(self['timestamp'])
@@ -52,6 +48,67 @@ class OrderBook(dict):
             return self
         self.reset(snapshot)
 
+    def get_changes(self, consumer=None):
+        return self.getChanges(consumer)
+
+    def getChanges(self, consumer=None):
+        # an order book structure with the levels stored since the last call of the consumer
+        # 'snapshot' is True when it holds the whole book instead, on the first call
+        # and after a reset, the caller should replace its copy of the book then
+        asks = self['asks'].getChanges(consumer)
+        bids = self['bids'].getChanges(consumer)
+        snapshot = asks is None or bids is None
+        return {
+            'asks': list(self['asks']) if snapshot else asks,
+            'bids': list(self['bids']) if snapshot else bids,
+            'timestamp': self['timestamp'],
+            'datetime': self['datetime'],
+            'nonce': self['nonce'],
+            'symbol': self['symbol'],
+            'snapshot': snapshot,
+        }
+
+    def set_tick(self, tick):
+        self['asks'].set_tick(tick)
+        self['bids'].set_tick(tick)
+        return self
+
+    def snapshot(self, limit=None):
+        # a consistent read-only copy of the book with the first limit levels of each side
+        # the sides are tuples of level tuples, it costs O(limit) and later updates don't change it
+        snapshot = dict(self)
+        snapshot['asks'] = self['asks'].snapshot(limit)
+        snapshot['bids'] = self['bids'].snapshot(limit)
+        return OrderBookSnapshot(snapshot)
+
+    def limited(self, limit=None):
+        # a new book of the same class with the first limit levels of each side
+        # for a book that is shared, later updates of this one don't change it
+        copy = dict(self)
+        copy['asks'] = self['asks'][:limit]
+        copy['bids'] = self['bids'][:limit]
+        return type(self)(copy, limit)
+
+    def best_bid(self):
+        return self['bids'].best()
+
+    def best_ask(self):
+        return self['asks'].best()
+
+    def mid(self):
+        bid = self['bids'].best()
+        ask = self['asks'].best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        bid = self['bids'].best()
+        ask = self['asks'].best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
 # -----------------------------------------------------------------------------
 # overwrites absolute volumes at price levels
 # or deletes price levels based on order counts (3rd value in a bidask delta)
@@ -70,9 +127,111 @@ class CountedOrderBook(OrderBook):
 
 
 class IndexedOrderBook(OrderBook):
+    _aggregated = None
+
     def __init__(self, snapshot={}, depth=None):
         copy = Exchange.extend(snapshot, {
             'asks': order_book_side.IndexedAsks(snapshot.get('asks', []), depth),
             'bids': order_book_side.IndexedBids(snapshot.get('bids', []), depth),
         })
         super(IndexedOrderBook, self).__init__(copy, depth)
+
+    def aggregated(self):
+        # the book aggregated by price, updated with every order once it was called
+        if self._aggregated is None:
+            self._aggregated = OrderBook({
+                'asks': self['asks'].aggregated(),
+                'bids': self['bids'].aggregated(),
+            })
+        aggregated = self._aggregated
+        aggregated['timestamp'] = self['timestamp']
+        aggregated['datetime'] = self['datetime']
+        aggregated['nonce'] = self['nonce']
+        aggregated['symbol'] = self['symbol']
+        return aggregated
+
+# -----------------------------------------------------------------------------
+# same books on top of chunked sides, for deep books with many levels
+
+
+class ChunkedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.ChunkedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.ChunkedBids(snapshot.get('bids', []), depth),
+        })
+        super(ChunkedOrderBook, self).__init__(copy, depth)
+
+
+class ChunkedCountedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.ChunkedCountedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.ChunkedCountedBids(snapshot.get('bids', []), depth),
+        })
+        super(ChunkedCountedOrderBook, self).__init__(copy, depth)
+
+
+class ChunkedIndexedOrderBook(OrderBook):
+    _aggregated = None
+    aggregated = IndexedOrderBook.aggregated
+
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.ChunkedIndexedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.ChunkedIndexedBids(snapshot.get('bids', []), depth),
+        })
+        super(ChunkedIndexedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# keeps at most depth levels per side plus a few spare levels
+
+
+class BoundedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None, spill=0):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.BoundedAsks(snapshot.get('asks', []), depth, spill),
+            'bids': order_book_side.BoundedBids(snapshot.get('bids', []), depth, spill),
+        })
+        super(BoundedOrderBook, self).__init__(copy, depth)
+
+
+class BoundedCountedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None, spill=0):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.BoundedCountedAsks(snapshot.get('asks', []), depth, spill),
+            'bids': order_book_side.BoundedCountedBids(snapshot.get('bids', []), depth, spill),
+        })
+        super(BoundedCountedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# the order books of an exchange by symbol
+# calls on_store(symbol, orderbook) before a book is stored
+
+
+class OrderBooks(dict):
+    def __init__(self, books={}, on_store=None):
+        super(OrderBooks, self).__init__(books)
+        self.on_store = on_store
+
+    def __setitem__(self, symbol, orderbook):
+        if self.on_store is not None:
+            self.on_store(symbol, orderbook)
+        super(OrderBooks, self).__setitem__(symbol, orderbook)
+
+# -----------------------------------------------------------------------------
+# returned by OrderBook.snapshot(), a dict that can't be changed
+
+
+class OrderBookSnapshot(dict):
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('OrderBookSnapshot is read-only')
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+    __ior__ = _read_only
@@ -2,6 +2,10 @@
 
 import sys
 import bisect
+import copyreg
+import weakref
+import itertools
+from ccxt.base.errors import InvalidNonce
 
 """Author: Carlo Revelli"""
 """Fast bisect bindings"""
@@ -9,8 +13,42 @@ import bisect
 """Performs a binary search when inserting keys in sorted order"""
 
 
+class _Last:
+    # sorts after any order id, (price, _last) follows every order at that price
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_last = _Last()
+
+
+class _Consumer:
+    # reads the changes of getChanges() called without a consumer
+    pass
+
+
+_default_consumer = _Consumer()
+
+
+# levels are never changed in place, an update replaces the level with the delta
+
+
 class OrderBookSide(list):
     side = None  # set to True for bids and False for asks
+    _merge_ratio = 8  # batches longer than 1/8 of the side are merged in one sweep
+    _strings = None  # strings received from the exchange, by index price
+    _top_strings = None  # flattened strings of the top levels, None when outdated
+    _top_length = 0
+    _amounts = None  # running total of the amounts of the levels, by position
+    _costs = None  # running total of price * amount, by position
+    _stale = 0  # the running totals are outdated from this position on
+    _tick = None  # the price step when the side is keyed by integer ticks
+    _ticks = None  # ticks per unit of price, 1 / _tick
+    _changes = None  # levels stored since the last getChanges(), None until it is called
+    _consumers = None  # consumer -> changes it has not read yet, None when it has to read the whole side
 
     def __init__(self, deltas=[], depth=None):
         super(OrderBookSide, self).__init__()
@@ -18,8 +56,7 @@ class OrderBookSide(list):
         self._n = sys.maxsize
         # parallel to self
         self._index = []
-        for delta in deltas:
-            self.storeArray(list(delta))
+        self.storeMany([list(delta) for delta in deltas])
 
     def store_array(self, delta):
         return self.storeArray(delta)
@@ -27,11 +64,17 @@ class OrderBookSide(list):
     def storeArray(self, delta):
         price = delta[0]
         size = delta[1]
+        if self._ticks is not None:
+            price = round(price * self._ticks)
         index_price = -price if self.side else price
         index = bisect.bisect_left(self._index, index_price)
+        if index < self._stale:
+            self._stale = index
+        if self._changes is not None:
+            self._changes[index_price] = delta
         if size:
             if index < len(self._index) and self._index[index] == index_price:
-                self[index][1] = size
+                self[index] = delta
             else:
                 self._index.insert(index, index_price)
                 self.insert(index, delta)
@@ -42,14 +85,289 @@ class OrderBookSide(list):
     def store(self, price, size):
         self.storeArray([price, size])
 
+    def store_many(self, deltas):
+        return self.storeMany(deltas)
+
+    def storeMany(self, deltas):
+        # batches that are small compared to the book are stored level by level
+        # larger ones (snapshots, bursts) are merged with the book in one sweep
+        if len(deltas) * self._merge_ratio < len(self._index):
+            self._store_each(deltas)
+        else:
+            self._merge(deltas)
+
+    def _store_each(self, deltas):
+        # same as storeArray, inlined to skip the per-level method call and lookups
+        index = self._index
+        set_level = super(OrderBookSide, self).__setitem__
+        bisect_left = bisect.bisect_left
+        side = self.side
+        stale = self._stale
+        ticks = self._ticks
+        changes = self._changes
+        for delta in deltas:
+            price = delta[0]
+            size = delta[1]
+            if ticks is not None:
+                price = round(price * ticks)
+            index_price = -price if side else price
+            i = bisect_left(index, index_price)
+            if i < stale:
+                stale = i
+            if changes is not None:
+                changes[index_price] = delta
+            if i < len(index) and index[i] == index_price:
+                if size:
+                    set_level(i, delta)
+                else:
+                    del index[i]
+                    del self[i]
+            elif size:
+                index.insert(i, index_price)
+                self.insert(i, delta)
+        self._stale = stale
+
+    def _merge(self, deltas):
+        # the last delta wins if a batch touches the same price more than once
+        updates = {}
+        key = self._index_price
+        for delta in deltas:
+            updates[key(delta[0])] = delta
+        if self._changes is not None:
+            for index_price, delta in updates.items():
+                self._changes[index_price] = delta if self._keeps_level(delta) else self._removal(delta)
+        # copy the untouched runs between two updates with C-level slices
+        levels = super(OrderBookSide, self).__getitem__
+        index = self._index
+        length = len(index)
+        new_index = []
+        new_levels = []
+        start = 0
+        for index_price in sorted(updates):
+            delta = updates[index_price]
+            end = bisect.bisect_left(index, index_price, start)
+            if end < self._stale:
+                self._stale = end
+            if end > start:
+                new_index.extend(index[start:end])
+                new_levels.extend(levels(slice(start, end)))
+            if end < length and index[end] == index_price:
+                start = end + 1
+            else:
+                start = end
+            if self._keeps_level(delta):
+                new_index.append(index_price)
+                new_levels.append(delta)
+        new_index.extend(index[start:])
+        new_levels.extend(levels(slice(start, length)))
+        self._index = new_index
+        super(OrderBookSide, self).__setitem__(slice(None), new_levels)
+
+    def _keeps_level(self, delta):
+        return delta[1]
+
+    def store_string_array(self, delta, strings):
+        return self.storeStringArray(delta, strings)
+
+    def storeStringArray(self, delta, strings):
+        # same as storeArray but also keeps a list of strings for the level
+        # usually the price and amount exactly as the exchange sent them
+        # so that checksums don't have to format floats back into strings
+        # this works for price level sides only, not for the indexed ones
+        index_price = self._index_price(delta[0])
+        if self._strings is None:
+            self._strings = {}
+        if self._top_strings is not None and self._is_top(index_price, self._top_length):
+            self._top_strings = None
+        self.storeArray(delta)
+        if self._keeps_level(delta):
+            self._strings[index_price] = strings
+        else:
+            self._strings.pop(index_price, None)
+
+    def top_strings(self, n):
+        return self.topStrings(n)
+
+    def topStrings(self, n):
+        # the strings of the first n levels flattened into one list
+        # rebuilt only after one of those levels was changed
+        if self._top_strings is None or self._top_length != n:
+            strings = self._strings or {}
+            top = []
+            for level in self[:n]:
+                top.extend(strings[self._index_price(level[0])])
+            self._top_strings = top
+            self._top_length = n
+        return self._top_strings
+
+    def _is_top(self, index_price, n):
+        # True if a level with this price is or would be one of the first n levels
+        length = len(self)
+        if length < n:
+            return True
+        return index_price <= self._index_price(self[n - 1][0])
+
+    def snapshot(self, limit=None):
+        # a read-only copy of the first limit levels, each level is copied as a tuple
+        levels = self if limit is None else self[:limit]
+        return tuple(tuple(level) for level in levels)
+
+    def _index_price(self, price):
+        # the sort key of a price, the same as the inlined one in storeArray
+        if self._ticks is not None:
+            price = round(price * self._ticks)
+        return -price if self.side else price
+
+    def set_tick(self, tick):
+        # keys the side by integer multiples of tick instead of float prices
+        # ints bisect faster and a level always matches the price it was stored with
+        # the levels keep the prices as received, so users still see floats
+        if tick == self._tick:
+            return
+        levels = self._levels()
+        strings = self._strings
+        if strings:
+            strings = [strings.get(self._index_price(level[0])) for level in levels]
+        self.clear()
+        self._tick = tick
+        self._ticks = None if tick is None else 1 / tick
+        self.storeMany(levels)
+        if strings:
+            self._strings = {}
+            for level, level_strings in zip(levels, strings):
+                if level_strings is not None:
+                    self._strings[self._index_price(level[0])] = level_strings
+
+    def _levels(self):
+        return list(self)
+
+    def get_changes(self, consumer=None):
+        return self.getChanges(consumer)
+
+    def getChanges(self, consumer=None):
+        # the levels stored since the last call of the same consumer, the last one stored wins for every price
+        # removed levels have an amount of 0, returns None on the first call of a consumer
+        # and after the side was cleared, the whole side has to be read then
+        # a consumer is any object that can be weakly referenced, every consumer gets all of the changes
+        consumers = self._consumers
+        if consumers is None:
+            consumers = self._consumers = weakref.WeakKeyDictionary()
+        if consumer is None:
+            consumer = _default_consumer
+        changes = self._changes
+        self._changes = {}
+        pending = consumers.get(consumer)
+        if changes:
+            if pending is not None and not pending and len(consumers) == 1:
+                # the only consumer, nothing to copy
+                return list(changes.values())
+            for others in consumers.values():
+                if others is not None:
+                    others.update(changes)
+        consumers[consumer] = {}
+        return None if pending is None else list(pending.values())
+
+    def __getstate__(self):
+        # the consumers are weak references, a copy has none
+        state = self.__dict__.copy()
+        state.pop('_consumers', None)
+        return state
+
+    def _reset_changes(self):
+        # after a clear every consumer has to read the whole side again
+        self._changes = None
+        if self._consumers:
+            for consumer in list(self._consumers.keys()):
+                self._consumers[consumer] = None
+
+    def _level_key(self, level):
+        # the key of a level in self._changes
+        return self._index_price(level[0])
+
+    def _removal(self, level):
+        return [level[0], 0] + level[2:]
+
+    def best(self):
+        # the first level or None if the side is empty
+        return self[0] if len(self) else None
+
+    def cumulative_amount(self, price):
+        # the total amount of the levels priced at or better than price
+        stop = self._aggregate(self._position(self._index_price(price)))
+        return self._amounts[stop - 1] if stop else 0
+
+    def cost_to_fill(self, amount):
+        # the cost of taking amount from the top of the side
+        # or None if the side doesn't hold enough liquidity
+        length = len(self)
+        stop = 16
+        while True:
+            stop = self._aggregate(stop)
+            if stop and self._amounts[stop - 1] >= amount:
+                break
+            if stop >= length:
+                return None
+            stop *= 2
+        amounts = self._amounts
+        costs = self._costs
+        i = bisect.bisect_left(amounts, amount, 0, stop)
+        if i == 0:
+            return amount * self[0][0]
+        return costs[i - 1] + (amount - amounts[i - 1]) * self[i][0]
+
+    def average_fill_price(self, amount):
+        cost = self.cost_to_fill(amount)
+        return cost / amount if cost is not None and amount else None
+
+    def _position(self, index_price):
+        # the number of levels priced at or better than index_price
+        return bisect.bisect_right(self._index, index_price)
+
+    def _aggregate(self, stop):
+        # brings the running totals of the first stop levels up to date
+        # starting from the first level that changed since they were computed
+        # returns the number of levels covered, at most the length of the side
+        if self._amounts is None:
+            self._amounts = []
+            self._costs = []
+        amounts = self._amounts
+        costs = self._costs
+        stop = min(stop, len(self))
+        valid = min(self._stale, len(amounts))
+        if valid < stop:
+            del amounts[valid:]
+            del costs[valid:]
+            amount = amounts[-1] if valid else 0
+            cost = costs[-1] if valid else 0
+            for level in self[valid:stop]:
+                amount += level[1]
+                cost += level[0] * level[1]
+                amounts.append(amount)
+                costs.append(cost)
+            self._stale = stop
+        return stop
+
     def limit(self):
         difference = len(self) - self._depth
         for _ in range(difference):
-            self.remove_index(self.pop())
+            level = self.pop()
+            self.remove_index(level)
             self._index.pop()
+            if self._changes is not None:
+                self._changes[self._level_key(level)] = self._removal(level)
 
     def remove_index(self, order):
-        pass
+        if self._strings:
+            self._strings.pop(self._index_price(order[0]), None)
+            self._top_strings = None
+
+    def clear(self):
+        super(OrderBookSide, self).clear()
+        self._index.clear()
+        self._strings = None
+        self._top_strings = None
+        self._stale = 0
+        self._reset_changes()
 
     def __len__(self):
         length = super(OrderBookSide, self).__len__()
@@ -57,8 +375,11 @@ class OrderBookSide(list):
 
     def __getitem__(self, item):
         if isinstance(item, slice):
-            start, stop, step = item.indices(len(self))
-            return [self[i] for i in range(start, stop, step)]
+            # slice the underlying list in C instead of copying level by level
+            if item.step is None or item.step > 0:
+                return super(OrderBookSide, self).__getitem__(slice(*item.indices(len(self))))
+            # a negative stop of indices() wraps around, cap to the visible levels first
+            return super(OrderBookSide, self).__getitem__(slice(0, len(self)))[item]
         else:
             return super(OrderBookSide, self).__getitem__(item)
 
@@ -84,12 +405,17 @@ class CountedOrderBookSide(OrderBookSide):
         price = delta[0]
         size = delta[1]
         count = delta[2]
+        if self._ticks is not None:
+            price = round(price * self._ticks)
         index_price = -price if self.side else price
         index = bisect.bisect_left(self._index, index_price)
+        if index < self._stale:
+            self._stale = index
+        if self._changes is not None:
+            self._changes[index_price] = delta if size and count else self._removal(delta)
         if size and count:
             if index < len(self._index) and self._index[index] == index_price:
-                self[index][1] = size
-                self[index][2] = count
+                self[index] = delta
             else:
                 self._index.insert(index, index_price)
                 self.insert(index, delta)
@@ -100,11 +426,49 @@ class CountedOrderBookSide(OrderBookSide):
     def store(self, price, size, count):
         self.storeArray([price, size, count])
 
+    def _store_each(self, deltas):
+        index = self._index
+        set_level = super(CountedOrderBookSide, self).__setitem__
+        bisect_left = bisect.bisect_left
+        side = self.side
+        stale = self._stale
+        ticks = self._ticks
+        changes = self._changes
+        for delta in deltas:
+            price = delta[0]
+            size = delta[1]
+            count = delta[2]
+            if ticks is not None:
+                price = round(price * ticks)
+            index_price = -price if side else price
+            i = bisect_left(index, index_price)
+            if i < stale:
+                stale = i
+            if changes is not None:
+                changes[index_price] = delta if size and count else [delta[0], 0, 0]
+            if i < len(index) and index[i] == index_price:
+                if size and count:
+                    set_level(i, delta)
+                else:
+                    del index[i]
+                    del self[i]
+            elif size and count:
+                index.insert(i, index_price)
+                self.insert(i, delta)
+        self._stale = stale
+
+    def _keeps_level(self, delta):
+        return delta[1] and delta[2]
+
 # -----------------------------------------------------------------------------
 # indexed by order ids (3rd value in a bidask delta)
+# the index is keyed by (price, order id) so that an order is found
+# by bisection instead of walking all the orders at its price level
 
 
 class IndexedOrderBookSide(OrderBookSide):
+    _l2 = None  # the orders aggregated by price, see aggregated()
+
     def __init__(self, deltas=[], depth=None):
         self._hashmap = {}
         super(IndexedOrderBookSide, self).__init__(deltas, depth)
@@ -112,6 +476,8 @@ class IndexedOrderBookSide(OrderBookSide):
     def storeArray(self, delta):
         price = delta[0]
         if price is not None:
+            if self._ticks is not None:
+                price = round(price * self._ticks)
             index_price = -price if self.side else price
         else:
             index_price = None
@@ -121,48 +487,620 @@ class IndexedOrderBookSide(OrderBookSide):
             if order_id in self._hashmap:
                 old_price = self._hashmap[order_id]
                 index_price = index_price or old_price
-                # in case the price is not defined
-                delta[0] = abs(index_price)
+                index = bisect.bisect_left(self._index, (old_price, order_id))
+                if index < self._stale:
+                    self._stale = index
                 # matches if price is not defined or if price matches
                 if index_price == old_price:
-                    # just overwrite the old index
-                    index = bisect.bisect_left(self._index, index_price)
-                    while self[index][2] != order_id:
-                        index += 1
-                    self._index[index] = index_price
+                    # in case the price is not defined
+                    delta[0] = self[index][0]
+                    if self._l2 is not None:
+                        self._aggregate_order(delta[0], delta[1] - self[index][1], 0)
+                    # just overwrite the old order
                     self[index] = delta
+                    if self._changes is not None:
+                        self._changes[order_id] = delta
                     return
                 else:
                     # remove old price level
-                    old_index = bisect.bisect_left(self._index, old_price)
-                    while self[old_index][2] != order_id:
-                        old_index += 1
-                    del self._index[old_index]
-                    del self[old_index]
+                    if self._l2 is not None:
+                        self._aggregate_order(self[index][0], -self[index][1], -1)
+                    del self._index[index]
+                    del self[index]
             # insert new price level
             self._hashmap[order_id] = index_price
-            index = bisect.bisect_left(self._index, index_price)
-            while index < len (self._index) and self._index[index] == index_price and self[index][2] < order_id:
-                index += 1
-            self._index.insert(index, index_price)
+            key = (index_price, order_id)
+            index = bisect.bisect_left(self._index, key)
+            if index < self._stale:
+                self._stale = index
+            self._index.insert(index, key)
             self.insert(index, delta)
+            if self._l2 is not None:
+                self._aggregate_order(delta[0], delta[1], 1)
+            if self._changes is not None:
+                self._changes[order_id] = delta
         elif order_id in self._hashmap:
-            old_price = self._hashmap[order_id]
-            index = bisect.bisect_left(self._index, old_price)
-            while self[index][2] != order_id:
-                index += 1
+            old_price = self._hashmap.pop(order_id)
+            index = bisect.bisect_left(self._index, (old_price, order_id))
+            if index < self._stale:
+                self._stale = index
+            if self._changes is not None:
+                self._changes[order_id] = self._removal(self[index])
+            if self._l2 is not None:
+                self._aggregate_order(self[index][0], -self[index][1], -1)
             del self._index[index]
             del self[index]
+
+    def storeMany(self, deltas):
+        for delta in deltas:
+            self.storeArray(delta)
+
+    def clear(self):
+        super(IndexedOrderBookSide, self).clear()
+        self._hashmap.clear()
+        if self._l2 is not None:
+            self._l2.clear()
+            self._l2_totals.clear()
+
+    def aggregated(self):
+        # the orders aggregated by price into a side of price levels
+        # built from all of the orders on the first call only, every order
+        # stored afterwards updates the amount and the count of its price level
+        if self._l2 is None:
+            self._l2 = Bids() if self.side else Asks()
+            self._l2_totals = {}
+            for order in self:
+                self._aggregate_order(order[0], order[1], 1)
+        return self._l2
+
+    def _aggregate_order(self, price, amount, count):
+        # adds amount and count to the price level of an order
+        # the count drops the level exactly when its last order is removed
+        # even if the amounts don't sum up to zero with floats
+        key = self._index_price(price)
+        total, orders = self._l2_totals.get(key, (0, 0))
+        total += amount
+        orders += count
+        if orders:
+            self._l2_totals[key] = (total, orders)
+            self._l2.storeArray([price, total])
+        else:
+            del self._l2_totals[key]
+            self._l2.storeArray([price, 0])
+
+    def _position(self, index_price):
+        return bisect.bisect_right(self._index, (index_price, _last))
+
+    def _level_key(self, level):
+        return level[2]
+
+    def remove_index(self, order):
+        order_id = order[2]
+        if order_id in self._hashmap:
             del self._hashmap[order_id]
+            if self._l2 is not None:
+                self._aggregate_order(order[0], -order[1], -1)
+
+    def store(self, price, size, order_id):
+        self.storeArray([price, size, order_id])
+
+# -----------------------------------------------------------------------------
+# stores the levels in a list of sorted chunks instead of one flat list
+# so inserting or deleting a level moves at most 2 * _load references
+# instead of shifting the entire side, which matters on books with
+# thousands of levels, reading the top of the book stays cheap
+
+
+class ChunkedOrderBookSide(OrderBookSide):
+    _load = 128
+
+    def __init__(self, deltas=[], depth=None):
+        self._chunks = []  # lists of levels
+        self._keys = []  # lists of sort keys, parallel to self._chunks
+        self._maxes = []  # the last key of every chunk
+        self._len = 0
+        super(ChunkedOrderBookSide, self).__init__(deltas, depth)
+
+    def _locate(self, key):
+        # returns the chunk and the position of the first key >= key
+        maxes = self._maxes
+        if not maxes:
+            return 0, 0
+        chunk_index = bisect.bisect_left(maxes, key)
+        if chunk_index == len(maxes):
+            chunk_index -= 1
+            return chunk_index, len(self._keys[chunk_index])
+        return chunk_index, bisect.bisect_left(self._keys[chunk_index], key)
+
+    def _find(self, key):
+        # returns the chunk and the position of key or None if it is not stored
+        chunk_index, position = self._locate(key)
+        if self._maxes:
+            keys = self._keys[chunk_index]
+            if position < len(keys) and keys[position] == key:
+                return chunk_index, position
+        return None
+
+    def _insert(self, chunk_index, position, key, delta):
+        # the position of a level within the side isn't tracked across chunks
+        # so any change outdates all of the running totals
+        self._stale = 0
+        self._len += 1
+        if not self._chunks:
+            self._chunks.append([delta])
+            self._keys.append([key])
+            self._maxes.append(key)
+            return
+        chunk = self._chunks[chunk_index]
+        keys = self._keys[chunk_index]
+        chunk.insert(position, delta)
+        keys.insert(position, key)
+        if position == len(keys) - 1:
+            self._maxes[chunk_index] = key
+        if len(keys) > self._load * 2:
+            self._split(chunk_index)
+
+    def _delete(self, chunk_index, position):
+        self._stale = 0
+        self._len -= 1
+        chunk = self._chunks[chunk_index]
+        keys = self._keys[chunk_index]
+        del chunk[position]
+        del keys[position]
+        if not keys:
+            del self._chunks[chunk_index]
+            del self._keys[chunk_index]
+            del self._maxes[chunk_index]
+            return
+        if position == len(keys):
+            self._maxes[chunk_index] = keys[-1]
+        if len(keys) < (self._load >> 1) and len(self._chunks) > 1:
+            self._merge_chunk(chunk_index)
+
+    def _split(self, chunk_index):
+        chunk = self._chunks[chunk_index]
+        keys = self._keys[chunk_index]
+        self._chunks.insert(chunk_index + 1, chunk[self._load:])
+        self._keys.insert(chunk_index + 1, keys[self._load:])
+        del chunk[self._load:]
+        del keys[self._load:]
+        self._maxes.insert(chunk_index, keys[-1])
+
+    def _merge_chunk(self, chunk_index):
+        # merge a small chunk into its right neighbour or into the left one if it is the last
+        if chunk_index == len(self._chunks) - 1:
+            chunk_index -= 1
+        self._chunks[chunk_index].extend(self._chunks.pop(chunk_index + 1))
+        self._keys[chunk_index].extend(self._keys.pop(chunk_index + 1))
+        del self._maxes[chunk_index]
+        if len(self._keys[chunk_index]) > self._load * 2:
+            self._split(chunk_index)
+
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        if self._ticks is not None:
+            price = round(price * self._ticks)
+        index_price = -price if self.side else price
+        if self._changes is not None:
+            self._changes[index_price] = delta
+        chunk_index, position = self._locate(index_price)
+        found = self._maxes and position < len(self._keys[chunk_index]) and self._keys[chunk_index][position] == index_price
+        if size:
+            if found:
+                self._stale = 0
+                self._chunks[chunk_index][position] = delta
+            else:
+                self._insert(chunk_index, position, index_price, delta)
+        elif found:
+            self._delete(chunk_index, position)
+
+    def storeMany(self, deltas):
+        # chunks are small enough for single inserts to stay cheap
+        for delta in deltas:
+            self.storeArray(delta)
+
+    def limit(self):
+        difference = self._len - self._depth
+        while difference > 0:
+            chunk = self._chunks[-1]
+            if difference >= len(chunk):
+                self._chunks.pop()
+                self._keys.pop()
+                self._maxes.pop()
+                removed = chunk
+            else:
+                removed = chunk[-difference:]
+                del chunk[-difference:]
+                del self._keys[-1][-difference:]
+                self._maxes[-1] = self._keys[-1][-1]
+            self._len -= len(removed)
+            difference -= len(removed)
+            for order in removed:
+                self.remove_index(order)
+                if self._changes is not None:
+                    self._changes[self._level_key(order)] = self._removal(order)
+
+    def clear(self):
+        self._chunks.clear()
+        self._keys.clear()
+        self._maxes.clear()
+        self._len = 0
+        self._strings = None
+        self._top_strings = None
+        self._stale = 0
+        self._reset_changes()
+
+    def _position(self, index_price):
+        return self._rank(index_price)
+
+    def _rank(self, key):
+        # the number of levels with a sort key <= key
+        maxes = self._maxes
+        chunk_index = bisect.bisect_right(maxes, key)
+        if chunk_index == len(maxes):
+            return self._len
+        rank = bisect.bisect_right(self._keys[chunk_index], key)
+        for keys in self._keys[:chunk_index]:
+            rank += len(keys)
+        return rank
+
+    def __len__(self):
+        return min(self._len, self._n)
+
+    # the levels are in self._chunks and the underlying list stays empty, so the list
+    # methods that read it go through the chunks instead and the ones that write it
+    # are refused, levels are only changed with storeArray
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._chunks)
+
+    def __contains__(self, level):
+        return any(stored == level for stored in self)
+
+    def index(self, level, start=0, stop=sys.maxsize):
+        for position, stored in enumerate(itertools.islice(self, start, stop), start):
+            if stored == level:
+                return position
+        raise ValueError(repr(level) + ' is not in list')
+
+    def count(self, level):
+        return sum(1 for stored in self if stored == level)
+
+    def copy(self):
+        return list(self)
+
+    def __add__(self, other):
+        return list(self) + other
+
+    def __radd__(self, other):
+        return other + list(self)
+
+    def __mul__(self, times):
+        return list(self) * times
+
+    __rmul__ = __mul__
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        return list(self) < other
+
+    def __le__(self, other):
+        return list(self) <= other
+
+    def __gt__(self, other):
+        return list(self) > other
+
+    def __ge__(self, other):
+        return list(self) >= other
+
+    def __reduce__(self):
+        # the chunks are pickled with the rest of the state, there are no list items
+        return (copyreg.__newobj__, (type(self),), self.__getstate__())
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(type(self).__name__ + ' levels are only changed with storeArray')
+
+    append = extend = insert = pop = remove = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __reversed__(self):
+        return itertools.chain.from_iterable(reversed(chunk) for chunk in reversed(self._chunks))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return list(itertools.islice(self, start, stop, step)) if step > 0 else list(self)[item]
+            result = []
+            for chunk in self._chunks:
+                if start >= stop:
+                    break
+                length = len(chunk)
+                if start < length:
+                    result.extend(chunk[start:stop])
+                start = max(start - length, 0)
+                stop -= length
+            return result
+        length = len(self)
+        index = item + length if item < 0 else item
+        if index < 0 or index >= length:
+            raise IndexError('list index out of range')
+        for chunk in self._chunks:
+            if index < len(chunk):
+                return chunk[index]
+            index -= len(chunk)
+
+
+class ChunkedCountedOrderBookSide(ChunkedOrderBookSide):
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        count = delta[2]
+        if self._ticks is not None:
+            price = round(price * self._ticks)
+        index_price = -price if self.side else price
+        if self._changes is not None:
+            self._changes[index_price] = delta if size and count else self._removal(delta)
+        chunk_index, position = self._locate(index_price)
+        found = self._maxes and position < len(self._keys[chunk_index]) and self._keys[chunk_index][position] == index_price
+        if size and count:
+            if found:
+                self._stale = 0
+                self._chunks[chunk_index][position] = delta
+            else:
+                self._insert(chunk_index, position, index_price, delta)
+        elif found:
+            self._delete(chunk_index, position)
+
+    def store(self, price, size, count):
+        self.storeArray([price, size, count])
+
+    def _keeps_level(self, delta):
+        return delta[1] and delta[2]
+
+# -----------------------------------------------------------------------------
+# orders are keyed by (price, order id) so an order is found by bisection
+# without walking the orders that share its price level
+
+
+class ChunkedIndexedOrderBookSide(ChunkedOrderBookSide):
+    _l2 = None  # the orders aggregated by price, see IndexedOrderBookSide.aggregated()
+    aggregated = IndexedOrderBookSide.aggregated
+    _aggregate_order = IndexedOrderBookSide._aggregate_order
+
+    def __init__(self, deltas=[], depth=None):
+        self._hashmap = {}
+        super(ChunkedIndexedOrderBookSide, self).__init__(deltas, depth)
+
+    def storeArray(self, delta):
+        price = delta[0]
+        if price is not None:
+            if self._ticks is not None:
+                price = round(price * self._ticks)
+            index_price = -price if self.side else price
+        else:
+            index_price = None
+        size = delta[1]
+        order_id = delta[2]
+        if size:
+            if order_id in self._hashmap:
+                old_price = self._hashmap[order_id]
+                index_price = index_price or old_price
+                chunk_index, position = self._find((old_price, order_id))
+                # matches if price is not defined or if price matches
+                if index_price == old_price:
+                    # in case the price is not defined
+                    delta[0] = self._chunks[chunk_index][position][0]
+                    if self._l2 is not None:
+                        self._aggregate_order(delta[0], delta[1] - self._chunks[chunk_index][position][1], 0)
+                    # just overwrite the old order
+                    self._stale = 0
+                    self._chunks[chunk_index][position] = delta
+                    if self._changes is not None:
+                        self._changes[order_id] = delta
+                    return
+                # remove old price level
+                if self._l2 is not None:
+                    order = self._chunks[chunk_index][position]
+                    self._aggregate_order(order[0], -order[1], -1)
+                self._delete(chunk_index, position)
+            # insert new price level
+            self._hashmap[order_id] = index_price
+            key = (index_price, order_id)
+            chunk_index, position = self._locate(key)
+            self._insert(chunk_index, position, key, delta)
+            if self._l2 is not None:
+                self._aggregate_order(delta[0], delta[1], 1)
+            if self._changes is not None:
+                self._changes[order_id] = delta
+        elif order_id in self._hashmap:
+            old_price = self._hashmap.pop(order_id)
+            chunk_index, position = self._find((old_price, order_id))
+            order = self._chunks[chunk_index][position]
+            if self._changes is not None:
+                self._changes[order_id] = self._removal(order)
+            if self._l2 is not None:
+                self._aggregate_order(order[0], -order[1], -1)
+            self._delete(chunk_index, position)
+
+    def clear(self):
+        super(ChunkedIndexedOrderBookSide, self).clear()
+        self._hashmap.clear()
+        if self._l2 is not None:
+            self._l2.clear()
+            self._l2_totals.clear()
+
+    def _position(self, index_price):
+        return self._rank((index_price, _last))
+
+    def _level_key(self, level):
+        return level[2]
 
     def remove_index(self, order):
         order_id = order[2]
         if order_id in self._hashmap:
             del self._hashmap[order_id]
+            if self._l2 is not None:
+                self._aggregate_order(order[0], -order[1], -1)
 
     def store(self, price, size, order_id):
         self.storeArray([price, size, order_id])
 
+# -----------------------------------------------------------------------------
+# keeps only the first `depth` levels in the side and the next `spill` levels
+# in a small buffer that refills the side when one of its levels is removed
+# deeper levels are dropped as they arrive, so memory and the cost of an
+# update depend on the depth asked for, not on the depth the exchange streams
+# once a level is dropped the levels behind it are unknown, so they are refused
+# until the side is cleared with a new snapshot, and the side then shows fewer
+# levels but never a level that skips over a dropped one, when removals leave
+# it with fewer than `depth` levels it raises InvalidNonce so that the handler
+# fetches a new snapshot like after a checksum error, and accepts all levels
+# again in case it doesn't
+
+
+class BoundedOrderBookSide(OrderBookSide):
+    def __init__(self, deltas=[], depth=None, spill=0):
+        self._spill = spill
+        self._spill_index = []
+        self._spill_levels = []
+        self._dropped = None
+        super(BoundedOrderBookSide, self).__init__(deltas, depth)
+
+    def storeArray(self, delta):
+        price = delta[0]
+        if self._ticks is not None:
+            price = round(price * self._ticks)
+        index_price = -price if self.side else price
+        if self._dropped is not None and index_price > self._dropped:
+            return
+        index = self._index
+        if len(index) >= self._depth and index_price > index[-1]:
+            self._store_spill(index_price, delta)
+            return
+        i = bisect.bisect_left(index, index_price)
+        if i < self._stale:
+            self._stale = i
+        if self._changes is not None:
+            self._changes[index_price] = delta if self._keeps_level(delta) else self._removal(delta)
+        if i < len(index) and index[i] == index_price:
+            if self._keeps_level(delta):
+                self[i] = delta
+            else:
+                del index[i]
+                del self[i]
+                self._refill()
+                if self._dropped is not None and len(index) < self._depth:
+                    self._dropped = None
+                    raise InvalidNonce('order book side has fewer levels than its depth after deeper levels were dropped, a new snapshot is needed')
+        elif self._keeps_level(delta):
+            index.insert(i, index_price)
+            self.insert(i, delta)
+            if len(index) > self._depth:
+                self._overflow()
+
+    def storeMany(self, deltas):
+        # all the deltas are stored before the side asks for a new snapshot
+        error = None
+        for delta in deltas:
+            try:
+                self.storeArray(delta)
+            except InvalidNonce as e:
+                error = e
+        if error is not None:
+            raise error
+
+    def storeStringArray(self, delta, strings):
+        try:
+            super(BoundedOrderBookSide, self).storeStringArray(delta, strings)
+        finally:
+            # no strings for a level that was refused or dropped as it arrived
+            index_price = self._index_price(delta[0])
+            if index_price in self._strings and not self._holds(index_price):
+                del self._strings[index_price]
+
+    def _holds(self, index_price):
+        for index in (self._index, self._spill_index):
+            i = bisect.bisect_left(index, index_price)
+            if i < len(index) and index[i] == index_price:
+                return True
+        return False
+
+    def _store_spill(self, index_price, delta):
+        spill_index = self._spill_index
+        i = bisect.bisect_left(spill_index, index_price)
+        if i < len(spill_index) and spill_index[i] == index_price:
+            if self._keeps_level(delta):
+                self._spill_levels[i] = delta
+            else:
+                del spill_index[i]
+                del self._spill_levels[i]
+        elif self._keeps_level(delta):
+            if i >= self._spill:
+                self._drop(index_price)
+                return
+            spill_index.insert(i, index_price)
+            self._spill_levels.insert(i, delta)
+            if len(spill_index) > self._spill:
+                self._drop(spill_index.pop())
+                self.remove_index(self._spill_levels.pop())
+
+    def _overflow(self):
+        # the last level of the side moves to the front of the spill buffer
+        level = self.pop()
+        self._spill_index.insert(0, self._index.pop())
+        self._spill_levels.insert(0, level)
+        if self._changes is not None:
+            self._changes[self._level_key(level)] = self._removal(level)
+        if len(self._spill_index) > self._spill:
+            self._drop(self._spill_index.pop())
+            self.remove_index(self._spill_levels.pop())
+
+    def _drop(self, index_price):
+        if self._dropped is None or index_price < self._dropped:
+            self._dropped = index_price
+
+    def _refill(self):
+        # the first level of the spill buffer moves to the end of the side
+        if self._spill_index:
+            self._stale = min(self._stale, len(self._index))
+            level = self._spill_levels.pop(0)
+            self._index.append(self._spill_index.pop(0))
+            self.append(level)
+            if self._changes is not None:
+                self._changes[self._level_key(level)] = level
+
+    def set_tick(self, tick):
+        # the levels behind the dropped one stay refused when the side is keyed again
+        dropped = self._dropped
+        if dropped is not None:
+            price = -dropped if self.side else dropped
+            if self._tick is not None:
+                price *= self._tick
+        super(BoundedOrderBookSide, self).set_tick(tick)
+        if dropped is not None:
+            self._dropped = self._index_price(price)
+
+    def _levels(self):
+        return list(self) + self._spill_levels
+
+    def clear(self):
+        super(BoundedOrderBookSide, self).clear()
+        self._spill_index.clear()
+        self._spill_levels.clear()
+        self._dropped = None
+
+
+class BoundedCountedOrderBookSide(BoundedOrderBookSide):
+    def store(self, price, size, count):
+        self.storeArray([price, size, count])
+
+    def _keeps_level(self, delta):
+        return delta[1] and delta[2]
+
 # -----------------------------------------------------------------------------
 # a more elegant syntax is possible here, but native inheritance is portable
 
@@ -172,3 +1110,13 @@ class CountedAsks(CountedOrderBookSide): side = False                       # no
 class CountedBids(CountedOrderBookSide): side = True                        # noqa
 class IndexedAsks(IndexedOrderBookSide): side = False                       # noqa
 class IndexedBids(IndexedOrderBookSide): side = True                        # noqa
+class ChunkedAsks(ChunkedOrderBookSide): side = False                       # noqa
+class ChunkedBids(ChunkedOrderBookSide): side = True                        # noqa
+class ChunkedCountedAsks(ChunkedCountedOrderBookSide): side = False         # noqa
+class ChunkedCountedBids(ChunkedCountedOrderBookSide): side = True          # noqa
+class ChunkedIndexedAsks(ChunkedIndexedOrderBookSide): side = False         # noqa
+class ChunkedIndexedBids(ChunkedIndexedOrderBookSide): side = True          # noqa
+class BoundedAsks(BoundedOrderBookSide): side = False                       # noqa
+class BoundedBids(BoundedOrderBookSide): side = True                        # noqa
+class BoundedCountedAsks(BoundedCountedOrderBookSide): side = False         # noqa
+class BoundedCountedBids(BoundedCountedOrderBookSide): side = True          # noqa
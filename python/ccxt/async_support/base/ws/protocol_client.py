@@ -0,0 +1,291 @@
+"""A websocket client on a plain asyncio protocol with its own frame parser
+
+Selected with options['ws']['client'] = 'protocol'. It doesn't use the internals of
+aiohttp that FastClient takes over, the frames are read straight from the
+transport in data_received and handled right away. The connection object has the
+closed, send_str, ping, pong and close of an aiohttp websocket, so everything else
+works as in AiohttpClient. Permessage-deflate isn't negotiated and proxies aren't
+supported, use the default client for those."""
+
+import os
+import ssl
+import base64
+import hashlib
+import asyncio
+from urllib.parse import urlparse
+from aiohttp import WSMsgType
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient
+from ccxt.base.errors import NetworkError, NotSupported
+
+GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+CONTINUATION = 0x0
+TEXT = 0x1
+BINARY = 0x2
+CLOSE = 0x8
+PING = 0x9
+PONG = 0xa
+
+
+class Message(object):
+    __slots__ = ('type', 'data')
+
+    def __init__(self, type, data):
+        self.type = type
+        self.data = data
+
+
+def mask(data, key):
+    # xor with the key repeated over the data, as one big integer
+    length = len(data)
+    if not length:
+        return data
+    repeated = (key * (length // 4 + 1))[:length]
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(length, 'big')
+
+
+def frame(opcode, payload):
+    # client frames are always masked
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, 0x80 | length])
+    elif length < 65536:
+        header = bytes([0x80 | opcode, 0x80 | 126]) + length.to_bytes(2, 'big')
+    else:
+        header = bytes([0x80 | opcode, 0x80 | 127]) + length.to_bytes(8, 'big')
+    key = os.urandom(4)
+    return header + key + mask(payload, key)
+
+
+class WebSocketProtocol(asyncio.Protocol):
+
+    def __init__(self, client, host, path, headers):
+        self.client = client
+        self.host = host
+        self.path = path
+        self.headers = headers or {}
+        self.key = base64.b64encode(os.urandom(16))
+        self.handshake = asyncio.get_running_loop().create_future()
+        self.transport = None
+        self.buffer = bytearray()
+        self.needed = 0  # bytes of the frame at the start of the buffer
+        self.receiving = False  # frames are parsed once the client is connected, see start()
+        self.fragments = None
+        self.fragments_type = None
+        self.close_code = None
+        self.closed = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        lines = [
+            'GET ' + self.path + ' HTTP/1.1',
+            'Host: ' + self.host,
+            'Upgrade: websocket',
+            'Connection: Upgrade',
+            'Sec-WebSocket-Key: ' + self.key.decode(),
+            'Sec-WebSocket-Version: 13',
+        ]
+        for name, value in self.headers.items():
+            lines.append(name + ': ' + str(value))
+        transport.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+
+    def data_received(self, data):
+        # the handshake response, then receive_frames
+        self.buffer += data
+        end = self.buffer.find(b'\r\n\r\n')
+        if end < 0:
+            return
+        response = bytes(self.buffer[:end]).decode('latin-1').split('\r\n')
+        del self.buffer[:end + 4]
+        headers = dict((name.strip().lower(), value.strip()) for name, _, value in (line.partition(':') for line in response[1:]))
+        accept = base64.b64encode(hashlib.sha1(self.key + GUID).digest()).decode()
+        status = response[0].split(' ')
+        if len(status) < 2 or status[1] != '101' or headers.get('sec-websocket-accept') != accept:
+            self.handshake.set_exception(NetworkError('websocket handshake failed: ' + response[0]))
+            self.transport.close()
+            return
+        self.data_received = self.receive_frames
+        self.handshake.set_result(self)
+
+    def receive_frames(self, data):
+        if self.buffer:
+            # the rest of a frame that didn't fit into the previous data
+            self.buffer += data
+            if len(self.buffer) < self.needed or not self.receiving:
+                return
+            data = bytes(self.buffer)
+            self.buffer = bytearray()
+        elif not self.receiving:
+            self.buffer += data
+            return
+        self.parse(data)
+
+    def start(self):
+        self.receiving = True
+        if self.buffer:
+            data = bytes(self.buffer)
+            self.buffer = bytearray()
+            self.parse(data)
+
+    def parse(self, data):
+        size = len(data)
+        position = 0
+        self.needed = 0
+        while size - position >= 2 and self.receiving:
+            first = data[position]
+            second = data[position + 1]
+            length = second & 0x7f
+            start = position + 2
+            if length == 126:
+                start += 2
+                if start > size:
+                    break
+                length = int.from_bytes(data[position + 2:start], 'big')
+            elif length == 127:
+                start += 8
+                if start > size:
+                    break
+                length = int.from_bytes(data[position + 2:start], 'big')
+            if second & 0x80:
+                start += 4
+            end = start + length
+            if end > size:
+                self.needed = end - position
+                break
+            payload = data[start:end]
+            if second & 0x80:
+                payload = mask(payload, data[start - 4:start])
+            position = end
+            if first == 0x81:
+                # a whole text frame, the decoder reads the bytes, see AiohttpClient.handle_text_or_binary_message
+                self.deliver(Message(WSMsgType.TEXT, payload))
+            else:
+                self.handle_frame(first & 0x80, first & 0x0f, payload)
+        if position < size:
+            self.buffer += data[position:]
+
+    def handle_frame(self, fin, opcode, payload):
+        if opcode == CONTINUATION:
+            if self.fragments is None:
+                return
+            self.fragments.append(payload)
+            if not fin:
+                return
+            opcode = self.fragments_type
+            payload = b''.join(self.fragments)
+            self.fragments = None
+        elif (opcode == TEXT or opcode == BINARY) and not fin:
+            self.fragments = [payload]
+            self.fragments_type = opcode
+            return
+        if opcode == TEXT:
+            self.deliver(Message(WSMsgType.TEXT, payload))
+        elif opcode == BINARY:
+            self.deliver(Message(WSMsgType.BINARY, payload))
+        elif opcode == PING:
+            self.deliver(Message(WSMsgType.PING, payload))
+        elif opcode == PONG:
+            self.deliver(Message(WSMsgType.PONG, payload))
+        elif opcode == CLOSE:
+            self.close_code = int.from_bytes(payload[:2], 'big') if len(payload) >= 2 else 1005
+            if not self.closed and not self.transport.is_closing():
+                self.write(CLOSE, payload[:2])
+            self.closed = True
+            self.receiving = False
+            self.transport.close()
+            self.deliver(Message(WSMsgType.CLOSE, self.close_code))
+
+    def deliver(self, message):
+        client = self.client
+        if client.connection is not self:
+            return
+        try:
+            client.handle_message(message)
+        except Exception as error:
+            client.reject(error)
+
+    def connection_lost(self, exc):
+        self.closed = True
+        self.receiving = False
+        if not self.handshake.done():
+            self.handshake.set_exception(NetworkError('connection closed during the websocket handshake'))
+            return
+        if self.close_code is None and self.client.connection is self:
+            # closed without a close frame
+            self.client.on_error(NetworkError('Abnormal closure of client'))
+
+    def write(self, opcode, payload):
+        if self.transport.is_closing():
+            raise NetworkError('websocket connection is closed')
+        self.transport.write(frame(opcode, payload))
+
+    async def send_str(self, message):
+        self.write(TEXT, message.encode())
+
+    async def send_bytes(self, message):
+        self.write(BINARY, message)
+
+    async def ping(self, message=b''):
+        self.write(PING, message)
+
+    async def pong(self, message=b''):
+        self.write(PONG, message)
+
+    async def close(self, code=1000, message=b''):
+        if not self.closed:
+            self.closed = True
+            self.receiving = False
+            try:
+                self.write(CLOSE, code.to_bytes(2, 'big') + message)
+            except NetworkError:
+                pass
+            self.close_code = code
+            self.transport.close()
+        return True
+
+
+class ProtocolClient(AiohttpClient):
+    ssl_context = None  # the one of the session of the exchange, False not to verify, see Exchange.get_ssl_context
+
+    def create_ssl_context(self):
+        context = self.ssl_context
+        if context is False:
+            # like aiohttp with ssl=False
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif not isinstance(context, ssl.SSLContext):
+            context = ssl.create_default_context()
+        return context
+
+    async def create_connection(self, session):
+        if self.proxy:
+            raise NotSupported('the protocol websocket client does not support proxies')
+        url = urlparse(self.url)
+        secure = url.scheme == 'wss'
+        host = url.hostname
+        port = url.port or (443 if secure else 80)
+        path = (url.path or '/') + ('?' + url.query if url.query else '')
+        loop = asyncio.get_running_loop()
+        context = self.create_ssl_context() if secure else None
+        transport, protocol = await loop.create_connection(
+            lambda: WebSocketProtocol(self, host if url.port is None else host + ':' + str(port), path, self.options.get('headers')),
+            host, port, ssl=context, server_hostname=host if secure else None)
+        try:
+            return await protocol.handshake
+        except BaseException:
+            transport.close()
+            raise
+
+    def receive_loop(self):
+        self.connection.start()
+        # return a future so super class won't complain
+        return asyncio.sleep(0)
+
+    def drop_connection(self):
+        connection = self.connection
+        if connection is not None and connection.transport is not None:
+            connection.closed = True
+            connection.receiving = False
+            connection.transport.abort()
+        return super(ProtocolClient, self).drop_connection()
@@ -0,0 +1,138 @@
+import bisect
+from collections import deque
+from contextvars import ContextVar
+from ccxt.async_support.base.ws.future import Future
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.order_book import OrderBook
+
+# the stream of the watch method that Exchange.stream_method is running, see Exchange.watch
+streaming = ContextVar('streaming', default=None)
+
+
+class Stream(object):
+    """One queue for all the updates of a subscription
+
+    The first call of the watch method subscribes as usual, the stream then receives
+    everything the client resolves for the message hashes of the last watch of that
+    call, so the next updates are taken from the queue without calling the watch
+    method again, and a future is only made to wait for one when the queue is empty.
+
+    An update is read like the watch method returns it, an order book is limited and
+    a cache gives the items stored between the last update that was read from it and
+    the resolve of this one, with a cursor of the stream, so several streams and watch
+    calls read the same cache."""
+
+    def __init__(self, size=None):
+        self.queue = deque(maxlen=size)
+        self.waiter = None
+        self.client = None
+        self.message_hashes = None
+        self.started = False  # after the first call of the watch method returned
+        self.cursors = {}  # id of a cache -> (the cache, the last serial or timestamp read from it)
+        self.error = None
+
+    def watch(self, client, message_hashes):
+        # the subscription of the last watch of the first call is the one of the stream
+        if self.started:
+            return
+        self.detach()
+        self.client = client
+        self.message_hashes = message_hashes
+        for message_hash in message_hashes:
+            client.streams.setdefault(message_hash, []).append(self)
+
+    def detach(self):
+        if self.client is None:
+            return
+        for message_hash in self.message_hashes:
+            streams = self.client.streams.get(message_hash)
+            if streams is not None and self in streams:
+                streams.remove(self)
+                if not streams:
+                    del self.client.streams[message_hash]
+        self.client = None
+
+    def wake(self):
+        waiter = self.waiter
+        if waiter is not None:
+            self.waiter = None
+            # a cancelled watch leaves the update in the queue for the next one
+            if not waiter.done():
+                self.settle(waiter)
+
+    def put(self, result):
+        cache = isinstance(result, (ArrayCache, ArrayCacheByTimestamp))
+        if not self.started:
+            # the first call of the watch method returns this one, a cache is read from here on
+            if cache and id(result) not in self.cursors:
+                self.cursors[id(result)] = (result, self.position(result))
+            return
+        # a cache is read up to where it was when it was resolved
+        self.queue.append((result, self.position(result) if cache else None))
+        self.wake()
+
+    def fail(self, error):
+        self.error = error
+        self.queue.clear()
+        self.detach()
+        self.wake()
+
+    def ready(self):
+        return bool(self.queue) or self.error is not None
+
+    def pop(self):
+        # the next (update, position) when ready() is True
+        if self.error is not None:
+            raise self.error
+        return self.queue.popleft()
+
+    def next(self):
+        # a Future of the next (update, position), for when the queue is empty
+        self.waiter = Future()
+        return self.waiter
+
+    def settle(self, future):
+        if self.error is not None:
+            future.reject(self.error)
+        else:
+            future.resolve(self.queue.popleft())
+
+    @staticmethod
+    def position(cache):
+        if isinstance(cache, ArrayCacheByTimestamp):
+            return cache[-1][0] if len(cache) else None
+        return cache._serial
+
+    @staticmethod
+    def sort_key(result):
+        # the key that since filters the items of a cache by, None for anything else
+        if isinstance(result, ArrayCacheByTimestamp):
+            return 0
+        if isinstance(result, ArrayCache):
+            return 'timestamp'
+        return None
+
+    def read(self, result, end=None):
+        # the update as the watch method returns it, without since and limit
+        # a cache gives the items stored after the last read and up to end
+        if isinstance(result, OrderBook):
+            return result.limit()
+        if not isinstance(result, (ArrayCache, ArrayCacheByTimestamp)):
+            return result
+        if end is None:
+            end = self.position(result)
+        _, start = self.cursors.get(id(result), (result, None))
+        self.cursors[id(result)] = (result, end)
+        if isinstance(result, ArrayCacheByTimestamp):
+            # the candle of the last one read is read again, it changes until the next one starts
+            keys = [candle[0] for candle in result]
+            first = 0 if start is None else bisect.bisect_left(keys, start)
+            return result[first:bisect.bisect_right(keys, end)] if end is not None else []
+        serials = result._serials
+        stop = len(serials)
+        while stop and serials[stop - 1] > end:
+            stop -= 1
+        first = stop
+        while first and (start is None or serials[first - 1] > start):
+            first -= 1
+        return result[first:stop]
@@ -0,0 +1,280 @@
+"""Runs the websocket connections of an exchange in worker processes
+
+With options['ws']['workers'] set to a number of processes, watch and watch_multiple
+hand the subscriptions of each url to one of the workers. A worker keeps its own
+instance of the exchange, reads and parses the messages and sends everything it
+resolves or rejects back through a pipe, where it resolves the futures of the
+exchange in the main process, so the watch methods work the same way.
+
+Order books and caches go to the main process once, after that only the
+levels and the items that changed are sent and stored into the copies there.
+The methods of the exchange in the subscriptions, like the handlers that binance
+calls for the answer to a subscription, go to the workers by name and are bound
+to the instance of the worker there.
+The workers are started with spawn, so the script that runs the exchange needs
+an if __name__ == '__main__' guard."""
+
+import asyncio
+import multiprocessing
+from threading import Thread
+from ccxt.base.errors import NetworkError
+from ccxt.async_support.base.ws.cache import BaseCache, ArrayCacheByTimestamp
+from ccxt.async_support.base.ws.order_book import OrderBook
+
+
+def listen(loop, connection, on_message, on_eof):
+    def receive():
+        try:
+            while connection.poll():
+                on_message(connection.recv())
+        except (EOFError, OSError):
+            loop.remove_reader(connection.fileno())
+            on_eof()
+
+    def receive_in_thread():
+        try:
+            while True:
+                loop.call_soon_threadsafe(on_message, connection.recv())
+        except (EOFError, OSError):
+            loop.call_soon_threadsafe(on_eof)
+
+    try:
+        loop.add_reader(connection.fileno(), receive)
+    except NotImplementedError:
+        # the proactor loop on windows can't wait for pipes
+        Thread(target=receive_in_thread, daemon=True).start()
+
+
+class ExchangeMethod(object):
+    """A method of the exchange in the arguments sent to a worker"""
+
+    def __init__(self, name):
+        self.name = name
+
+
+def unbind(exchange, value):
+    # the methods can't be pickled without the exchange, which can't be pickled at all
+    if isinstance(value, dict):
+        return dict((key, unbind(exchange, item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value)(unbind(exchange, item) for item in value)
+    if getattr(value, '__self__', None) is exchange:
+        return ExchangeMethod(value.__name__)
+    return value
+
+
+def rebind(exchange, value):
+    if isinstance(value, dict):
+        return dict((key, rebind(exchange, item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value)(rebind(exchange, item) for item in value)
+    if isinstance(value, ExchangeMethod):
+        return getattr(exchange, value.name)
+    return value
+
+
+def read_updates(cache):
+    # the items appended since the last call, counted by the same numbers as getLimit
+    if isinstance(cache, ArrayCacheByTimestamp):
+        items = [] if cache._clear_updates else [cache.hashmap[timestamp] for timestamp in cache._size_tracker if timestamp in cache.hashmap]
+        cache._clear_updates = True
+        return items
+    count = 0 if cache._clear_all_updates else min(cache._all_new_updates or 0, len(cache))
+    cache._clear_all_updates = True
+    return cache[len(cache) - count:]
+
+
+def store_updates(copy, updates):
+    if isinstance(copy, OrderBook):
+        for level in updates['asks']:
+            copy['asks'].storeArray(level)
+        for level in updates['bids']:
+            copy['bids'].storeArray(level)
+        copy['timestamp'] = updates['timestamp']
+        copy['datetime'] = updates['datetime']
+        copy['nonce'] = updates['nonce']
+    else:
+        for item in updates:
+            copy.append(item)
+
+
+class WorkerExchange(object):
+    """Mixed into the exchange class in the worker processes"""
+
+    connection = None
+    forwarded = None  # id -> order books and caches that the main process has a copy of
+
+    def client(self, url, key=None):
+        client = super(WorkerExchange, self).client(url, key)
+        client.forward = self.forward
+        return client
+
+    def forward(self, client, method, result, message_hash):
+        payload = result
+        if method == 'resolve' and isinstance(result, (OrderBook, BaseCache)):
+            if self.forwarded is None:
+                self.forwarded = {}
+            token = id(result)
+            updates = None
+            if isinstance(result, OrderBook):
+                changes = result.getChanges()
+                updates = None if changes['snapshot'] else changes
+            elif token in self.forwarded:
+                updates = read_updates(result)
+            if token in self.forwarded and updates is not None:
+                method, payload = 'update', (token, updates)
+            else:
+                # kept here so that the id isn't reused
+                self.forwarded[token] = result
+                method, payload = 'copy', (token, result)
+        try:
+            self.connection.send((method, client.url, message_hash, payload))
+        except Exception as e:
+            self.connection.send(('reject', client.url, message_hash, NetworkError(self.id + ' worker could not send ' + str(message_hash) + ': ' + str(e))))
+        if method == 'copy' and isinstance(result, BaseCache):
+            # the copy has the items up to here
+            read_updates(result)
+
+    def on_error(self, client, error):
+        super(WorkerExchange, self).on_error(client, error)
+        self.connection.send(('close', client.url, None, error))
+
+    def on_close(self, client, error):
+        super(WorkerExchange, self).on_close(client, error)
+        self.connection.send(('close', client.url, None, error))
+
+
+async def serve(exchange_id, config, connection):
+    import ccxt.pro
+    exchange_class = getattr(ccxt.pro, exchange_id)
+    exchange = type(exchange_class.__name__, (WorkerExchange, exchange_class), {})(config)
+    exchange.connection = connection
+    loop = asyncio.get_running_loop()
+    stopped = loop.create_future()
+
+    def on_message(request):
+        if request[0] == 'stop':
+            if not stopped.done():
+                stopped.set_result(True)
+            return
+        method, args = request[0], rebind(exchange, request[1:])
+        future = getattr(exchange, method)(*args)
+        # the result already went to the main process
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    def on_eof():
+        if not stopped.done():
+            stopped.set_result(True)
+
+    listen(loop, connection, on_message, on_eof)
+    await stopped
+    await exchange.close()
+
+
+def run_worker(exchange_id, config, connection):
+    asyncio.run(serve(exchange_id, config, connection))
+
+
+class WorkerPool(object):
+    """The worker processes of an exchange in the main process"""
+
+    def __init__(self, exchange, size):
+        self.exchange = exchange
+        self.config = self.worker_config(exchange)
+        self.context = multiprocessing.get_context('spawn')
+        self.processes = [None] * size
+        self.connections = [None] * size
+        self.urls = {}  # url -> index of the worker that has its connection
+        self.copies = {}  # (index, id in the worker) -> order books and caches
+        for index in range(size):
+            self.start(index)
+
+    @staticmethod
+    def worker_config(exchange):
+        ws_options = exchange.safe_value(exchange.options, 'ws', {})
+        config = {
+            'options': exchange.extend(exchange.options, {'ws': exchange.omit(ws_options, 'workers')}),
+            'urls': exchange.urls,
+            'markets': exchange.markets,
+            'enableRateLimit': exchange.enableRateLimit,
+            'newUpdates': exchange.newUpdates,
+            'verbose': exchange.verbose,
+        }
+        for key in exchange.requiredCredentials:
+            value = getattr(exchange, key, None)
+            if value is not None:
+                config[key] = value
+        return config
+
+    def start(self, index):
+        connection, child = self.context.Pipe()
+        process = self.context.Process(target=run_worker, args=(self.exchange.id, self.config, child), daemon=True)
+        process.start()
+        child.close()
+        self.processes[index] = process
+        self.connections[index] = connection
+        listen(self.exchange.asyncio_loop, connection, lambda message: self.handle(index, message), lambda: self.on_exit(index))
+
+    def send(self, url, method, *args):
+        index = self.urls.get(url)
+        if index is None:
+            # new urls go to the worker with the fewest
+            counts = [0] * len(self.processes)
+            for i in self.urls.values():
+                counts[i] += 1
+            index = counts.index(min(counts))
+            self.urls[url] = index
+        self.connections[index].send((method, url) + unbind(self.exchange, args))
+
+    def handle(self, index, message):
+        method, url, message_hash, result = message
+        client = self.exchange.clients.get(url) if self.exchange.clients else None
+        if method == 'copy':
+            token, result = result
+            if isinstance(result, OrderBook):
+                # the changes of the copy are only tracked once they are asked for
+                result['asks']._changes = None
+                result['bids']._changes = None
+            self.copies[(index, token)] = result
+            method = 'resolve'
+        elif method == 'update':
+            token, updates = result
+            result = self.copies[(index, token)]
+            store_updates(result, updates)
+            method = 'resolve'
+        if client is None:
+            return
+        if method == 'resolve':
+            client.resolve(result, message_hash)
+        elif method == 'reject':
+            client.reject(result, message_hash)
+        else:
+            # the next watch subscribes again
+            del self.exchange.clients[url]
+            client.reset(result or NetworkError(self.exchange.id + ' connection to ' + url + ' closed'))
+
+    def on_exit(self, index):
+        if self.connections[index] is None:
+            return
+        self.connections[index] = None
+        for key in [key for key in self.copies if key[0] == index]:
+            del self.copies[key]
+        for url in [url for url, i in self.urls.items() if i == index]:
+            del self.urls[url]
+            self.handle(index, ('close', url, None, NetworkError(self.exchange.id + ' worker process for ' + url + ' exited')))
+        self.start(index)
+
+    async def close(self):
+        connections = self.connections
+        self.connections = [None] * len(connections)
+        for connection in connections:
+            if connection is not None:
+                try:
+                    self.exchange.asyncio_loop.remove_reader(connection.fileno())
+                except NotImplementedError:
+                    pass
+                connection.send(('stop',))
+                connection.close()
+        for process in self.processes:
+            if process is not None:
+                await self.exchange.asyncio_loop.run_in_executor(None, process.join, 5)
@@ -32,6 +32,7 @@ from ccxt.base.decimal_to_precision import decimal_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE, NO_PADDING, TRUNCATE, ROUND, ROUND_UP, ROUND_DOWN, SIGNIFICANT_DIGITS
 from ccxt.base.decimal_to_precision import number_to_string
 from ccxt.base.precise import Precise
+from ccxt.base.json_decoder import get_decoder, decode_quoted_json
 from ccxt.base.types import BalanceAccount, Currency, IndexType, OrderSide, OrderType, Trade, OrderRequest, Market, MarketType, Str, Num, Strings, CancellationRequest, Bool
 
 # -----------------------------------------------------------------------------
@@ -321,6 +322,7 @@ class Exchange(object):
     minFundingAddressLength = 1  # used in check_address
     substituteCommonCurrencyCodes = True
     quoteJsonNumbers = True
+    jsonDecoder = None  # used when quoteJsonNumbers is False, see ccxt/base/json_decoder.py
     number: Num = float  # or str (a pointer to a class)
     handleContentTypeApplicationZip = False
     # whether fees should be summed by currency code
@@ -486,9 +488,9 @@ class Exchange(object):
 
     def on_json_response(self, response_body):
         if self.quoteJsonNumbers:
-            return json.loads(response_body, parse_float=str, parse_int=str)
+            return decode_quoted_json(response_body)
         else:
-            return json.loads(response_body)
+            return get_decoder(self.jsonDecoder)(response_body)
 
     def fetch(self, url, method='GET', headers=None, body=None):
         """Perform a HTTP request and return decoded JSON data"""
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""Decodes JSON with the fastest decoder installed, falling back to the standard library"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'DECODERS',
+    'get_decoder',
+    'decode_quoted_json',
+]
+
+# in order of preference, the first one installed is used by default
+DECODERS = ['orjson', 'msgspec', 'ujson', 'json']
+
+_decoders = {}
+
+
+def decode_quoted_json(data):
+    # keeps all numbers as strings, the other decoders have no hook for integers
+    # so the standard library is the only one that can do this
+    return json.loads(data, parse_float=str, parse_int=str)
+
+
+def _with_fallback(loads, errors):
+    # the faster decoders reject a few inputs that the standard library accepts
+    # like integers of more than 64 bits or NaN, those are decoded again with it
+    def decode(data):
+        try:
+            return loads(data)
+        except errors:
+            return json.loads(data)
+    return decode
+
+
+def _installed():
+    return {
+        'orjson': orjson is not None,
+        'msgspec': msgspec is not None,
+        'ujson': ujson is not None,
+        'json': True,
+    }
+
+
+def get_decoder(name=None):
+    # returns a function that decodes JSON from bytes or a str
+    # name is one of DECODERS, None picks the first one that is installed
+    # a decoder that isn't installed falls back to the standard library
+    if name in _decoders:
+        return _decoders[name]
+    installed = _installed()
+    if name is None:
+        chosen = next(decoder for decoder in DECODERS if installed[decoder])
+    elif name in installed:
+        chosen = name if installed[name] else 'json'
+    else:
+        raise ValueError('unknown JSON decoder ' + str(name) + ', expected one of ' + ', '.join(DECODERS))
+    if chosen == 'orjson':
+        decoder = _with_fallback(orjson.loads, ValueError)
+    elif chosen == 'msgspec':
+        decoder = _with_fallback(msgspec.json.Decoder().decode, (msgspec.DecodeError, ValueError))
+    elif chosen == 'ujson':
+        decoder = _with_fallback(ujson.loads, (ValueError, OverflowError))
+    else:
+        decoder = json.loads
+    _decoders[name] = decoder
+    return decoder
@@ -100,6 +100,12 @@ class binance(ccxt.async_support.binance):
             },
             'options': {
                 'returnRateLimits': False,
+                # options['ws']['coalesceSubscriptions'] merges the params of the subscriptions sent together
+                'subscriptionBatch': {
+                    'field': 'params',
+                    'id': 'id',
+                    'limit': 200,
+                },
                 'streamLimits': {
                     'spot': 50,  # max 1024
                     'margin': 50,  # max 1024
@@ -814,8 +820,7 @@ class binance(ccxt.async_support.binance):
         bookside.store(price, amount)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        self.handle_deltas_with_keys(bookside, deltas)
 
     def handle_order_book_message(self, client: Client, message, orderbook):
         u = self.safe_integer(message, 'u')
@@ -940,13 +945,16 @@ class binance(ccxt.async_support.binance):
         #
         id = self.safe_string(message, 'id')
         subscriptionsById = self.index_by(client.subscriptions, 'id')
-        subscription = self.safe_value(subscriptionsById, id, {})
-        method = self.safe_value(subscription, 'method')
-        if method is not None:
-            method(client, message, subscription)
-        isUnSubMessage = self.safe_bool(subscription, 'unsubscribe', False)
-        if isUnSubMessage:
-            self.handle_un_subscription(client, subscription)
+        # a message sent together with others acknowledges all of them, see Client.batchedIds
+        ids = client.batchedIds(id)
+        for i in range(0, len(ids)):
+            subscription = self.safe_value(subscriptionsById, ids[i], {})
+            method = self.safe_value(subscription, 'method')
+            if method is not None:
+                method(client, message, subscription)
+            isUnSubMessage = self.safe_bool(subscription, 'unsubscribe', False)
+            if isUnSubMessage:
+                self.handle_un_subscription(client, subscription)
         return message
 
     def handle_un_subscription(self, client: Client, subscription: dict):
@@ -582,7 +582,8 @@ class bitfinex2(ccxt.async_support.bitfinex2):
                     size = -amount if (amount < 0) else amount
                     side = 'asks' if (amount < 0) else 'bids'
                     bookside = orderbook[side]
-                    bookside.storeArray([price, size, counter])
+                    # the checksum uses the signed amount
+                    bookside.storeStringArray([price, size, counter], [self.number_to_string(price), self.number_to_string(amount)])
             orderbook['symbol'] = symbol
             client.resolve(orderbook, messageHash)
         else:
@@ -606,7 +607,8 @@ class bitfinex2(ccxt.async_support.bitfinex2):
                 size = Precise.string_neg(amount) if Precise.string_lt(amount, '0') else amount
                 side = 'asks' if Precise.string_lt(amount, '0') else 'bids'
                 bookside = orderbookItem[side]
-                bookside.storeArray([self.parse_number(price), self.parse_number(size), self.parse_number(counter)])
+                parsedPrice = self.parse_number(price)
+                bookside.storeStringArray([parsedPrice, self.parse_number(size), self.parse_number(counter)], [self.number_to_string(parsedPrice), self.number_to_string(self.parse_number(amount))])
             client.resolve(orderbook, messageHash)
 
     def handle_checksum(self, client: Client, message, subscription):
@@ -628,16 +630,28 @@ class bitfinex2(ccxt.async_support.bitfinex2):
         isRaw = (prec == 'R0')
         idToCheck = 2 if isRaw else 0
         # pepperoni pizza from bitfinex
-        for i in range(0, depth):
-            bid = self.safe_value(bids, i)
-            ask = self.safe_value(asks, i)
-            if bid is not None:
-                stringArray.append(self.number_to_string(bids[i][idToCheck]))
-                stringArray.append(self.number_to_string(bids[i][1]))
-            if ask is not None:
-                stringArray.append(self.number_to_string(asks[i][idToCheck]))
-                aski1 = asks[i][1]
-                stringArray.append(self.number_to_string(-aski1))
+        if isRaw:
+            for i in range(0, depth):
+                bid = self.safe_value(bids, i)
+                ask = self.safe_value(asks, i)
+                if bid is not None:
+                    stringArray.append(self.number_to_string(bids[i][idToCheck]))
+                    stringArray.append(self.number_to_string(bids[i][1]))
+                if ask is not None:
+                    stringArray.append(self.number_to_string(asks[i][idToCheck]))
+                    aski1 = asks[i][1]
+                    stringArray.append(self.number_to_string(-aski1))
+        else:
+            # price level books keep the checksum strings of their top levels
+            bidStrings = bids.topStrings(depth)
+            askStrings = asks.topStrings(depth)
+            for i in range(0, depth):
+                if i * 2 < len(bidStrings):
+                    stringArray.append(bidStrings[i * 2])
+                    stringArray.append(bidStrings[i * 2 + 1])
+                if i * 2 < len(askStrings):
+                    stringArray.append(askStrings[i * 2])
+                    stringArray.append(askStrings[i * 2 + 1])
         payload = ':'.join(stringArray)
         localChecksum = self.crc32(payload, True)
         responseChecksum = self.safe_integer(message, 2)
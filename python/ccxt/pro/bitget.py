@@ -631,32 +631,38 @@ class bitget(ccxt.async_support.bitget):
         if incrementalBook:
             # storedOrderBook = self.safe_value(self.orderbooks, symbol)
             if not (symbol in self.orderbooks):
-                # ob = self.order_book({})
-                ob = self.counted_order_book({})
+                ob = self.order_book({})
                 ob['symbol'] = symbol
                 self.orderbooks[symbol] = ob
             storedOrderBook = self.orderbooks[symbol]
             asks = self.safe_value(rawOrderBook, 'asks', [])
             bids = self.safe_value(rawOrderBook, 'bids', [])
-            self.handle_deltas(storedOrderBook['asks'], asks)
-            self.handle_deltas(storedOrderBook['bids'], bids)
+            checksum = self.safe_bool(self.options, 'checksum', True)
+            if checksum:
+                # keep the price and amount strings for the checksum
+                self.handle_deltas(storedOrderBook['asks'], asks)
+                self.handle_deltas(storedOrderBook['bids'], bids)
+            else:
+                self.handle_deltas_with_keys(storedOrderBook['asks'], asks)
+                self.handle_deltas_with_keys(storedOrderBook['bids'], bids)
             storedOrderBook['timestamp'] = timestamp
             storedOrderBook['datetime'] = self.iso8601(timestamp)
-            checksum = self.safe_bool(self.options, 'checksum', True)
             isSnapshot = self.safe_string(message, 'action') == 'snapshot'  # snapshot does not have a checksum
             if not isSnapshot and checksum:
                 storedAsks = storedOrderBook['asks']
                 storedBids = storedOrderBook['bids']
                 asksLength = len(storedAsks)
                 bidsLength = len(storedBids)
+                bidStrings = storedBids.topStrings(25)
+                askStrings = storedAsks.topStrings(25)
                 payloadArray = []
                 for i in range(0, 25):
                     if i < bidsLength:
-                        payloadArray.append(storedBids[i][2][0])
-                        payloadArray.append(storedBids[i][2][1])
+                        payloadArray.append(bidStrings[i * 2])
+                        payloadArray.append(bidStrings[i * 2 + 1])
                     if i < asksLength:
-                        payloadArray.append(storedAsks[i][2][0])
-                        payloadArray.append(storedAsks[i][2][1])
+                        payloadArray.append(askStrings[i * 2])
+                        payloadArray.append(askStrings[i * 2 + 1])
                 payload = ':'.join(payloadArray)
                 calculatedChecksum = self.crc32(payload, True)
                 responseChecksum = self.safe_integer(rawOrderBook, 'checksum')
@@ -680,11 +686,11 @@ class bitget(ccxt.async_support.bitget):
         client.reject(error, messageHash)
 
     def handle_delta(self, bookside, delta):
-        bidAsk = self.parse_bid_ask(delta, 0, 1)
         # we store the string representations in the orderbook for checksum calculation
         # self simplifies the code for generating checksums do not need to do any complex number transformations
-        bidAsk.append(delta)
-        bookside.storeArray(bidAsk)
+        priceString = self.safe_string(delta, 0)
+        amountString = self.safe_string(delta, 1)
+        bookside.storeStringArray([self.parse_number(priceString), self.parse_number(amountString)], [priceString, amountString])
 
     def handle_deltas(self, bookside, deltas):
         for i in range(0, len(deltas)):
@@ -110,6 +110,12 @@ class bybit(ccxt.async_support.bybit):
                 },
             },
             'options': {
+                # options['ws']['coalesceSubscriptions'] merges the args of the subscriptions sent together, spot takes 10 per message
+                'subscriptionBatch': {
+                    'field': 'args',
+                    'id': 'req_id',
+                    'limit': 10,
+                },
                 'watchTicker': {
                     'name': 'tickers',  # 'tickers' for 24hr statistical ticker or 'tickers_lt' for leverage token ticker
                 },
@@ -934,8 +940,7 @@ class bybit(ccxt.async_support.bybit):
         bookside.storeArray(bidAsk)
 
     def handle_deltas(self, bookside, deltas):
-        for i in range(0, len(deltas)):
-            self.handle_delta(bookside, deltas[i])
+        self.handle_deltas_with_keys(bookside, deltas)
 
     async def watch_trades(self, symbol: str, since: Int = None, limit: Int = None, params={}) -> List[Trade]:
         """
@@ -2344,6 +2349,8 @@ class bybit(ccxt.async_support.bybit):
         #     },
         # }
         reqId = self.safe_string(message, 'req_id')
+        # a message sent together with others acknowledges all of them, see Client.batchedIds
+        reqIds = client.batchedIds(reqId)
         keys = list(client.subscriptions.keys())
         for i in range(0, len(keys)):
             messageHash = keys[i]
@@ -2353,7 +2360,7 @@ class bybit(ccxt.async_support.bybit):
             if messageHash.startswith('unsubscribe'):
                 subscription = client.subscriptions[messageHash]
                 subId = self.safe_string(subscription, 'id')
-                if reqId != subId:
+                if not self.in_array(subId, reqIds):
                     continue
                 messageHashes = self.safe_list(subscription, 'messageHashes', [])
                 subMessageHashes = self.safe_list(subscription, 'subMessageHashes', [])
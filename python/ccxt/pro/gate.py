@@ -510,14 +510,14 @@ class gate(ccxt.async_support.gate):
         return len(cache)
 
     def handle_bid_asks(self, bookSide, bidAsks):
-        for i in range(0, len(bidAsks)):
-            bidAsk = bidAsks[i]
-            if isinstance(bidAsk, list):
-                bookSide.storeArray(self.parse_bid_ask(bidAsk))
-            else:
-                price = self.safe_float(bidAsk, 'p')
-                amount = self.safe_float(bidAsk, 's')
-                bookSide.store(price, amount)
+        # spot levels are [price, amount], swap levels are {"p": price, "s": amount}
+        first = self.safe_value(bidAsks, 0)
+        if first is None:
+            return
+        if isinstance(first, list):
+            self.handle_deltas_with_keys(bookSide, bidAsks)
+        else:
+            self.handle_deltas_with_keys(bookSide, bidAsks, 'p', 's')
 
     def handle_delta(self, orderbook, delta):
         timestamp = self.safe_integer(delta, 't')
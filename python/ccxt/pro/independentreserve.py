@@ -189,29 +189,25 @@ class independentreserve(ccxt.async_support.independentreserve):
             self.orderbooks[symbol] = self.order_book({})
         orderbook = self.orderbooks[symbol]
         if event == 'OrderBookSnapshot':
-            snapshot = self.parse_order_book(orderBook, symbol, timestamp, 'Bids', 'Offers', 'Price', 'Volume')
-            orderbook.reset(snapshot)
+            # the snapshot levels are stored like deltas to keep their checksum strings
+            orderbook.reset({
+                'symbol': symbol,
+                'bids': [],
+                'asks': [],
+            })
             subscription['receivedSnapshot'] = True
-        else:
-            asks = self.safe_list(orderBook, 'Offers', [])
-            bids = self.safe_list(orderBook, 'Bids', [])
-            self.handle_deltas(orderbook['asks'], asks)
-            self.handle_deltas(orderbook['bids'], bids)
-            orderbook['timestamp'] = timestamp
-            orderbook['datetime'] = self.iso8601(timestamp)
+        asks = self.safe_list(orderBook, 'Offers', [])
+        bids = self.safe_list(orderBook, 'Bids', [])
+        self.handle_deltas(orderbook['asks'], asks)
+        self.handle_deltas(orderbook['bids'], bids)
+        orderbook['timestamp'] = timestamp
+        orderbook['datetime'] = self.iso8601(timestamp)
         checksum = self.handle_option('watchOrderBook', 'checksum', True)
         if checksum and receivedSnapshot:
             storedAsks = orderbook['asks']
             storedBids = orderbook['bids']
-            asksLength = len(storedAsks)
-            bidsLength = len(storedBids)
-            payload = ''
-            for i in range(0, 10):
-                if i < bidsLength:
-                    payload = payload + self.value_to_checksum(storedBids[i][0]) + self.value_to_checksum(storedBids[i][1])
-            for i in range(0, 10):
-                if i < asksLength:
-                    payload = payload + self.value_to_checksum(storedAsks[i][0]) + self.value_to_checksum(storedAsks[i][1])
+            # every level keeps its checksum string, computed once when the level was stored
+            payload = ''.join(storedBids.topStrings(10)) + ''.join(storedAsks.topStrings(10))
             calculatedChecksum = self.crc32(payload, True)
             responseChecksum = self.safe_integer(orderBook, 'Crc32')
             if calculatedChecksum != responseChecksum:
@@ -232,7 +228,10 @@ class independentreserve(ccxt.async_support.independentreserve):
 
     def handle_delta(self, bookside, delta):
         bidAsk = self.parse_bid_ask(delta, 'Price', 'Volume')
-        bookside.storeArray(bidAsk)
+        if bidAsk[1]:
+            bookside.storeStringArray(bidAsk, [self.value_to_checksum(bidAsk[0]) + self.value_to_checksum(bidAsk[1])])
+        else:
+            bookside.storeStringArray(bidAsk, [])
 
     def handle_deltas(self, bookside, deltas):
         for i in range(0, len(deltas)):
@@ -768,31 +768,18 @@ class kraken(ccxt.async_support.kraken):
                     b = self.safe_value(message[1], 'b', [])
             storedAsks = orderbook['asks']
             storedBids = orderbook['bids']
-            example = None
             if a is not None:
                 timestamp = self.custom_handle_deltas(storedAsks, a, timestamp)
-                example = self.safe_value(a, 0)
             if b is not None:
                 timestamp = self.custom_handle_deltas(storedBids, b, timestamp)
-                example = self.safe_value(b, 0)
             # don't remove self line or I will poop on your face
             orderbook.limit()
             checksum = self.handle_option('watchOrderBook', 'checksum', True)
             if checksum:
-                priceString = self.safe_string(example, 0)
-                amountString = self.safe_string(example, 1)
-                priceParts = priceString.split('.')
-                amountParts = amountString.split('.')
-                priceLength = len(priceParts[1]) - 0
-                amountLength = len(amountParts[1]) - 0
                 payloadArray = []
                 if c is not None:
-                    for i in range(0, 10):
-                        formatted = self.format_number(storedAsks[i][0], priceLength) + self.format_number(storedAsks[i][1], amountLength)
-                        payloadArray.append(formatted)
-                    for i in range(0, 10):
-                        formatted = self.format_number(storedBids[i][0], priceLength) + self.format_number(storedBids[i][1], amountLength)
-                        payloadArray.append(formatted)
+                    # every level keeps its checksum string, computed once when the level was stored
+                    payloadArray = self.array_concat(storedAsks.topStrings(10), storedBids.topStrings(10))
                 payload = ''.join(payloadArray)
                 localChecksum = self.crc32(payload, False)
                 if localChecksum != c:
@@ -821,6 +808,15 @@ class kraken(ccxt.async_support.kraken):
         else:
             return joined
 
+    def checksum_string(self, value):
+        # the checksum is built from the strings received from the exchange
+        # with the decimal point and the leading zeros removed
+        joined = value.replace('.', '')
+        i = 0
+        while((i < len(joined)) and (joined[i] == '0')):
+            i += 1
+        return joined[i:]
+
     def custom_handle_deltas(self, bookside, deltas, timestamp=None):
         for j in range(0, len(deltas)):
             delta = deltas[j]
@@ -828,7 +824,7 @@ class kraken(ccxt.async_support.kraken):
             amount = self.parse_number(delta[1])
             oldTimestamp = timestamp if timestamp else 0
             timestamp = max(oldTimestamp, self.parse_to_int(float(delta[2]) * 1000))
-            bookside.store(price, amount)
+            bookside.storeStringArray([price, amount], [self.checksum_string(delta[0]) + self.checksum_string(delta[1])])
         return timestamp
 
     def handle_system_status(self, client: Client, message):
@@ -58,6 +58,11 @@ class okx(ccxt.async_support.okx):
                 },
             },
             'options': {
+                # options['ws']['coalesceSubscriptions'] merges the args of the subscriptions sent together, up to 64kb per message
+                'subscriptionBatch': {
+                    'field': 'args',
+                    'limit': 100,
+                },
                 'watchOrderBook': {
                     'checksum': True,
                     #
@@ -1123,6 +1128,13 @@ class okx(ccxt.async_support.okx):
         for i in range(0, len(deltas)):
             self.handle_delta(bookside, deltas[i])
 
+    def handle_string_deltas(self, bookside, deltas):
+        for i in range(0, len(deltas)):
+            delta = deltas[i]
+            priceString = self.safe_string(delta, 0)
+            amountString = self.safe_string(delta, 1)
+            bookside.storeStringArray([self.parse_number(priceString), self.parse_number(amountString)], [priceString, amountString])
+
     def handle_order_book_message(self, client: Client, message, orderbook, messageHash, market=None):
         #
         #     {
@@ -1147,25 +1159,33 @@ class okx(ccxt.async_support.okx):
         bids = self.safe_value(message, 'bids', [])
         storedAsks = orderbook['asks']
         storedBids = orderbook['bids']
-        self.handle_deltas(storedAsks, asks)
-        self.handle_deltas(storedBids, bids)
+        checksum = self.handle_option('watchOrderBook', 'checksum', True)
+        if checksum:
+            # keep the price and amount strings for the checksum
+            self.handle_string_deltas(storedAsks, asks)
+            self.handle_string_deltas(storedBids, bids)
+        else:
+            # the levels are [price, amount, liquidated orders, orders], no count is stored, as in handleDelta
+            self.handle_deltas_with_keys(storedAsks, asks, 0, 1, 4)
+            self.handle_deltas_with_keys(storedBids, bids, 0, 1, 4)
         marketId = self.safe_string(message, 'instId')
         symbol = self.safe_symbol(marketId, market)
-        checksum = self.handle_option('watchOrderBook', 'checksum', True)
         seqId = self.safe_integer(message, 'seqId')
         if checksum:
             prevSeqId = self.safe_integer(message, 'prevSeqId')
             nonce = orderbook['nonce']
             asksLength = len(storedAsks)
             bidsLength = len(storedBids)
+            bidStrings = storedBids.topStrings(25)
+            askStrings = storedAsks.topStrings(25)
             payloadArray = []
             for i in range(0, 25):
                 if i < bidsLength:
-                    payloadArray.append(self.number_to_string(storedBids[i][0]))
-                    payloadArray.append(self.number_to_string(storedBids[i][1]))
+                    payloadArray.append(bidStrings[i * 2])
+                    payloadArray.append(bidStrings[i * 2 + 1])
                 if i < asksLength:
-                    payloadArray.append(self.number_to_string(storedAsks[i][0]))
-                    payloadArray.append(self.number_to_string(storedAsks[i][1]))
+                    payloadArray.append(askStrings[i * 2])
+                    payloadArray.append(askStrings[i * 2 + 1])
             payload = ':'.join(payloadArray)
             responseChecksum = self.safe_integer(message, 'checksum')
             localChecksum = self.crc32(payload, True)
@@ -0,0 +1,68 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: E402
+from ccxt.async_support.base.ws import hooks  # noqa: E402
+from ccxt.pro.binance import binance  # noqa: E402
+from ccxt.pro.binanceusdm import binanceusdm  # noqa: E402
+
+
+def test_peek_json_string():
+    message = '{"e":"24hrTicker","E":1700000000000,"s":"BTCUSDT"}'
+    assert Exchange.peek_json_string(message, 'e') == '24hrTicker'
+    assert Exchange.peek_json_string(message.encode(), 's') == 'BTCUSDT'
+    assert Exchange.peek_json_string(message, 'x') is None
+    # only the beginning of the message is searched
+    assert Exchange.peek_json_string(message, 's', 20) is None
+
+
+def test_client_classifier():
+    received = []
+    routed = []
+
+    def classifier(client, message):
+        event = Exchange.peek_json_string(message, 'e')
+        if event == 'drop':
+            return False
+        if event == 'route':
+            return lambda client, message: routed.append(message)
+        return None
+
+    client = AiohttpClient('wss://example.com', lambda client, message: received.append(message), None, None, None, {
+        'classifier': classifier,
+    })
+    client.handle_text_or_binary_message(b'{"e":"drop","a":1}')
+    client.handle_text_or_binary_message(b'{"e":"route","a":2}')
+    client.handle_text_or_binary_message('{"e":"other","a":3}')
+    client.handle_text_or_binary_message(b'pong')
+    assert routed == [{'e': 'route', 'a': 2}]
+    assert received == [{'e': 'other', 'a': 3}, 'pong']
+
+
+def test_binance_classifier():
+    exchange = binance()
+    classify = hooks.lookup(exchange, hooks.classifiers)
+    client = AiohttpClient('wss://example.com', None, None, None, None, {})
+    client.subscriptions['btcusdt@ticker'] = True
+    assert classify(client, b'{"e":"24hrTicker","E":1,"s":"BTCUSDT"}') == exchange.handle_tickers
+    # unsubscribed streams are dropped, other events are decoded as usual
+    assert classify(client, b'{"e":"24hrTicker","E":1,"s":"ETHUSDT"}') is False
+    assert classify(client, b'{"e":"trade","E":1,"s":"BTCUSDT"}') is None
+    conflation_key = hooks.lookup(exchange, hooks.conflation_keys)
+    assert conflation_key(client, b'{"e":"24hrTicker","E":1,"s":"BTCUSDT"}') == '24hrTicker:BTCUSDT'
+    assert conflation_key(client, '{"u":1,"s":"BTCUSDT","b":"1"}') == 'bookTicker:BTCUSDT'
+    assert conflation_key(client, b'{"e":"trade","E":1,"s":"BTCUSDT"}') is None
+    # the subclasses of binance get its hooks
+    assert hooks.lookup(binanceusdm(), hooks.classifiers) is not None
+    assert hooks.lookup(binanceusdm(), hooks.conflation_keys) is not None
+    assert hooks.lookup(Exchange(), hooks.classifiers) is None
+
+
+def test_classifier():
+    test_peek_json_string()
+    test_client_classifier()
+    test_binance_classifier()
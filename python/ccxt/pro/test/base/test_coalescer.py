@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.pro.test.base.test_reconnect import fake_connections, wait_until  # noqa: E402
+
+
+async def test_coalescer():
+    exchange = Exchange({
+        'id': 'test',
+        'enableRateLimit': False,
+        'options': {
+            'subscriptionBatch': {'field': 'params', 'id': 'id', 'limit': 3},
+            'ws': {'coalesceSubscriptions': 5, 'keepAlive': False},
+        },
+    })
+    url = 'wss://example.com'
+    client = exchange.client(url)
+    sent = []
+    fake_connections(client, sent, [])
+    futures = []
+    try:
+        for i in range(4):
+            futures.append(exchange.watch(url, 'trade:' + str(i), {'method': 'SUBSCRIBE', 'params': ['trade' + str(i)], 'id': i}, 'trade:' + str(i)))
+        futures.append(exchange.watch_multiple(url, ['book:4', 'book:5'], {'method': 'SUBSCRIBE', 'params': ['book4', 'book5'], 'id': 4}, ['book:4', 'book:5']))
+        futures.append(exchange.watch(url, 'unsubscribe:trade:0', {'method': 'UNSUBSCRIBE', 'params': ['trade0'], 'id': 5}, 'unsubscribe:trade:0'))
+        await wait_until(lambda: len(sent) == 3)
+        messages = [json.loads(message) for message in sent]
+        # the same messages apart from the params and the id, up to 3 params in one
+        assert messages[0] == {'method': 'SUBSCRIBE', 'params': ['trade0', 'trade1', 'trade2'], 'id': 0}
+        assert messages[1] == {'method': 'SUBSCRIBE', 'params': ['trade3', 'book4', 'book5'], 'id': 3}
+        assert messages[2] == {'method': 'UNSUBSCRIBE', 'params': ['trade0'], 'id': 5}
+        assert client.batched_ids('0') == ['0', '1', '2']
+        assert client.batched_ids('3') == ['3', '4']
+        assert client.batched_ids('5') == ['5']
+        assert client.coalescer.sent == 3
+    finally:
+        await exchange.close()
+        await asyncio.gather(*futures, return_exceptions=True)
+    # each subscription gets the acknowledgement of the message it was sent with
+    binance = ccxt.pro.binance({'options': {'ws': {'coalesceSubscriptions': True}}})
+    client = binance.client('wss://example.com')
+    acknowledged = []
+    for id in ['1', '2', '3']:
+        client.subscriptions['depth' + id] = {'id': id, 'method': lambda client, message, subscription: acknowledged.append(subscription['id'])}
+    client.coalescer.batches['1'] = ['1', '2']
+    binance.handle_subscription_status(client, {'result': None, 'id': 1})
+    assert acknowledged == ['1', '2']
+    await binance.close()
@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+import socket
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from aiohttp import WSMsgType  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.fast_client import FastClient  # noqa: E402
+
+
+class Fake:
+    # stands in for the aiohttp connection that receive_loop takes over
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+class Message:
+    type = WSMsgType.TEXT
+
+    def __init__(self, data):
+        self.data = json.dumps(data, separators=(',', ':'))
+
+
+def connect(client):
+    sock = socket.socket()
+    reader = Fake(parse_frame=lambda buf: None, queue=Fake())
+    transport = Fake(get_extra_info=lambda name: sock, abort=lambda: None, reading=True)
+    transport.pause_reading = lambda: setattr(transport, 'reading', False)
+    transport.resume_reading = lambda: setattr(transport, 'reading', True)
+    client.connection = Fake(_conn=Fake(closed=False, transport=transport, protocol=Fake(_payload_parser=reader)))
+    client.receive_loop().close()
+    return reader.queue, sock
+
+
+def conflation_key(client, message):
+    if Exchange.peek_json_string(message, 'e') == 'ticker':
+        return Exchange.peek_json_string(message, 's')
+    return None
+
+
+async def test_fast_client_queue():
+    received = []
+    client = FastClient('wss://example.com', lambda client, message: received.append(message), None, None, None, {
+        'asyncio_loop': asyncio.get_running_loop(),
+        'maxQueueSize': 4,
+        'conflate': conflation_key,
+    })
+    queue, sock = connect(client)
+    # the latest ticker takes the place of the waiting one
+    for data in [{'e': 'ticker', 's': 'A', 'c': 1}, {'e': 'trade', 'p': 1}, {'e': 'ticker', 's': 'A', 'c': 2}]:
+        queue.feed_data(Message(data), 0)
+    while client.stack:
+        await asyncio.sleep(0)
+    assert received == [{'e': 'ticker', 's': 'A', 'c': 2}, {'e': 'trade', 'p': 1}]
+    # past maxQueueSize the oldest ticker is dropped, the other frames are all handled
+    received.clear()
+    queue.feed_data(Message({'e': 'ticker', 's': 'B', 'c': 1}), 0)
+    for i in range(2, 7):
+        queue.feed_data(Message({'e': 'trade', 'p': i}), 0)
+    assert client.queue_stats()['queued'] == 5 and client.tombstones == 1
+    # and the socket isn't read while the queue is full of them
+    assert not client.transport.reading
+    assert client.queue_stats()['paused']
+    while client.stack:
+        await asyncio.sleep(0)
+    assert client.transport.reading
+    assert [message['p'] for message in received] == [2, 3, 4, 5, 6]
+    stats = client.queue_stats()
+    assert stats['queued'] == 0
+    assert stats['dropped'] == 1
+    assert stats['coalesced'] == 1
+    assert stats['maxLag'] >= stats['lag'] >= 0
+    # the dropped tickers are skipped where they were in the queue
+    received.clear()
+    for symbol in 'CDEFGH':
+        queue.feed_data(Message({'e': 'ticker', 's': symbol, 'c': 1}), 0)
+    assert client.queue_stats()['queued'] == 4 and client.tombstones == 2
+    while client.stack:
+        await asyncio.sleep(0)
+    assert [message['s'] for message in received] == ['E', 'F', 'G', 'H']
+    assert client.tombstones == 0 and client.queue_stats()['dropped'] == 3
+    sock.close()
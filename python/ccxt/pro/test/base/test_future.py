@@ -10,19 +10,23 @@ sys.path.append(root)
 from ccxt import ExchangeClosedByUser
 from ccxt.async_support.base.ws.future import Future
 
+
 # Helper functions
 async def resolve_later(future, result, delay):
     await asyncio.sleep(delay)
     future.resolve(result)
 
+
 async def cancel_later(future, delay):
     await asyncio.sleep(delay)
     future.cancel()
 
+
 async def reject_later(future, err, delay):
     await asyncio.sleep(delay)
     future.reject(err)
 
+
 async def test_resolve_before():
     print("test_resolve")
     future = Future()
@@ -31,6 +35,7 @@ async def test_resolve_before():
     assert future.done(), "Future is not marked as done"
     assert future.result() == expected_result, f"Expected result '{expected_result}', got '{future.result()}'"
 
+
 async def test_reject():
     print("test_reject")
     future = Future()
@@ -43,6 +48,7 @@ async def test_reject():
     except Exception as e:
         assert str(e) == "test error", f"Expected 'test error', got '{str(e)}'"
 
+
 async def test_race_success_before():
     print("test_race_success")
     future1 = Future()
@@ -53,6 +59,7 @@ async def test_race_success_before():
     future2.cancel()
     assert result == "first", f"Expected 'first', got '{result}'"
 
+
 async def test_race_success_after():
     print("test_race_success")
     future1 = Future()
@@ -63,6 +70,7 @@ async def test_race_success_after():
     future2.cancel()
     assert result == "first", f"Expected 'first', got '{result}'"
 
+
 async def test_race_return_first_exception():
     print("test_race_return_first_exception")
     future1 = Future()
@@ -74,6 +82,7 @@ async def test_race_return_first_exception():
     except Exception as e:
         assert str(e) == "Error in future1", f"Expected 'Error in future1', got '{str(e)}'"
 
+
 async def test_await_canceled_future():
     print("test_await_canceled_future")
     future = Future()
@@ -84,6 +93,7 @@ async def test_await_canceled_future():
     except asyncio.CancelledError as e:
         assert isinstance(e, asyncio.CancelledError), "Expected asyncio.CancelledError"
 
+
 async def test_cancel():
     print("test_cancel")
     future = Future()
@@ -94,6 +104,7 @@ async def test_cancel():
     except asyncio.CancelledError as e:
         assert isinstance(e, asyncio.CancelledError), "Expected asyncio.CancelledError"
 
+
 async def test_race_cancel():
     print("test_race_cancel")
     try:
@@ -107,6 +118,7 @@ async def test_race_cancel():
     except asyncio.CancelledError:
         assert True
 
+
 async def test_race_mixed_outcomes():
     print("test_race_mixed_outcome")
     future1 = Future()
@@ -119,6 +131,7 @@ async def test_race_mixed_outcomes():
     task.cancel()
     future2.cancel()
 
+
 async def test_race_with_wait_for_timeout():
     print("test_race_with_wait_for_timeout")
     future1 = Future()
@@ -135,6 +148,7 @@ async def test_race_with_wait_for_timeout():
         assert True
     await task
 
+
 async def test_race_with_wait_for_completion():
     print("test_race_with_wait_for_completion")
     future1 = Future()
@@ -151,6 +165,7 @@ async def test_race_with_wait_for_completion():
         assert False, "Did not expect a timeout"
     await task
 
+
 async def test_race_with_precompleted_future():
     print("test_race_with_precompleted_future")
     future1 = Future()
@@ -161,6 +176,7 @@ async def test_race_with_precompleted_future():
     result = await race_future
     assert result == "immediate success", "Race did not correctly prioritize already completed future."
 
+
 async def test_closed_by_user():
     print("test_closed_by_user")
     future1 = Future()
@@ -178,6 +194,51 @@ async def test_closed_by_user():
     except Exception as e:
         assert False, f"Received Exception {e}"
 
+
+async def test_race_removes_callbacks():
+    print("test_race_removes_callbacks")
+    future1 = Future()
+    future2 = Future()
+    race_future = Future.race([future1, future2])
+    future1.resolve("first")
+    assert await race_future == "first"
+    # the losing future doesn't keep the race alive
+    assert not future2._callbacks
+    future3 = Future()
+    race_future = Future.race([future3])
+    race_future.cancel()
+    await asyncio.sleep(0)
+    assert not future3._callbacks
+    assert not future3.done()
+
+
+async def test_race_all_cancelled():
+    print("test_race_all_cancelled")
+    future1 = Future()
+    future2 = Future()
+    race_future = Future.race([future1, future2])
+    future1.cancel()
+    future2.cancel()
+    try:
+        await race_future
+        assert False, "Expected an ExchangeClosedByUser"
+    except ExchangeClosedByUser:
+        assert True
+
+
+async def test_race_first_cancelled():
+    print("test_race_first_cancelled")
+    future1 = Future()
+    future2 = Future()
+    race_future = Future.race([future1, future2])
+    future1.cancel()
+    await asyncio.sleep(0)
+    # rejected without waiting for the other future
+    assert race_future.done() and not future2.done()
+    assert isinstance(race_future.exception(), ExchangeClosedByUser)
+    assert not future2._callbacks
+
+
 async def test_reject_with_non_exception():
     print("test_reject_with_non_exception")
     future = Future()
@@ -189,6 +250,7 @@ async def test_reject_with_non_exception():
     except Exception as e:
         assert str(e) == "test error", f"Expected 'test error', got '{str(e)}'"
 
+
 async def test_ws_future():
     await test_resolve_before()
     await test_reject()
@@ -202,5 +264,7 @@ async def test_ws_future():
     await test_race_with_wait_for_completion()
     await test_race_with_precompleted_future()
     await test_closed_by_user()
+    await test_race_removes_callbacks()
+    await test_race_all_cancelled()
+    await test_race_first_cancelled()
     await test_reject_with_non_exception()
-
@@ -0,0 +1,119 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws import hub  # noqa: E402
+
+
+class HubExchange(Exchange):
+    id = 'hubtest'
+    timeout_on_exit = 0
+    unwatched = []
+    limits = []
+
+    async def watch_order_book(self, symbol, limit=None, params={}):
+        HubExchange.limits.append(limit)
+        if symbol not in self.orderbooks:
+            levels = [[float(i), 1.0] for i in range(1, 6)]
+            self.orderbooks[symbol] = self.order_book({'asks': levels, 'bids': levels}, limit)
+        return self.orderbooks[symbol].limit()
+
+    async def watch_trades(self, symbol, since=None, limit=None, params={}):
+        return self
+
+    async def un_watch_trades(self, symbol, params={}):
+        HubExchange.unwatched.append(symbol)
+        return True
+
+    async def watch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return self
+
+    async def un_watch_ohlcv(self, symbol, timeframe='1m', params={}):
+        HubExchange.unwatched.append(symbol + ':' + timeframe)
+        return True
+
+    async def watch_balance(self, params={}):
+        return self
+
+
+async def test_hub():
+    config = {'enableRateLimit': False, 'options': {'ws': {'hub': True}}}
+    a = HubExchange(dict(config, apiKey='a', secret='a'))
+    b = HubExchange(dict(config, apiKey='b', secret='b'))
+    other = HubExchange(dict(config, options={'ws': {'hub': 'other'}}))
+    shared = await a.watch_trades('BTC/USDT')
+    # one public instance without the credentials for both
+    assert shared is not a and shared is not b
+    assert await b.watch_trades('BTC/USDT') is shared
+    assert await b.watch_trades('ETH/USDT') is shared
+    assert not shared.apiKey and 'hub' not in shared.options['ws']
+    assert await other.watch_trades('BTC/USDT') is not shared
+    # the private methods stay on the instance
+    assert await a.watch_balance() is a
+    # unsubscribed once nobody watches it
+    await a.un_watch_trades('BTC/USDT')
+    assert HubExchange.unwatched == []
+    await b.un_watch_trades('BTC/USDT')
+    assert HubExchange.unwatched == ['BTC/USDT']
+    # the timeframe tells the subscriptions of the same symbol apart, the limit doesn't
+    await a.watch_ohlcv('BTC/USDT')
+    await b.watch_ohlcv('BTC/USDT', '5m', None, 10)
+    await a.watch_ohlcv('BTC/USDT', timeframe='5m')
+    await a.un_watch_ohlcv('BTC/USDT', '1m')
+    assert HubExchange.unwatched == ['BTC/USDT', 'BTC/USDT:1m']
+    await a.un_watch_ohlcv('BTC/USDT', timeframe='5m')
+    assert HubExchange.unwatched == ['BTC/USDT', 'BTC/USDT:1m']
+    await b.un_watch_ohlcv('BTC/USDT', '5m')
+    assert HubExchange.unwatched == ['BTC/USDT', 'BTC/USDT:1m', 'BTC/USDT:5m']
+    # the book is shared whole, the instances that ask for a limit get that many levels
+    book = await a.watch_order_book('BTC/USDT')
+    limited = await b.watch_order_book('BTC/USDT', 2)
+    assert HubExchange.limits == [None, None]
+    assert len(book['asks']) == 5 and len(limited['asks']) == 2 and len(limited['bids']) == 2
+    # the same class of book that watch_order_book returns without the hub
+    assert type(limited) is type(book) and limited['asks'] == book['asks'][:2]
+    limited_again = await b.watch_order_book('BTC/USDT', 2)
+    assert limited_again is not limited and limited_again == limited
+    assert await a.watch_order_book('BTC/USDT') is book and len(book['bids']) == 5
+    # the changes come from the shared book, the limit doesn't trim it
+    changes = await b.watch_order_book_deltas('BTC/USDT', 2)
+    assert HubExchange.limits == [None, None, None, None, None]
+    assert changes['snapshot'] and changes['asks'] == book['asks']
+    book['asks'].store(3.0, 2.0)
+    changes = await b.watch_order_book_deltas('BTC/USDT', 2)
+    assert not changes['snapshot'] and changes['asks'] == [[3.0, 2.0]] and changes['bids'] == []
+    assert a.ws_hub is b.ws_hub and a.ws_hub.exchange is shared
+    shared_hub = a.ws_hub
+    # the instances themselves, an id could be reused by an instance created after one is collected
+    assert shared_hub.watching[shared_hub.key('watch_order_book', ('BTC/USDT',), {})] == {a, b}
+    # what only the instance that closes watches is unwatched
+    await a.watch_trades('SOL/USDT')
+    await a.watch_trades('ETH/USDT')
+    await a.close()
+    assert a.ws_hub is None and shared_hub in hub.hubs[shared_hub.loop].values()
+    assert HubExchange.unwatched[3:] == ['SOL/USDT']
+    await b.close()
+    await other.close()
+    assert not any(key[0] == 'hubtest' for registry in hub.hubs.values() for key in registry)
+    # a closed instance gets a new hub
+    assert await a.watch_trades('BTC/USDT') is not shared
+    await a.close()
+
+
+async def test_hub_transport():
+    config = {'enableRateLimit': False, 'timeout': 5000, 'headers': {'X-Test': '1'}, 'options': {'ws': {'hub': True}}}
+    a = HubExchange(config)
+    b = HubExchange(config)
+    proxied = HubExchange(dict(config, wssProxy='http://localhost:8080'))
+    shared = await a.watch_trades('BTC/USDT')
+    assert await b.watch_trades('BTC/USDT') is shared
+    assert shared.timeout == 5000 and shared.headers == {'X-Test': '1'}
+    # an instance that connects another way doesn't share the connections of the others
+    other = await proxied.watch_trades('BTC/USDT')
+    assert other is not shared and other.wssProxy == 'http://localhost:8080' and shared.wssProxy is None
+    await a.close()
+    await b.close()
+    await proxied.close()
@@ -0,0 +1,45 @@
+import os
+import sys
+import json
+import math
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.base.json_decoder import DECODERS, get_decoder, decode_quoted_json  # noqa: E402
+
+
+def test_decoders_match_json():
+    messages = [
+        b'{"e":"depthUpdate","E":1700000000000,"s":"BTCUSDT","U":1,"u":2,"b":[["37000.01","0.5"]],"a":[]}',
+        '{"stream":"btcusdt@ticker","data":{"c":"37000.01","v":1234.5678,"n":42}}',
+        b'[1,2.5,"3",null,true,false,{"a":[]}]',
+    ]
+    for name in DECODERS:
+        decode = get_decoder(name)
+        for message in messages:
+            assert decode(message) == json.loads(message)
+        # more than 64 bits or NaN, rejected by some decoders and decoded again with json
+        result = decode(b'{"id":123456789012345678901234567890,"value":NaN}')
+        assert result['id'] == 123456789012345678901234567890
+        assert math.isnan(result['value'])
+    assert get_decoder() is get_decoder(None)
+
+
+def test_quoted_numbers():
+    result = decode_quoted_json('{"price":37000.01,"amount":5,"side":"buy"}')
+    assert result == {'price': '37000.01', 'amount': '5', 'side': 'buy'}
+
+
+def test_unknown_decoder():
+    try:
+        get_decoder('yaml')
+        assert False, 'expected a ValueError'
+    except ValueError:
+        pass
+
+
+def test_json_decoder():
+    test_decoders_match_json()
+    test_quoted_numbers()
+    test_unknown_decoder()
@@ -0,0 +1,101 @@
+import os
+import sys
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws.keepalive import KeepaliveWheel  # noqa: E402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: E402
+from ccxt.base.errors import RequestTimeout  # noqa: E402
+
+
+class Pinged:
+    def __init__(self, keepAlive, rounds):
+        self.keepAlive = keepAlive
+        self.rounds = rounds
+        self.pings = 0
+
+    def keepalive(self):
+        self.pings += 1
+        return self.pings < self.rounds
+
+
+async def test_keepalive_wheel():
+    wheel = KeepaliveWheel(asyncio.get_running_loop(), 10)
+    clients = [Pinged(20, 5) for i in range(200)]
+    for client in clients:
+        wheel.add(client)
+    removed = Pinged(20, 5)
+    wheel.add(removed)
+    wheel.remove(removed)
+    await asyncio.sleep(0.2)
+    assert all(client.pings == 5 for client in clients)
+    assert removed.pings == 0
+    assert len(wheel) == 0 and wheel.timer is None
+    # one wakeup per slot for all of the clients
+    assert wheel.wakeups <= 10
+
+
+async def test_keepalive_remove_while_due():
+    # the keepalive of a client closes another client of the same slot
+    wheel = KeepaliveWheel(asyncio.get_running_loop(), 10)
+    first = Pinged(20, 5)
+    second = Pinged(20, 5)
+
+    def keepalive():
+        first.pings += 1
+        wheel.remove(second)
+        return False
+
+    first.keepalive = keepalive
+    wheel.add(first)
+    wheel.add(second)
+    await asyncio.sleep(0.05)
+    assert first.pings == 1 and second.pings == 0
+    assert len(wheel) == 0 and wheel.timer is None
+
+
+async def test_keepalive_add_while_due():
+    # the keepalive of a client closes another client of the same slot and opens it again
+    wheel = KeepaliveWheel(asyncio.get_running_loop(), 10)
+    first = Pinged(20, 1)
+    second = Pinged(20, 3)
+
+    def keepalive():
+        first.pings += 1
+        wheel.remove(second)
+        wheel.add(second, 100)
+        return False
+
+    first.keepalive = keepalive
+    wheel.add(first)
+    wheel.add(second)
+    await asyncio.sleep(0.06)
+    # it waits in its new slot and gets its keepalives from there
+    assert first.pings == 1 and second.pings == 0 and second in wheel.clients
+    await asyncio.sleep(0.2)
+    assert second.pings == 3
+    assert len(wheel) == 0 and wheel.timer is None
+
+
+async def test_keepalive_timeout():
+    errors = []
+    client = AiohttpClient('wss://example.com', None, None, None, None, {
+        'asyncio_loop': asyncio.get_running_loop(),
+        'keepAlive': 1000,
+    })
+    client.on_error = errors.append
+    client.connection = type('Connection', (object,), {'closed': False})()
+    client.lastPong = 1
+    assert client.keepalive()
+    assert len(errors) == 1 and isinstance(errors[0], RequestTimeout)
+    client.connection.closed = True
+    assert not client.keepalive()
+
+
+async def test_keepalive():
+    await test_keepalive_wheel()
+    await test_keepalive_remove_while_due()
+    await test_keepalive_add_while_due()
+    await test_keepalive_timeout()
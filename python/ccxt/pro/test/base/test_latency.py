@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.fast_client import FastClient  # noqa: E402
+from ccxt.async_support.base.ws.latency import event_time  # noqa: E402
+from ccxt.pro.test.base.test_fast_client import Message, connect  # noqa: E402
+
+
+def on_message(client, message):
+    client.resolve(message, 'trade:' + message['s'])
+
+
+async def test_latency():
+    loop = asyncio.get_running_loop()
+    client = FastClient('wss://example.com', on_message, None, None, None, {
+        'asyncio_loop': loop,
+        'latency': True,
+        # without maxQueueSize nothing is conflated
+        'conflate': lambda client, message: Exchange.peek_json_string(message, 's'),
+    })
+    queue, sock = connect(client)
+    now = time.time() * 1000
+    for symbol in ['A', 'A', 'B']:
+        queue.feed_data(Message({'e': 'trade', 'E': now - 50, 's': symbol}), 0)
+    while client.stack:
+        await asyncio.sleep(0)
+    stats = client.latencies.stats()
+    assert sorted(stats) == ['trade:A', 'trade:B']
+    a = stats['trade:A']
+    assert all(a[stage]['count'] == 2 for stage in ['queue', 'decompress', 'decode', 'handler', 'total', 'exchange'])
+    assert a['total']['max'] >= a['handler']['max']
+    assert a['exchange']['min'] >= 50
+    assert client.latencies.stats('trade:B')['trade:B']['total']['count'] == 1
+    # resolved outside of a message
+    client.resolve([], 'trade:C')
+    assert 'trade:C' not in client.latencies.stats()
+    sock.close()
+    # nothing is wrapped without the option
+    plain = FastClient('wss://example.com', on_message, None, None, None, {'asyncio_loop': loop})
+    assert plain.latencies is None and 'resolve' not in plain.__dict__ and 'handle_message' not in plain.__dict__
+    exchange = Exchange({'id': 'test', 'options': {'ws': {'latency': True}}})
+    exchange.client('wss://example.com')
+    assert exchange.latency_stats() == {'wss://example.com': {}}
+    # where the exchanges put the event time
+    assert event_time({'stream': 'btcusdt@trade', 'data': {'e': 'trade', 'E': 1700000000000}}) == 1700000000000
+    assert event_time({'arg': {}, 'data': [{'ts': '1700000000000'}]}) == 1700000000000
+    assert event_time({'ts': 1700000000000000}) == 1700000000000
+    assert event_time({'result': None, 'id': 1}) is None
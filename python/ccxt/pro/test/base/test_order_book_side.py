@@ -0,0 +1,539 @@
+import os
+import sys
+import random
+import pickle
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.ws import order_book_side  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook, IndexedOrderBook, ChunkedOrderBook, BoundedOrderBook  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.base.exchange import Exchange as BaseExchange  # noqa: E402
+from ccxt.base.errors import InvalidNonce  # noqa: E402
+
+
+def random_deltas(count, levels, with_third=None):
+    deltas = []
+    for i in range(count):
+        price = random.randint(1, levels) / 10
+        size = random.choice([0, 0, random.randint(1, 100)])
+        if with_third == 'count':
+            deltas.append([price, size, random.randint(0, 3)])
+        elif with_third == 'id':
+            deltas.append([price, size, str(random.randint(1, levels))])
+        else:
+            deltas.append([price, size])
+    return deltas
+
+
+def replay(side_class, deltas, depth=None):
+    side = side_class([], depth)
+    for delta in deltas:
+        side.storeArray(list(delta))
+    return side
+
+
+def store_many(side, deltas):
+    # a bounded side asks for a new snapshot when it runs out of levels, these tests keep updating it
+    try:
+        side.store_many(deltas)
+    except InvalidNonce:
+        pass
+
+
+def test_chunked_sides_match_list_sides():
+    random.seed(1)
+    pairs = [
+        (order_book_side.Asks, order_book_side.ChunkedAsks, None),
+        (order_book_side.Bids, order_book_side.ChunkedBids, None),
+        (order_book_side.CountedAsks, order_book_side.ChunkedCountedAsks, 'count'),
+        (order_book_side.CountedBids, order_book_side.ChunkedCountedBids, 'count'),
+        (order_book_side.IndexedAsks, order_book_side.ChunkedIndexedAsks, 'id'),
+        (order_book_side.IndexedBids, order_book_side.ChunkedIndexedBids, 'id'),
+    ]
+    for list_class, chunked_class, with_third in pairs:
+        deltas = random_deltas(5000, 2000, with_third)
+        expected = replay(list_class, deltas)
+        chunked = replay(chunked_class, deltas)
+        assert len(chunked) == len(expected)
+        assert chunked == list(expected)
+        assert chunked[:10] == expected[:10]
+        assert chunked[100:300] == expected[100:300]
+        assert chunked[::7] == expected[::7]
+        assert chunked[-1] == expected[-1]
+        assert list(reversed(chunked)) == list(reversed(expected))
+        # limit trims both implementations to the same depth
+        expected._depth = chunked._depth = 50
+        expected.limit()
+        chunked.limit()
+        assert chunked == list(expected)
+        chunked.clear()
+        assert len(chunked) == 0
+        assert not chunked
+
+
+def test_store_many_matches_store_array():
+    random.seed(2)
+    for side_class, with_third in [
+        (order_book_side.Asks, None),
+        (order_book_side.Bids, None),
+        (order_book_side.CountedAsks, 'count'),
+        (order_book_side.CountedBids, 'count'),
+        (order_book_side.IndexedBids, 'id'),
+        (order_book_side.ChunkedAsks, None),
+    ]:
+        snapshot = random_deltas(500, 1000, with_third)
+        expected = replay(side_class, snapshot)
+        merged = side_class(snapshot)
+        assert merged == list(expected)
+        for _ in range(50):
+            batch = random_deltas(random.randint(0, 100), 1000, with_third)
+            for delta in batch:
+                expected.storeArray(list(delta))
+            merged.store_many([list(delta) for delta in batch])
+            assert merged == list(expected)
+
+
+def test_handle_deltas_with_keys():
+    # the async override merges a whole array at once, the result must stay the one of the transpiled loop
+    random.seed(3)
+    exchange = Exchange({'id': 'test'})
+    for side_class, with_third in [
+        (order_book_side.Asks, None),
+        (order_book_side.Bids, None),
+        (order_book_side.CountedBids, 'count'),
+    ]:
+        expected = side_class([])
+        merged = side_class([])
+        for _ in range(50):
+            batch = [[str(price), str(size)] + rest for price, size, *rest in random_deltas(random.randint(0, 50), 500, with_third)]
+            BaseExchange.handle_deltas_with_keys(exchange, expected, batch)
+            exchange.handle_deltas_with_keys(merged, batch)
+            assert merged == list(expected)
+    # values that don't convert go through parse_bid_ask
+    expected = order_book_side.Asks([])
+    merged = order_book_side.Asks([])
+    batch = [['1.5', '2'], ['2.5', '3'], ['2.5', None]]
+    BaseExchange.handle_deltas_with_keys(exchange, expected, batch)
+    exchange.handle_deltas_with_keys(merged, batch)
+    assert merged == list(expected)
+    # levels given as dicts (gate swap) and levels with more entries than are stored (okx)
+    for batch, keys in [
+        ([{'p': '1.5', 's': '2'}, {'p': '2.5', 's': '0'}, {'p': '3', 's': '1'}], ['p', 's']),
+        ([['1.5', '2', '0', '3'], ['2.5', '1', '0', '1'], ['3', '0', '0', '0']], [0, 1, 4]),
+    ]:
+        expected = order_book_side.Asks([])
+        merged = order_book_side.Asks([])
+        BaseExchange.handle_deltas_with_keys(exchange, expected, batch, *keys)
+        exchange.handle_deltas_with_keys(merged, batch, *keys)
+        assert merged == list(expected) and len(merged) == 2
+
+
+def test_indexed_same_price_queue():
+    for side_class in [order_book_side.IndexedBids, order_book_side.ChunkedIndexedBids]:
+        side = side_class([[10.0, 1.0, str(i).zfill(4)] for i in range(500)])
+        # amend an order in the middle of the queue without a price
+        side.store(None, 7.0, '0250')
+        assert side[250] == [10.0, 7.0, '0250']
+        # move it to a better price
+        side.store(11.0, 7.0, '0250')
+        assert side[0] == [11.0, 7.0, '0250']
+        assert side[251] == [10.0, 1.0, '0251']
+        # delete an order by id
+        side.store(10.0, 0, '0100')
+        assert len(side) == 499
+        assert side[101] == [10.0, 1.0, '0101']
+        assert '0100' not in side._hashmap
+
+
+def test_top_strings():
+    for side_class in [order_book_side.Asks, order_book_side.ChunkedAsks]:
+        side = side_class([], 3)
+        for price in ['1.10', '1.20', '1.30', '1.40']:
+            side.store_string_array([float(price), 1.0], [price, '1.0'])
+        top = side.top_strings(2)
+        assert top == ['1.10', '1.0', '1.20', '1.0']
+        # a change below the top levels keeps the cached list
+        side.store_string_array([1.40, 2.0], ['1.40', '2.0'])
+        assert side.top_strings(2) is top
+        # a change within the top levels rebuilds it
+        side.store_string_array([1.15, 5.0], ['1.15', '5.0'])
+        assert side.top_strings(2) == ['1.10', '1.0', '1.15', '5.0']
+        side.store_string_array([1.10, 0.0], ['1.10', '0'])
+        assert side.top_strings(2) == ['1.15', '5.0', '1.20', '1.0']
+        # levels trimmed by limit() drop their strings too
+        side.limit()
+        assert side.top_strings(5) == ['1.15', '5.0', '1.20', '1.0', '1.30', '1.0']
+        assert float('1.40') not in side._strings
+        side.clear()
+        assert side.top_strings(2) == []
+
+
+def test_bounded_sides():
+    side = order_book_side.BoundedBids([[float(price), 1.0] for price in range(1, 11)], 3, 2)
+    assert side == [[10.0, 1.0], [9.0, 1.0], [8.0, 1.0]]
+    assert side._spill_index == [-7.0, -6.0]
+    # levels deeper than depth + spill are never stored
+    side.store(2.0, 5.0)
+    assert len(side) + len(side._spill_levels) == 5
+    # removing a level refills the side from the spill buffer
+    side.store(9.0, 0)
+    assert side == [[10.0, 1.0], [8.0, 1.0], [7.0, 1.0]]
+    # a level entering the top pushes the last one into the spill buffer
+    side.store(9.5, 2.0)
+    assert side == [[10.0, 1.0], [9.5, 2.0], [8.0, 1.0]]
+    assert side._spill_levels == [[7.0, 1.0], [6.0, 1.0]]
+    # updates within the spill buffer
+    side.store(6.0, 3.0)
+    assert side._spill_levels == [[7.0, 1.0], [6.0, 3.0]]
+    # the levels behind a dropped one are refused until the side is cleared
+    side = order_book_side.BoundedAsks([], 2, 1)
+    side.storeMany([[1.0, 1.0], [2.0, 1.0], [3.0, 1.0], [4.0, 1.0]])
+    side.store(3.0, 0)
+    side.store(5.0, 1.0)
+    assert side == [[1.0, 1.0], [2.0, 1.0]] and side._spill_levels == []
+    side.store(4.0, 2.0)
+    assert side._spill_levels == [[4.0, 2.0]]
+    side.clear()
+    side.storeMany([[1.0, 1.0], [5.0, 1.0]])
+    assert side == [[1.0, 1.0], [5.0, 1.0]]
+    # a side that drains below its depth after levels were dropped asks for a new snapshot
+    side = order_book_side.BoundedAsks([], 3, 1)
+    side.storeMany([[float(price), 1.0] for price in range(1, 6)])
+    side.store(1.0, 0)
+    assert side == [[2.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+    try:
+        side.store(2.0, 0)
+        assert False, 'expected an InvalidNonce'
+    except InvalidNonce:
+        pass
+    # and takes the levels again in case the handler doesn't fetch one
+    side.storeMany([[3.0, 0], [4.0, 0], [6.0, 1.0], [7.0, 1.0], [8.0, 1.0]])
+    assert side == [[6.0, 1.0], [7.0, 1.0], [8.0, 1.0]]
+    # a batch is stored whole before it raises
+    side = order_book_side.BoundedBids([[float(price), 1.0] for price in range(1, 6)], 2, 0)
+    try:
+        side.storeMany([[5.0, 0], [3.0, 2.0]])
+        assert False, 'expected an InvalidNonce'
+    except InvalidNonce:
+        pass
+    assert side == [[4.0, 1.0], [3.0, 2.0]]
+    # only the strings of the levels that are kept are stored
+    side = order_book_side.BoundedAsks([], 3, 2)
+    for price in range(1, 101):
+        side.storeStringArray([float(price), 1.0], [str(price), '1'])
+        assert len(side._strings) <= 5
+    for price in range(1, 101):
+        try:
+            side.storeStringArray([float(price), 0], [str(price), '0'])
+        except InvalidNonce:
+            pass
+    assert len(side._strings) == 0
+    assert side.top_strings(3) == []
+    # the top matches an unbounded side as long as the spill buffer holds out
+    random.seed(3)
+    for bounded_class, list_class, with_third in [
+        (order_book_side.BoundedAsks, order_book_side.Asks, None),
+        (order_book_side.BoundedCountedBids, order_book_side.CountedBids, 'count'),
+    ]:
+        deltas = random_deltas(3000, 200, with_third)
+        bounded = bounded_class([], 10, 200)
+        for delta in deltas:
+            bounded.storeArray(list(delta))
+        expected = replay(list_class, deltas)
+        assert bounded == expected[:10]
+
+
+def test_negative_step_slices():
+    side = order_book_side.Asks([[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+    assert side[::-1] == [[3.0, 3.0], [2.0, 2.0], [1.0, 1.0]]
+    assert side[2:0:-1] == [[3.0, 3.0], [2.0, 2.0]]
+    # only the levels within the depth of a limited side are sliced
+    side = order_book_side.Bids([[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]], 2)
+    side.limit()
+    assert side[::-1] == [[2.0, 2.0], [3.0, 3.0]]
+    assert side[::-2] == [[2.0, 2.0]]
+
+
+def test_chunked_index_errors():
+    side = order_book_side.ChunkedAsks([[1.0, 1.0]])
+    assert side[0] == [1.0, 1.0]
+    assert side[-1] == [1.0, 1.0]
+    try:
+        side[1]
+        assert False, 'expected an IndexError'
+    except IndexError:
+        pass
+
+
+def test_chunked_list_api():
+    # the chunked sides answer the list methods like the list sides
+    deltas = random_deltas(3000, 2000)
+    side = replay(order_book_side.ChunkedBids, deltas)
+    levels = list(replay(order_book_side.Bids, deltas))
+    middle = len(levels) // 2
+    assert side.copy() == levels and side + [] == levels and [] + side == levels
+    assert side * 2 == levels * 2
+    assert levels[middle] in side and [0.05, 1.0] not in side
+    assert side.index(levels[middle]) == middle and side.count(levels[middle]) == 1
+    assert side == levels and not (side != levels) and side[10:20] == levels[10:20]
+    assert repr(side) == repr(levels)
+    copy = pickle.loads(pickle.dumps(side))
+    assert copy == levels and type(copy) is type(side)
+    try:
+        side.append([1.0, 1.0])
+        assert False, 'expected a TypeError'
+    except TypeError:
+        pass
+
+
+def brute_cumulative_amount(side, price):
+    return sum(level[1] for level in side if (level[0] >= price if side.side else level[0] <= price))
+
+
+def brute_cost_to_fill(side, amount):
+    cost = 0
+    for level in side:
+        taken = min(level[1], amount)
+        cost += taken * level[0]
+        amount -= taken
+        if amount <= 0:
+            return cost
+    return None
+
+
+def test_analytics():
+    random.seed(4)
+    for side_class, with_third in [
+        (order_book_side.Asks, None),
+        (order_book_side.Bids, None),
+        (order_book_side.CountedBids, 'count'),
+        (order_book_side.IndexedAsks, 'id'),
+        (order_book_side.ChunkedBids, None),
+        (order_book_side.ChunkedIndexedBids, 'id'),
+        (order_book_side.BoundedAsks, None),
+    ]:
+        side = side_class(random_deltas(300, 500, with_third), 100)
+        for _ in range(200):
+            store_many(side, random_deltas(random.randint(1, 20), 500, with_third))
+            price = random.randint(1, 500) / 10
+            assert abs(side.cumulative_amount(price) - brute_cumulative_amount(side, price)) < 1e-6
+            amount = random.randint(1, 3000)
+            expected = brute_cost_to_fill(side, amount)
+            cost = side.cost_to_fill(amount)
+            if expected is None:
+                assert cost is None
+            else:
+                assert abs(cost - expected) < 1e-6
+                assert abs(side.average_fill_price(amount) - expected / amount) < 1e-6
+            assert side.best() == (side[0] if len(side) else None)
+        side.clear()
+        assert side.best() is None
+        assert side.cumulative_amount(10.0) == 0
+        assert side.cost_to_fill(1) is None
+
+
+def test_snapshot():
+    random.seed(5)
+    for side_class, with_third in [
+        (order_book_side.Asks, None),
+        (order_book_side.CountedBids, 'count'),
+        (order_book_side.IndexedBids, 'id'),
+        (order_book_side.ChunkedAsks, None),
+        (order_book_side.BoundedCountedBids, 'count'),
+    ]:
+        side = side_class(random_deltas(300, 500, with_third), 100)
+        snapshot = side.snapshot()
+        limited = side.snapshot(10)
+        expected = [list(level) for level in side]
+        top = side[0]
+        for _ in range(50):
+            store_many(side, random_deltas(20, 500, with_third))
+            side.storeArray(list(top[:1]) + [0] + list(top[2:]))
+        # a snapshot is not changed by later stores, its levels are copies
+        assert [list(level) for level in snapshot] == expected
+        assert [list(level) for level in limited] == expected[:10]
+        assert snapshot[0] is not top and isinstance(snapshot[0], tuple)
+        assert side.snapshot() == tuple(tuple(level) for level in side)
+
+
+def test_limited_books():
+    random.seed(9)
+    for book_class, with_third in [
+        (OrderBook, None),
+        (CountedOrderBook, 'count'),
+        (IndexedOrderBook, 'id'),
+        (ChunkedOrderBook, None),
+        (BoundedOrderBook, None),
+    ]:
+        book = book_class({
+            'asks': random_deltas(100, 500, with_third),
+            'bids': random_deltas(100, 500, with_third),
+            'symbol': 'BTC/USDT',
+        })
+        limited = book.limited(5)
+        # a book of the same class with the first levels, that stores of the book don't change
+        assert type(limited) is book_class and limited['symbol'] == 'BTC/USDT'
+        assert limited['asks'] == book['asks'][:5] and limited['bids'] == book['bids'][:5]
+        expected = [list(level) for level in limited['asks']]
+        book['asks'].storeArray(list(book['asks'][0][:1]) + [0] + list(book['asks'][0][2:]))
+        assert limited['asks'] == expected
+        assert book.limited()['asks'] == book['asks']
+
+
+def test_ticks():
+    random.seed(6)
+    for side_class, with_third in [
+        (order_book_side.Asks, None),
+        (order_book_side.Bids, None),
+        (order_book_side.CountedBids, 'count'),
+        (order_book_side.IndexedAsks, 'id'),
+        (order_book_side.ChunkedBids, None),
+        (order_book_side.ChunkedIndexedBids, 'id'),
+        (order_book_side.BoundedAsks, None),
+    ]:
+        snapshot = random_deltas(300, 500, with_third)
+        expected = side_class(snapshot, 100)
+        ticked = side_class(snapshot, 100)
+        ticked.set_tick(0.1)
+        assert ticked == expected
+        for _ in range(50):
+            batch = random_deltas(20, 500, with_third)
+            store_many(expected, [list(delta) for delta in batch])
+            store_many(ticked, [list(delta) for delta in batch])
+            assert ticked == expected
+        assert ticked.cumulative_amount(25.0) == expected.cumulative_amount(25.0)
+    # a price that differs from the stored one by a rounding error still matches it
+    side = order_book_side.Asks([[0.3, 1.0]])
+    side.set_tick(0.1)
+    side.store(0.1 + 0.2, 0)
+    assert len(side) == 0
+    # the strings of the levels are kept when the side is keyed again
+    side = order_book_side.Bids()
+    side.store_string_array([1.5, 2.0], ['1.5', '2'])
+    side.set_tick(0.5)
+    assert side.top_strings(1) == ['1.5', '2']
+    assert side._index == [-3]
+
+
+def test_changes():
+    random.seed(7)
+    for side_class, with_third in [
+        (order_book_side.Asks, None),
+        (order_book_side.Bids, None),
+        (order_book_side.CountedBids, 'count'),
+        (order_book_side.IndexedAsks, 'id'),
+        (order_book_side.ChunkedBids, None),
+        (order_book_side.ChunkedIndexedBids, 'id'),
+        (order_book_side.BoundedAsks, None),
+    ]:
+        side = side_class([], 50)
+        store_many(side, random_deltas(300, 500, with_third))
+        assert side.getChanges() is None
+        # a copy of the side kept up to date with the changes only
+        copy = {}
+        for level in side:
+            copy[side._level_key(level)] = level
+        for _ in range(100):
+            for _ in range(random.randint(1, 3)):
+                store_many(side, random_deltas(random.randint(1, 30), 500, with_third))
+            side.limit()
+            for level in side.getChanges():
+                if level[1]:
+                    copy[side._level_key(level)] = level
+                else:
+                    copy.pop(side._level_key(level), None)
+            assert sorted(copy.values(), key=str) == sorted(side, key=str)
+        side.clear()
+        assert side.getChanges() is None
+
+
+def test_changes_per_consumer():
+    # every consumer keeps its own copy up to date whatever the order of the calls
+    random.seed(8)
+
+    class Consumer:
+        pass
+
+    for side_class, with_third in [
+        (order_book_side.Bids, None),
+        (order_book_side.IndexedAsks, 'id'),
+        (order_book_side.ChunkedBids, None),
+    ]:
+        side = side_class(random_deltas(300, 500, with_third), 50)
+        consumers = [Consumer() for _ in range(3)]
+        copies = [None] * len(consumers)
+        for _ in range(100):
+            side.store_many(random_deltas(random.randint(1, 30), 500, with_third))
+            side.limit()
+            for i in random.sample(range(len(consumers)), random.randint(1, len(consumers))):
+                changes = side.getChanges(consumers[i])
+                if changes is None:
+                    copies[i] = dict((side._level_key(level), level) for level in side)
+                    continue
+                for level in changes:
+                    if level[1]:
+                        copies[i][side._level_key(level)] = level
+                    else:
+                        copies[i].pop(side._level_key(level), None)
+        for i, consumer in enumerate(consumers):
+            changes = side.getChanges(consumer)
+            if changes is None:
+                continue
+            for level in changes:
+                if level[1]:
+                    copies[i][side._level_key(level)] = level
+                else:
+                    copies[i].pop(side._level_key(level), None)
+            assert sorted(copies[i].values(), key=str) == sorted(side, key=str)
+        side.clear()
+        assert all(side.getChanges(consumer) is None for consumer in consumers)
+
+
+def brute_aggregate(side):
+    totals = {}
+    for order in side:
+        totals[order[0]] = totals.get(order[0], 0) + order[1]
+    return sorted(totals.items(), reverse=side.side)
+
+
+def test_aggregated():
+    random.seed(8)
+    for side_class in [order_book_side.IndexedAsks, order_book_side.IndexedBids, order_book_side.ChunkedIndexedBids]:
+        side = side_class(random_deltas(300, 50, 'id'), 200)
+        l2 = side.aggregated()
+        for _ in range(100):
+            side.store_many(random_deltas(random.randint(1, 30), 50, 'id'))
+            # amend without a price
+            if len(side):
+                order = side[random.randint(0, len(side) - 1)]
+                side.store(None, random.randint(1, 100), order[2])
+            side.limit()
+            expected = brute_aggregate(side)
+            assert [level[0] for level in l2] == [price for price, total in expected]
+            assert all(abs(level[1] - total) < 1e-9 for level, (price, total) in zip(l2, expected))
+        side.clear()
+        assert len(l2) == 0
+        side.store(1.0, 2.0, 'a')
+        side.store(1.0, 3.0, 'b')
+        assert l2 == [[1.0, 5.0]]
+
+
+def test_ws_order_book_side():
+    test_chunked_sides_match_list_sides()
+    test_store_many_matches_store_array()
+    test_handle_deltas_with_keys()
+    test_indexed_same_price_queue()
+    test_top_strings()
+    test_bounded_sides()
+    test_negative_step_slices()
+    test_chunked_index_errors()
+    test_chunked_list_api()
+    test_analytics()
+    test_snapshot()
+    test_limited_books()
+    test_ticks()
+    test_changes()
+    test_changes_per_consumer()
+    test_aggregated()
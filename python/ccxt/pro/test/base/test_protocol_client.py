@@ -0,0 +1,131 @@
+import os
+import ssl
+import sys
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+from ccxt.async_support.base.ws.protocol_client import ProtocolClient, WebSocketProtocol, mask  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.base.errors import NetworkError  # noqa: E402
+
+
+class Received:
+    def __init__(self):
+        self.messages = []
+        self.errors = []
+        self.closes = []
+
+
+def client_for(url, received, options={}):
+    config = {'asyncio_loop': asyncio.get_running_loop(), 'keepAlive': False}
+    config.update(options)
+    return ProtocolClient(url, lambda client, message: received.messages.append(message),
+                          lambda client, error: received.errors.append(error),
+                          lambda client, code: received.closes.append(code),
+                          lambda client: None, config)
+
+
+async def wait_until(condition):
+    for i in range(1000):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+    assert False, 'timed out'
+
+
+async def test_protocol_frames():
+    # fragments, masked frames and 16 bit lengths straight through the parser
+    delivered = []
+    client = type('Client', (object,), {})()
+    client.handle_message = delivered.append
+    protocol = WebSocketProtocol(client, 'example.com', '/', None)
+    protocol.receiving = True
+    client.connection = protocol
+    long = b'{"a":"' + b'x' * 300 + b'"}'
+    key = b'\x01\x02\x03\x04'
+    data = bytes([0x01, 3]) + b'{"a' + bytes([0x80, 0x80 | 5]) + key + mask(b'":1}\n', key)
+    data += bytes([0x82, 126]) + len(long).to_bytes(2, 'big') + long
+    # the long frame comes in two parts, the last one doesn't end
+    protocol.receive_frames(data[:100])
+    protocol.receive_frames(data[100:] + bytes([0x81, 10]) + b'{"b":')
+    assert [message.data for message in delivered] == [b'{"a":1}\n', long]
+    assert len(protocol.buffer) == 7
+
+
+async def test_protocol_connection():
+    sockets = []
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        sockets.append(ws)
+        await ws.send_str('{"e":"trade","p":"1"}')
+        await ws.send_bytes(b'\x00\x01')
+        async for message in ws:
+            if message.type == aiohttp.WSMsgType.TEXT:
+                if message.data == 'close':
+                    await ws.close()
+                elif message.data == 'drop':
+                    request.transport.abort()
+                else:
+                    await ws.send_str(message.data)
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/ws', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = 'ws://127.0.0.1:' + str(port) + '/ws'
+    session = aiohttp.ClientSession()
+    try:
+        received = Received()
+        client = client_for(url, received)
+        await client.connect(session)
+        await client.send({'method': 'SUBSCRIBE', 'params': ['x' * 200]})
+        await wait_until(lambda: len(received.messages) == 3)
+        assert received.messages[0] == {'e': 'trade', 'p': '1'}
+        assert received.messages[1] == '\x00\x01'
+        assert received.messages[2] == {'method': 'SUBSCRIBE', 'params': ['x' * 200]}
+        await client.connection.ping(b'1')
+        await wait_until(lambda: client.lastPong is not None)
+        # closed by the server
+        await client.send('close')
+        await wait_until(lambda: len(received.closes) == 1)
+        assert received.closes[0] == 1000
+        # lost without a close frame
+        received = Received()
+        client = client_for(url, received)
+        await client.connect(session)
+        await client.send('drop')
+        await wait_until(lambda: len(received.errors) == 1)
+        assert isinstance(received.errors[0], NetworkError)
+        # closed by the user
+        received = Received()
+        client = client_for(url, received)
+        await client.connect(session)
+        await wait_until(lambda: len(received.messages) == 2)
+        await client.close()
+        await asyncio.sleep(0.01)
+        assert client.closed() and not received.errors
+    finally:
+        await session.close()
+        await runner.cleanup()
+
+
+async def test_protocol_client():
+    exchange = Exchange({'id': 'test', 'options': {'ws': {'client': 'protocol'}}})
+    client = exchange.client('wss://example.com')
+    assert isinstance(client, ProtocolClient)
+    # the certificates and the verify setting of the exchange, like its session
+    assert client.create_ssl_context() is exchange.ssl_context
+    unverified = Exchange({'id': 'test', 'verify': False, 'options': {'ws': {'client': 'protocol'}}})
+    assert unverified.client('wss://example.com').create_ssl_context().verify_mode == ssl.CERT_NONE
+    await test_protocol_frames()
+    await test_protocol_connection()
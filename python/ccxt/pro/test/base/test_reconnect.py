@@ -0,0 +1,179 @@
+import os
+import sys
+import socket
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.base.errors import NetworkError, ExchangeClosedByUser  # noqa: E402
+
+
+class Fake:
+    # stands in for the aiohttp connection that FastClient.receive_loop takes over
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+
+async def nothing(*args):
+    pass
+
+
+def fake_connections(client, sent, readers):
+    async def create_connection(session):
+        sock = socket.socket()
+        reader = Fake(parse_frame=lambda buf: None, queue=Fake())
+        transport = Fake(get_extra_info=lambda name: sock, abort=sock.close)
+        readers.append(reader)
+
+        async def send_str(message):
+            sent.append(message)
+
+        return Fake(
+            closed=False, _closed=False, _close_code=1006, _cancel_heartbeat=lambda: None,
+            _writer=Fake(close=nothing), _response=Fake(close=lambda: None), send_str=send_str,
+            _conn=Fake(closed=False, transport=transport, protocol=Fake(_payload_parser=reader)))
+
+    client.create_connection = create_connection
+
+
+async def wait_until(condition):
+    for i in range(1000):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+    assert False, 'timed out'
+
+
+async def test_reconnect():
+    exchange = Exchange({'id': 'test', 'apiKey': 'key', 'enableRateLimit': False, 'options': {'ws': {'reconnect': True, 'reconnectDelay': 10, 'keepAlive': False}}})
+    url = 'wss://example.com'
+    client = exchange.client(url)
+    sent = []
+    readers = []
+    fake_connections(client, sent, readers)
+    try:
+        future = exchange.watch(url, 'trades', {'subscribe': 'trades'}, 'trades')
+        await wait_until(lambda: len(sent) == 1)
+        # the connection is lost, the future waits for the connection that replaces it
+        readers[-1].queue.feed_eof()
+        assert client.reconnecting
+        assert not future.done()
+        await wait_until(lambda: len(sent) == 2)
+        assert sent[1] == sent[0]
+        assert exchange.clients[url] is client
+        client.resolve('trade', 'trades')
+        assert (await future) == 'trade'
+        stats = client.reconnect_stats()
+        assert stats['reconnects'] == 1
+        assert stats['attempts'] == 0
+        assert not stats['reconnecting']
+        assert stats['downtime'] >= 0
+        assert stats['lastDisconnect'] is None
+        # an unsubscribed subscription isn't sent again
+        ticker = exchange.watch(url, 'ticker', {'subscribe': 'ticker'}, 'ticker')
+        await wait_until(lambda: len(sent) == 3)
+        del client.subscriptions['ticker']
+        readers[-1].queue.feed_eof()
+        await wait_until(lambda: len(sent) == 4)
+        await asyncio.sleep(0.05)
+        assert len(sent) == 4 and 'ticker' not in client.replay
+        assert client.reconnect_stats()['reconnects'] == 2
+        # a request with the api key turns reconnecting off for the connection
+        order = exchange.watch(url, 'order', {'id': 1, 'apiKey': 'key'}, 'order')
+        await wait_until(lambda: len(sent) == 5)
+        assert not client.reconnect
+        readers[-1].queue.feed_eof()
+        try:
+            await order
+            assert False
+        except NetworkError:
+            pass
+        assert isinstance(ticker.exception(), NetworkError)
+        assert url not in exchange.clients
+    finally:
+        await exchange.close()
+
+
+class LoginExchange(Exchange):
+    url = 'wss://example.com/private'
+
+    async def authenticate(self, params={}):
+        # logs in with a message that has nothing that looks signed, like okx and bitget
+        client = self.client(self.url)
+        future = client.future('authenticated')
+        if 'authenticated' not in client.subscriptions:
+            self.watch(self.url, 'authenticated', {'op': 'login'}, 'authenticated')
+            future.resolve(True)
+        return await future
+
+
+async def test_reconnect_private():
+    exchange = LoginExchange({'id': 'test', 'enableRateLimit': False, 'options': {'ws': {'reconnect': True, 'reconnectDelay': 10, 'keepAlive': False}}})
+    url = 'wss://example.com'
+    sent = []
+    readers = []
+    public = exchange.client(url)
+    fake_connections(public, sent, readers)
+    private = exchange.client(exchange.url)
+    fake_connections(private, sent, readers)
+    try:
+        # the connection of the login is private, a public watch that comes next in the task isn't
+        assert await exchange.authenticate()
+        trades = exchange.watch(url, 'trades', {'subscribe': 'trades'}, 'trades')
+        await wait_until(lambda: len(sent) == 2)
+        assert public.reconnect and 'trades' in public.replay
+        assert not private.reconnect and private.replay == {}
+        # what watch_orders does, with the login already done
+        assert await exchange.authenticate()
+        orders = exchange.watch(exchange.url, 'orders', {'op': 'subscribe', 'channel': 'orders'}, 'orders')
+        await wait_until(lambda: len(sent) == 3)
+        assert sent == ['{"op":"login"}', '{"subscribe":"trades"}', '{"op":"subscribe","channel":"orders"}']
+        # the subscription after the login isn't sent again on a new connection that didn't log in
+        assert not private.reconnect and private.replay == {}
+        assert public.reconnect and 'trades' in public.replay
+        readers[0].queue.feed_eof()
+        try:
+            await orders
+            assert False
+        except NetworkError:
+            pass
+        assert exchange.url not in exchange.clients
+        assert not trades.done()
+    finally:
+        await exchange.close()
+    assert isinstance(trades.exception(), ExchangeClosedByUser)
+
+
+class TokenExchange(Exchange):
+    async def authenticate(self, params={}):
+        # gets a token over rest that goes in the url, like binance
+        self.options['listenKey'] = 'token'
+        return self.options['listenKey']
+
+    async def watch_balance(self, params={}):
+        token = await self.authenticate()
+        # the future itself, so that the test goes on in the same task
+        return self.watch('wss://example.com/' + token, 'balance', {'subscribe': 'balance'}, 'balance')
+
+
+async def test_reconnect_token():
+    exchange = TokenExchange({'id': 'test', 'enableRateLimit': False, 'options': {'ws': {'reconnect': True, 'reconnectDelay': 10, 'keepAlive': False}}})
+    url = 'wss://example.com'
+    try:
+        # an authenticate that uses no connection makes the next watch of the same watch method private
+        balance = await exchange.watch_balance()
+        assert not exchange.client(url + '/token').reconnect
+        # a public watch after the private one in the same task isn't private
+        trades = exchange.watch(url, 'trades', {'subscribe': 'trades'}, 'trades')
+        assert exchange.client(url).reconnect
+        # nor one after an authenticate called outside of a watch method
+        await exchange.authenticate()
+        tickers = exchange.watch(url + '/tickers', 'tickers', {'subscribe': 'tickers'}, 'tickers')
+        assert exchange.client(url + '/tickers').reconnect
+    finally:
+        await exchange.close()
+    assert isinstance(balance.exception(), ExchangeClosedByUser)
+    assert isinstance(trades.exception(), ExchangeClosedByUser)
+    assert isinstance(tickers.exception(), ExchangeClosedByUser)
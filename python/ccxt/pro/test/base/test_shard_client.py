@@ -0,0 +1,70 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+def subscribe(exchange, hash, subscription=True):
+    client = exchange.shard_client(url, [hash], [hash], subscription)
+    client.subscriptions[hash] = subscription
+    return client
+
+
+def test_single_connection():
+    exchange = Exchange()
+    clients = [subscribe(exchange, 'ticker:' + str(i)) for i in range(5)]
+    assert all(client is clients[0] for client in clients)
+    assert list(exchange.clients.keys()) == [url]
+
+
+def test_shards():
+    exchange = Exchange({'options': {'ws': {'maxSubscriptionsPerConnection': 2}}})
+    clients = [subscribe(exchange, 'ticker:' + str(i)) for i in range(5)]
+    assert list(exchange.clients.keys()) == [url, url + '#1', url + '#2']
+    assert [client.key for client in clients] == [url, url, url + '#1', url + '#1', url + '#2']
+    assert all(client.url == url for client in clients)
+    # the same subscription stays on its connection
+    assert exchange.shard_client(url, ['ticker:2'], ['ticker:2']) is clients[2]
+    # and so does a watch without a subscription
+    clients[4].future('trades')
+    assert exchange.shard_client(url, ['trades']) is clients[4]
+    # an unsubscription finds the connection by the subMessageHashes
+    unsubscription = {'subMessageHashes': ['ticker:3']}
+    assert exchange.shard_client(url, ['unsubscribe:ticker:3'], ['unsubscribe:ticker:3'], unsubscription) is clients[3]
+    # a closed connection is opened again and takes the next subscriptions
+    del clients[0].subscriptions['ticker:0']
+    del exchange.clients[url + '#1']
+    assert subscribe(exchange, 'ticker:5') is clients[0]
+    assert subscribe(exchange, 'ticker:6') is clients[4]
+    assert subscribe(exchange, 'ticker:7').key == url + '#1'
+
+
+def test_private_watch():
+    exchange = Exchange({'options': {'ws': {'maxSubscriptionsPerConnection': 1}}})
+    public = [subscribe(exchange, 'ticker:' + str(i)) for i in range(3)]
+    assert [client.key for client in public] == [url, url + '#1', url + '#2']
+    # authenticate logs in on client(url), the private subscriptions go to that
+    # connection even when it is full instead of to a new one that didn't log in
+    authenticated = exchange.client(url)
+    authenticated.subscriptions['authenticated'] = True
+    assert subscribe(exchange, 'orders') is authenticated
+    assert subscribe(exchange, 'myTrades') is authenticated
+    assert list(exchange.clients.keys()) == [url, url + '#1', url + '#2']
+    # the public subscriptions stay on their connections
+    assert exchange.shard_client(url, ['ticker:2'], ['ticker:2']) is public[2]
+    # the other urls are still spread
+    other = 'wss://example.com/public'
+    assert exchange.shard_client(other, ['ticker:0'], ['ticker:0']).key == other
+    exchange.clients[other].subscriptions['ticker:0'] = True
+    assert exchange.shard_client(other, ['ticker:1'], ['ticker:1']).key == other + '#1'
+
+
+def test_shard_client():
+    test_single_connection()
+    test_shards()
+    test_private_watch()
@@ -0,0 +1,192 @@
+import os
+import sys
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.base.errors import ExchangeError  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook  # noqa: E402
+from ccxt.async_support.base.ws.stream import Stream  # noqa: E402
+from ccxt.pro.test.base.ws_replay import FEEDS, ReplayServer, exchange_for  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+class StreamExchange(Exchange):
+    calls = 0
+
+    async def authenticate(self):
+        client = self.client(url)
+        future = client.future('authenticated')
+        if 'authenticated' not in client.subscriptions:
+            self.watch(url, 'authenticated', None, 'authenticated')
+            # stays resolved like in the exchanges
+            future.resolve(True)
+        return await future
+
+    async def watch_ticker(self, symbol, params={}):
+        StreamExchange.calls += 1
+        await self.authenticate()
+        return await self.watch(url, 'ticker:' + symbol, None, 'ticker:' + symbol)
+
+    async def watch_trades(self, symbol, since=None, limit=None, params={}):
+        trades = await self.watch(url, 'trades:' + symbol, None, 'trades:' + symbol)
+        if self.newUpdates:
+            limit = trades.getLimit(symbol, limit)
+        return self.filter_by_since_limit(trades, since, limit, 'timestamp', True)
+
+    async def watch_tickers(self, symbols=None, params={}):
+        message_hashes = ['ticker:' + symbol for symbol in symbols]
+        return await self.watch_multiple(url, message_hashes, None, message_hashes)
+
+
+async def test_stream_ticker():
+    exchange = StreamExchange({'id': 'test'})
+    client = exchange.client(url)
+    client.connected.resolve(url)
+    stream = exchange.stream_ticker('BTC/USDT')
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    client.resolve({'last': 1}, 'ticker:BTC/USDT')
+    assert await first == {'last': 1}
+    # after the first update they are queued and read without calling the watch method
+    client.resolve({'last': 2}, 'ticker:BTC/USDT')
+    client.resolve({'last': 3}, 'ticker:BTC/USDT')
+    queue = client.streams['ticker:BTC/USDT'][0]
+    assert await stream.__anext__() == {'last': 2}
+    assert 'ticker:BTC/USDT' not in client.futures and queue.waiter is None
+    assert await stream.__anext__() == {'last': 3}
+    # a future only waits for an update when the queue is empty
+    following = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    assert queue.waiter is not None
+    client.resolve({'last': 4}, 'ticker:BTC/USDT')
+    assert await following == {'last': 4}
+    assert StreamExchange.calls == 1
+    # every resolve is an update, also of the same object
+    ticker = {'last': 5}
+    client.resolve(ticker, 'ticker:BTC/USDT')
+    client.resolve(ticker, 'ticker:BTC/USDT')
+    assert await stream.__anext__() is ticker
+    assert await stream.__anext__() is ticker
+    assert len(queue.queue) == 0
+    # a watch call of its own still gets a future from the client
+    future = exchange.watch(url, 'ticker:BTC/USDT', None, 'ticker:BTC/USDT')
+    client.resolve({'last': 6}, 'ticker:BTC/USDT')
+    assert future.result() == {'last': 6}
+    assert await stream.__anext__() == {'last': 6}
+    # the stream ends with the error that watch would raise
+    client.reject(ExchangeError('disconnected'), 'ticker:BTC/USDT')
+    try:
+        await stream.__anext__()
+        assert False, 'expected an ExchangeError'
+    except ExchangeError:
+        pass
+    assert client.streams == {}
+    await exchange.close()
+
+
+async def test_stream_tickers():
+    exchange = StreamExchange({'id': 'test'})
+    client = exchange.client(url)
+    client.connected.resolve(url)
+    stream = exchange.stream_method('watch_tickers', ['BTC/USDT', 'ETH/USDT'])
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    client.resolve({'symbol': 'ETH/USDT'}, 'ticker:ETH/USDT')
+    assert await first == {'symbol': 'ETH/USDT'}
+    client.resolve({'symbol': 'BTC/USDT'}, 'ticker:BTC/USDT')
+    client.resolve({'symbol': 'ETH/USDT'}, 'ticker:ETH/USDT')
+    assert await stream.__anext__() == {'symbol': 'BTC/USDT'}
+    assert await stream.__anext__() == {'symbol': 'ETH/USDT'}
+    # closing the stream stops the queue
+    await stream.aclose()
+    assert client.streams == {}
+    await exchange.close()
+
+
+async def test_stream_trades():
+    # the items of a cache stored since the last update, with since and limit
+    exchange = StreamExchange({'id': 'test'})
+    client = exchange.client(url)
+    client.connected.resolve(url)
+    exchange.trades = ArrayCache(100)
+    stream = exchange.stream_trades('BTC/USDT', 2000, 2)
+
+    def store(*timestamps):
+        for timestamp in timestamps:
+            exchange.trades.append({'symbol': 'BTC/USDT', 'timestamp': timestamp})
+        client.resolve(exchange.trades, 'trades:BTC/USDT')
+
+    def read(trades):
+        return [trade['timestamp'] for trade in trades]
+
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    store(1000, 2000, 3000, 4000)
+    assert read(await first) == [3000, 4000]
+    store(5000)
+    store(6000, 7000)
+    assert read(await stream.__anext__()) == [5000]
+    assert read(await stream.__anext__()) == [6000, 7000]
+    store(8000, 9000, 10000)
+    assert read(await stream.__anext__()) == [9000, 10000]
+    # a cache resolved again with nothing new isn't an update
+    client.resolve(exchange.trades, 'trades:BTC/USDT')
+    store(1500, 11000)
+    assert read(await stream.__anext__()) == [11000]
+    await stream.aclose()
+    await exchange.close()
+
+
+def test_stream_read():
+    stream = Stream()
+    stream.started = True
+    # an order that is updated is read once, where it moved to
+    orders = ArrayCacheBySymbolById()
+    for order_id in ['a', 'b', 'c']:
+        orders.append({'symbol': 'BTC/USDT', 'id': order_id})
+    assert len(stream.read(orders)) == 3
+    orders.append({'symbol': 'BTC/USDT', 'id': 'a', 'status': 'closed'})
+    orders.append({'symbol': 'BTC/USDT', 'id': 'a', 'status': 'closed'})
+    assert stream.read(orders) == [{'symbol': 'BTC/USDT', 'id': 'a', 'status': 'closed'}]
+    assert stream.read(orders) == []
+    # the last candle is read again, it changes until the next one starts
+    ohlcv = ArrayCacheByTimestamp()
+    ohlcv.append([60000, 1, 1, 1, 1, 1])
+    ohlcv.append([120000, 1, 1, 1, 1, 1])
+    assert len(stream.read(ohlcv)) == 2
+    ohlcv.append([120000, 1, 2, 1, 2, 2])
+    ohlcv.append([180000, 2, 2, 2, 2, 1])
+    assert stream.read(ohlcv) == [[120000, 1, 2, 1, 2, 2], [180000, 2, 2, 2, 2, 1]]
+    # an order book is limited like watch_order_book returns it
+    orderbook = OrderBook({'asks': [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]}, 2)
+    assert stream.read(orderbook) is orderbook and len(orderbook['asks']) == 2
+
+
+async def test_stream_binance_trades():
+    # binance has a stream method of its own, the stream_* methods don't go through it
+    feed = FEEDS['binance']()
+    server = ReplayServer(feed, 0, 20)
+    exchange = exchange_for(feed, await server.start(), {'ws': {'client': 'protocol'}})
+    stream = exchange.stream_trades(feed.symbol)
+    try:
+        trades = []
+        while len(trades) < 20:
+            trades += await asyncio.wait_for(stream.__anext__(), 10)
+        assert [trade['id'] for trade in trades] == [str(i) for i in range(1, 21)]
+    finally:
+        await stream.aclose()
+        await exchange.close()
+        await server.stop()
+
+
+async def test_stream():
+    await test_stream_ticker()
+    await test_stream_tickers()
+    await test_stream_trades()
+    test_stream_read()
+    await test_stream_binance_trades()
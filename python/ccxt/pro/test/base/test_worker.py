@@ -0,0 +1,146 @@
+import os
+import sys
+import pickle
+import asyncio
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCache, ArrayCacheBySymbolById, ArrayCacheByTimestamp  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook  # noqa: E402
+from ccxt.async_support.base.ws.worker import WorkerExchange, WorkerPool  # noqa: E402
+from ccxt.pro.test.base.ws_replay import FEEDS, ReplayServer, exchange_for  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+class Connection:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        # through pickle like a pipe
+        self.sent.append(pickle.loads(pickle.dumps(message)))
+
+
+def worker():
+    exchange = type('Exchange', (WorkerExchange, Exchange), {})({'id': 'test'})
+    exchange.connection = Connection()
+    return exchange, exchange.client(url)
+
+
+def main_process():
+    exchange = Exchange({'id': 'test'})
+    return exchange, exchange.client(url), WorkerPool(exchange, 0)
+
+
+def deliver(exchange, pool):
+    for message in exchange.connection.sent:
+        pool.handle(0, message)
+    exchange.connection.sent = []
+
+
+def test_forward_caches():
+    exchange, client = worker()
+    main, main_client, pool = main_process()
+    caches = [
+        (ArrayCache(3), 'trades', lambda i: {'symbol': 'BTC/USDT', 'id': str(i), 'price': i}, 5),
+        (ArrayCacheBySymbolById(3), 'orders', lambda i: {'symbol': 'BTC/USDT', 'id': str(i % 2), 'price': i}, 2),
+        (ArrayCacheByTimestamp(3), 'ohlcv', lambda i: [i // 2, i, i, i, i, i], 3),
+    ]
+    for cache, message_hash, item, new_updates in caches:
+        future = main_client.future(message_hash)
+        cache.append(item(0))
+        client.resolve(cache, message_hash)
+        assert exchange.connection.sent[0][0] == 'copy'
+        deliver(exchange, pool)
+        copy = future.result()
+        assert list(copy) == list(cache)
+        # the copy gets the items appended in between and counts them as new
+        for i in range(1, 5):
+            cache.append(item(i))
+            client.resolve(cache, message_hash)
+        assert [message[0] for message in exchange.connection.sent] == ['update'] * 4
+        future = main_client.future(message_hash)
+        deliver(exchange, pool)
+        assert future.result() is copy
+        assert list(copy) == list(cache)
+        assert copy.getLimit('BTC/USDT', None) == new_updates
+
+
+def test_forward_order_books():
+    exchange, client = worker()
+    main, main_client, pool = main_process()
+    for book in [OrderBook({'asks': [[100, 1], [101, 2]], 'bids': [[99, 1]]}), IndexedOrderBook({'asks': [[100, 1, 'a'], [101, 2, 'b']], 'bids': [[99, 1, 'c']]})]:
+        indexed = isinstance(book, IndexedOrderBook)
+        future = main_client.future('orderbook')
+        client.resolve(book, 'orderbook')
+        deliver(exchange, pool)
+        copy = future.result()
+        book['asks'].storeArray([100, 0, 'a'] if indexed else [100, 0])
+        book['bids'].storeArray([98, 3, 'd'] if indexed else [98, 3])
+        book['timestamp'] = 1700000000000
+        client.resolve(book, 'orderbook')
+        assert exchange.connection.sent[0][0] == 'update'
+        future = main_client.future('orderbook')
+        deliver(exchange, pool)
+        assert future.result() is copy
+        assert copy == book
+        assert copy['timestamp'] == 1700000000000
+        # a reset sends the whole book again
+        book.reset({'asks': [[105, 1, 'e']] if indexed else [[105, 1]], 'bids': []})
+        client.resolve(book, 'orderbook')
+        assert exchange.connection.sent[0][0] == 'copy'
+        future = main_client.future('orderbook')
+        deliver(exchange, pool)
+        assert future.result() == book
+
+
+def test_forward_rejections():
+    exchange, client = worker()
+    main, main_client, pool = main_process()
+    future = main_client.future('ticker')
+    client.resolve({'symbol': 'BTC/USDT', 'last': 1}, 'ticker')
+    deliver(exchange, pool)
+    assert future.result() == {'symbol': 'BTC/USDT', 'last': 1}
+    future = main_client.future('ticker')
+    client.reject(ValueError('rejected'), 'ticker')
+    deliver(exchange, pool)
+    assert str(future.exception()) == 'rejected'
+    # a closed connection is subscribed again by the next watch
+    main_client.subscriptions['ticker'] = True
+    future = main_client.future('ticker')
+    pool.handle(0, ('close', url, None, None))
+    assert future.exception() is not None
+    assert url not in main.clients
+
+
+def test_worker():
+    test_forward_caches()
+    test_forward_order_books()
+    test_forward_rejections()
+
+
+async def test_worker_process():
+    # a worker process against the replay server, binance subscribes to the
+    # order book with a method of the exchange in the subscription
+    feed = FEEDS['binance']()
+    server = ReplayServer(feed, 0, 20)
+    exchange = exchange_for(feed, await server.start(), {'ws': {'workers': 1, 'client': 'protocol'}})
+    try:
+        # the worker imports ccxt.pro first
+        trades = await asyncio.wait_for(exchange.watch_trades(feed.symbol), 120)
+        while len(trades) < 20:
+            # the new trades of every call
+            trades += await asyncio.wait_for(exchange.watch_trades(feed.symbol), 10)
+        assert [trade['id'] for trade in trades] == [str(i) for i in range(1, 21)]
+        orderbook = await asyncio.wait_for(exchange.watch_order_book(feed.symbol), 10)
+        while orderbook['nonce'] != feed.sequence:
+            orderbook = await asyncio.wait_for(exchange.watch_order_book(feed.symbol), 10)
+        bids, asks = feed.sides()
+        assert [list(level) for level in orderbook['bids']] == [list(level) for level in bids]
+        assert [list(level) for level in orderbook['asks']] == [list(level) for level in asks]
+    finally:
+        await exchange.close()
+        await server.stop()
@@ -0,0 +1,46 @@
+import os
+import sys
+import json
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+from ccxt.pro.test.base.ws_replay import FEEDS, ReplayServer, exchange_for, load  # noqa: E402
+
+
+async def replay(feed, count, recording=None, streams=('trades', 'book')):
+    server = ReplayServer(feed, 0, count, recording)
+    url = await server.start()
+    exchange = exchange_for(feed, url, {'ws': {'client': 'protocol'}})
+    try:
+        report = await load(exchange, feed, streams, count, timeout=20, idle=0.05)
+        return exchange, report
+    finally:
+        await exchange.close()
+        await server.stop()
+
+
+async def test_ws_replay():
+    for id in ['binance', 'okx', 'bybit', 'kraken', 'htx']:
+        feed = FEEDS[id]()
+        exchange, report = await replay(feed, 50)
+        assert report['messages'] >= 100, id
+        assert report['latency']['total']['count'] >= 50, id
+        assert len(exchange.trades[feed.symbol]) == 50, id
+        # the deltas of the feed end up in the order book of the exchange
+        bids, asks = feed.sides()
+        orderbook = exchange.orderbooks[feed.symbol]
+        assert [list(level[:2]) for level in orderbook['bids']] == [list(level) for level in bids], id
+        assert [list(level[:2]) for level in orderbook['asks']] == [list(level) for level in asks], id
+    # a recording is sent over and over
+    feed = FEEDS['binance']()
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as file:
+        for i in range(3):
+            file.write(json.dumps({'e': 'trade', 'E': 1700000000000, 's': 'BTCUSDT', 't': i, 'p': '100', 'q': '1', 'T': 1700000000000, 'm': True}) + '\n')
+    try:
+        exchange, report = await replay(feed, 30, file.name, ('trades',))
+    finally:
+        os.remove(file.name)
+    trades = exchange.trades[feed.symbol]
+    assert len(trades) == 30 and [trade['id'] for trade in trades[:4]] == ['0', '1', '2', '0']
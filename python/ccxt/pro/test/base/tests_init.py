@@ -7,14 +7,46 @@ sys.path.append(root)
 from asyncio import run
 
 from ccxt.pro.test.base.test_order_book import test_ws_order_book  # noqa: F401
+from ccxt.pro.test.base.test_order_book_side import test_ws_order_book_side  # noqa: F401
 from ccxt.pro.test.base.test_cache import test_ws_cache  # noqa: F401
+from ccxt.pro.test.base.test_json_decoder import test_json_decoder  # noqa: F401
+from ccxt.pro.test.base.test_classifier import test_classifier  # noqa: F401
+from ccxt.pro.test.base.test_shard_client import test_shard_client  # noqa: F401
+from ccxt.pro.test.base.test_worker import test_worker, test_worker_process  # noqa: F401
+from ccxt.pro.test.base.test_fast_client import test_fast_client_queue  # noqa: F401
+from ccxt.pro.test.base.test_stream import test_stream  # noqa: F401
+from ccxt.pro.test.base.test_reconnect import test_reconnect, test_reconnect_private, test_reconnect_token  # noqa: F401
+from ccxt.pro.test.base.test_keepalive import test_keepalive  # noqa: F401
+from ccxt.pro.test.base.test_latency import test_latency  # noqa: F401
+from ccxt.pro.test.base.test_coalescer import test_coalescer  # noqa: F401
+from ccxt.pro.test.base.test_protocol_client import test_protocol_client  # noqa: F401
+from ccxt.pro.test.base.test_hub import test_hub, test_hub_transport  # noqa: F401
+from ccxt.pro.test.base.test_ws_replay import test_ws_replay  # noqa: F401
 # todo : from ccxt.pro.test.base.test_close import test_ws_close  # noqa: F401
 from ccxt.pro.test.base.test_future import test_ws_future  # noqa: F401
 from ccxt.pro.test.base.test_abnormal_close import test_abnormal_close  # noqa: F401
 
 def test_base_init_ws():
     test_ws_order_book()
+    test_ws_order_book_side()
     test_ws_cache()
+    test_json_decoder()
+    test_classifier()
+    test_shard_client()
+    test_worker()
     # todo : run(test_ws_close())
     run(test_ws_future())
+    run(test_fast_client_queue())
+    run(test_stream())
+    run(test_reconnect())
+    run(test_reconnect_private())
+    run(test_reconnect_token())
+    run(test_keepalive())
+    run(test_latency())
+    run(test_coalescer())
+    run(test_protocol_client())
+    run(test_hub())
+    run(test_hub_transport())
+    run(test_ws_replay())
+    run(test_worker_process())
     # run(test_abnormal_close()) stays in infinite loop in travis
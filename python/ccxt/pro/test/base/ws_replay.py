@@ -0,0 +1,487 @@
+"""A local websocket server that replays exchange messages, to load test the handlers
+
+ReplayServer serves the websocket feed of one exchange on localhost. It answers
+the subscriptions and pings the way the exchange does, and then every subscribed
+stream gets count messages at rate messages/sec, 0 for as fast as it can. The
+messages are synthetic trades and order book snapshots and deltas from the Feed
+of the exchange, or the lines of a recording, one JSON message per line, sent
+over and over. A recording is sent as it is, only synthetic messages have the
+current time for the exchange latency.
+
+exchange_for points a pro exchange at the server with set_markets and its urls,
+and load watches the streams and reports the messages/sec that the handlers
+sustained, the latency histograms of options['ws']['latency'] merged over the
+message hashes and the peak memory, see examples/py/pro-ws-replay-load.py.
+
+The feeds are binance, okx, bybit, kraken and htx, whose frames are gzipped.
+The order book deltas are random levels of a small book without checksums, the
+order books of the exchange end up the same as the book of the feed."""
+
+import gzip
+import json
+import time
+import random
+import asyncio
+import itertools
+from aiohttp import web, WSMsgType
+import ccxt.pro
+from ccxt.async_support.base.ws.latency import Histogram, STAGES
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def dumps(message):
+    return json.dumps(message, separators=(',', ':'))
+
+
+def now():
+    return int(time.time() * 1000)
+
+
+class Feed(object):
+    id = None
+    gzip = False
+    options = {}  # of the exchange
+    methods = {
+        'trades': 'watch_trades',
+        'book': 'watch_order_book',
+    }
+
+    def __init__(self, symbol='BTC/USDT', levels=10, seed=1):
+        self.symbol = symbol
+        self.base, self.quote = symbol.split('/')
+        self.random = random.Random(seed)
+        self.levels = levels
+        self.sequence = 1000
+        self.trade_id = 0
+        self.bids = dict((30000.0 - i * 0.5, self.amount()) for i in range(1, levels + 1))
+        self.asks = dict((30000.0 + i * 0.5, self.amount()) for i in range(1, levels + 1))
+
+    def amount(self):
+        return round(self.random.uniform(0.001, 2), 3)
+
+    def market(self, id, **extra):
+        market = {
+            'id': id,
+            'lowercaseId': id.lower(),
+            'symbol': self.symbol,
+            'base': self.base,
+            'quote': self.quote,
+            'baseId': self.base,
+            'quoteId': self.quote,
+            'type': 'spot',
+            'spot': True,
+            'margin': False,
+            'swap': False,
+            'future': False,
+            'option': False,
+            'contract': False,
+            'linear': None,
+            'inverse': None,
+            'active': True,
+            'precision': {'amount': 0.001, 'price': 0.1},
+            'limits': {},
+            'info': {},
+        }
+        market.update(extra)
+        return market
+
+    def point(self, exchange, url):
+        # the urls of the exchange to the server
+        raise NotImplementedError
+
+    def reply(self, request):
+        # the messages that answer a message of the client and the streams it subscribes to
+        return [], []
+
+    def rest(self, path):
+        # the response to a REST request, like the order book snapshot of binance
+        return None
+
+    def trade(self):
+        raise NotImplementedError
+
+    def snapshot(self):
+        raise NotImplementedError
+
+    def delta(self):
+        raise NotImplementedError
+
+    def next_trade(self):
+        self.trade_id += 1
+        return self.trade_id, round(30000 + self.random.uniform(-5, 5), 1), self.amount(), self.random.random() < 0.5
+
+    def next_delta(self):
+        # one level of one side, removed or with a new amount
+        self.sequence += 1
+        book = self.bids if self.random.random() < 0.5 else self.asks
+        sign = -1 if book is self.bids else 1
+        price = 30000.0 + sign * self.random.randint(1, self.levels) * 0.5
+        amount = 0.0 if self.random.random() < 0.2 else self.amount()
+        if amount:
+            book[price] = amount
+        else:
+            book.pop(price, None)
+        if book is self.bids:
+            return [[price, amount]], []
+        return [], [[price, amount]]
+
+    def sides(self):
+        bids = sorted(self.bids.items(), reverse=True)
+        asks = sorted(self.asks.items())
+        return bids, asks
+
+
+def strings(levels, *extra):
+    return [[str(price), str(amount)] + list(extra) for price, amount in levels]
+
+
+class Binance(Feed):
+    id = 'binance'
+
+    def point(self, exchange, url):
+        exchange.urls['api']['ws']['spot'] = url + '/ws'
+        exchange.urls['api']['public'] = url.replace('ws', 'http', 1) + '/api/v3'
+        exchange.set_markets([self.market('BTCUSDT')])
+
+    def reply(self, request):
+        streams = []
+        if request.get('method') == 'SUBSCRIBE':
+            for param in request['params']:
+                streams.append('book' if '@depth' in param else 'trades')
+        return [{'result': None, 'id': request.get('id')}], streams
+
+    def rest(self, path):
+        if path.endswith('/depth'):
+            bids, asks = self.sides()
+            return {'lastUpdateId': self.sequence, 'bids': strings(bids), 'asks': strings(asks)}
+        return None
+
+    def trade(self):
+        id, price, amount, maker = self.next_trade()
+        timestamp = now()
+        return {'e': 'trade', 'E': timestamp, 's': 'BTCUSDT', 't': id, 'p': str(price), 'q': str(amount), 'T': timestamp, 'm': maker, 'M': True}
+
+    def delta(self):
+        bids, asks = self.next_delta()
+        return {'e': 'depthUpdate', 'E': now(), 's': 'BTCUSDT', 'U': self.sequence, 'u': self.sequence, 'b': strings(bids), 'a': strings(asks)}
+
+
+class Okx(Feed):
+    id = 'okx'
+    options = {'watchOrderBook': {'checksum': False}}
+
+    def point(self, exchange, url):
+        exchange.urls['api']['ws'] = url + '/ws/v5'
+        exchange.set_markets([self.market('BTC-USDT')])
+
+    def reply(self, request):
+        if request == 'ping':
+            return ['pong'], []
+        messages = []
+        streams = []
+        for arg in request.get('args', []):
+            messages.append({'event': request.get('op'), 'arg': arg, 'connId': 'replay'})
+            if request.get('op') == 'subscribe':
+                if arg['channel'] == 'books':
+                    messages.append(self.snapshot())
+                    streams.append('book')
+                else:
+                    streams.append('trades')
+        return messages, streams
+
+    def trade(self):
+        id, price, amount, maker = self.next_trade()
+        return {'arg': {'channel': 'trades', 'instId': 'BTC-USDT'}, 'data': [{'instId': 'BTC-USDT', 'tradeId': str(id), 'px': str(price), 'sz': str(amount), 'side': 'sell' if maker else 'buy', 'ts': str(now())}]}
+
+    def book(self, action, bids, asks, previous):
+        return {
+            'arg': {'channel': 'books', 'instId': 'BTC-USDT'},
+            'action': action,
+            'data': [{'asks': strings(asks, '0', '1'), 'bids': strings(bids, '0', '1'), 'ts': str(now()), 'checksum': 0, 'seqId': self.sequence, 'prevSeqId': previous}],
+        }
+
+    def snapshot(self):
+        bids, asks = self.sides()
+        return self.book('snapshot', bids, asks, -1)
+
+    def delta(self):
+        bids, asks = self.next_delta()
+        return self.book('update', bids, asks, self.sequence - 1)
+
+
+class Bybit(Feed):
+    id = 'bybit'
+
+    def point(self, exchange, url):
+        exchange.urls['api']['ws']['public']['spot'] = url + '/v5/public/spot'
+        exchange.set_markets([self.market('BTCUSDT')])
+
+    def reply(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return [{'success': True, 'ret_msg': 'pong', 'conn_id': 'replay', 'req_id': request.get('req_id'), 'op': 'ping'}], []
+        streams = []
+        messages = [{'success': True, 'ret_msg': '', 'conn_id': 'replay', 'req_id': request.get('req_id'), 'op': op}]
+        if op == 'subscribe':
+            for topic in request.get('args', []):
+                if topic.startswith('orderbook'):
+                    messages.append(self.snapshot())
+                    streams.append('book')
+                else:
+                    streams.append('trades')
+        return messages, streams
+
+    def trade(self):
+        id, price, amount, maker = self.next_trade()
+        timestamp = now()
+        return {'topic': 'publicTrade.BTCUSDT', 'type': 'snapshot', 'ts': timestamp, 'data': [{'T': timestamp, 's': 'BTCUSDT', 'S': 'Sell' if maker else 'Buy', 'v': str(amount), 'p': str(price), 'L': 'PlusTick', 'i': str(id), 'BT': False}]}
+
+    def book(self, type, bids, asks):
+        return {'topic': 'orderbook.50.BTCUSDT', 'type': type, 'ts': now(), 'data': {'s': 'BTCUSDT', 'b': strings(bids), 'a': strings(asks), 'u': self.sequence, 'seq': self.sequence}}
+
+    def snapshot(self):
+        bids, asks = self.sides()
+        return self.book('snapshot', bids, asks)
+
+    def delta(self):
+        bids, asks = self.next_delta()
+        return self.book('delta', bids, asks)
+
+
+class Kraken(Feed):
+    id = 'kraken'
+    options = {'watchOrderBook': {'checksum': False}}
+    channels = {'trade': 1, 'book': 2}
+
+    def point(self, exchange, url):
+        exchange.urls['api']['ws']['public'] = url
+        exchange.set_markets([self.market('XBTUSDT', wsId='XBT/USDT', darkpool=False, info={'wsname': 'XBT/USDT'})])
+
+    def reply(self, request):
+        event = request.get('event')
+        if event == 'ping':
+            return [{'event': 'pong', 'reqid': request.get('reqid')}], []
+        if event != 'subscribe':
+            return [], []
+        name = request['subscription']['name']
+        messages = [{
+            'channelID': self.channels[name],
+            'channelName': 'book-10' if name == 'book' else name,
+            'event': 'subscriptionStatus',
+            'pair': 'XBT/USDT',
+            'reqid': request.get('reqid'),
+            'status': 'subscribed',
+            'subscription': request['subscription'],
+        }]
+        if name == 'book':
+            messages.append(self.snapshot())
+            return messages, ['book']
+        return messages, ['trades']
+
+    def trade(self):
+        id, price, amount, maker = self.next_trade()
+        return [1, [[str(price), str(amount), '%.6f' % time.time(), 's' if maker else 'b', 'l', '']], 'trade', 'XBT/USDT']
+
+    def snapshot(self):
+        bids, asks = self.sides()
+        timestamp = '%.6f' % time.time()
+        return [2, {'as': strings(asks, timestamp), 'bs': strings(bids, timestamp)}, 'book-10', 'XBT/USDT']
+
+    def delta(self):
+        bids, asks = self.next_delta()
+        timestamp = '%.6f' % time.time()
+        if bids:
+            return [2, {'b': strings(bids, timestamp), 'c': '0'}, 'book-10', 'XBT/USDT']
+        return [2, {'a': strings(asks, timestamp), 'c': '0'}, 'book-10', 'XBT/USDT']
+
+
+class Htx(Feed):
+    id = 'htx'
+    gzip = True
+
+    def point(self, exchange, url):
+        exchange.urls['api']['ws']['api']['spot']['public'] = url + '/ws'
+        exchange.urls['api']['ws']['api']['spot']['feed'] = url + '/feed'
+        exchange.set_markets([self.market('btcusdt')])
+
+    def reply(self, request):
+        if 'sub' in request:
+            channel = request['sub']
+            messages = [{'id': request.get('id'), 'status': 'ok', 'subbed': channel, 'ts': now()}]
+            if '.mbp.' in channel:
+                # the snapshot is requested once a delta is cached
+                messages.append(self.delta())
+                return messages, ['book']
+            return messages, ['trades']
+        if 'req' in request:
+            bids, asks = self.sides()
+            return [{'id': request.get('id'), 'rep': request['req'], 'status': 'ok', 'ts': now(), 'data': {'seqNum': self.sequence, 'bids': [list(level) for level in bids], 'asks': [list(level) for level in asks]}}], []
+        return [], []
+
+    def trade(self):
+        id, price, amount, maker = self.next_trade()
+        timestamp = now()
+        return {'ch': 'market.btcusdt.trade.detail', 'ts': timestamp, 'tick': {'id': id, 'ts': timestamp, 'data': [{'id': id, 'ts': timestamp, 'tradeId': id, 'amount': amount, 'price': price, 'direction': 'sell' if maker else 'buy'}]}}
+
+    def delta(self):
+        bids, asks = self.next_delta()
+        return {'ch': 'market.btcusdt.mbp.150', 'ts': now(), 'tick': {'seqNum': self.sequence, 'prevSeqNum': self.sequence - 1, 'bids': bids, 'asks': asks}}
+
+
+FEEDS = dict((feed.id, feed) for feed in [Binance, Okx, Bybit, Kraken, Htx])
+
+
+class ReplayServer(object):
+
+    def __init__(self, feed, rate=0, count=10000, recording=None):
+        self.feed = feed
+        self.rate = rate  # messages/sec of each stream, 0 for as fast as it can
+        self.count = count  # messages of each stream
+        self.recording = None
+        if recording is not None:
+            with open(recording) as file:
+                self.recording = [line.strip() for line in file if line.strip()]
+        self.runner = None
+        self.sent = 0
+        self.tasks = set()
+
+    async def start(self, host='127.0.0.1', port=0):
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        return 'ws://' + host + ':' + str(self.runner.addresses[0][1])
+
+    async def stop(self):
+        for task in list(self.tasks):
+            task.cancel()
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def handler(self, request):
+        if request.headers.get('Upgrade', '').lower() != 'websocket':
+            response = self.feed.rest(request.path)
+            if response is None:
+                raise web.HTTPNotFound()
+            return web.json_response(response)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if self.feed.gzip:
+            # htx pings with a message of its own
+            await self.send(ws, {'ping': now()})
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            data = message.data
+            try:
+                data = json.loads(data)
+            except ValueError:
+                pass
+            replies, streams = self.feed.reply(data)
+            for reply in replies:
+                await self.send(ws, reply)
+            for stream in streams:
+                task = asyncio.ensure_future(self.replay(ws, stream))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+        return ws
+
+    async def send(self, ws, message):
+        if not isinstance(message, str):
+            message = dumps(message)
+        if self.feed.gzip:
+            await ws.send_bytes(gzip.compress(message.encode(), 1))
+        else:
+            await ws.send_str(message)
+
+    async def replay(self, ws, stream):
+        loop = asyncio.get_running_loop()
+        if self.recording is not None:
+            messages = itertools.cycle(self.recording)
+        else:
+            make = self.feed.trade if stream == 'trades' else self.feed.delta
+            messages = (make() for i in itertools.count())
+        start = loop.time()
+        try:
+            for i in range(self.count):
+                if self.rate:
+                    delay = start + i / self.rate - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await self.send(ws, next(messages))
+                self.sent += 1
+        except ConnectionResetError:
+            pass
+
+
+def exchange_for(feed, url, options={}):
+    exchange_options = ccxt.pro.Exchange.deep_extend(feed.options, {'ws': {'latency': True}}, options)
+    exchange = getattr(ccxt.pro, feed.id)({'enableRateLimit': False, 'options': exchange_options})
+    feed.point(exchange, url)
+    return exchange
+
+
+def max_rss():
+    # MB, ru_maxrss is in KB on linux
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def load(exchange, feed, streams=('trades', 'book'), count=10000, timeout=60, idle=0.2):
+    # watches the streams until count messages of each were handled and then nothing came for idle seconds
+    loop = asyncio.get_running_loop()
+
+    async def consume(method):
+        while True:
+            await getattr(exchange, method)(feed.symbol)
+
+    def received():
+        return sum(client.messages for client in exchange.clients.values())
+
+    consumers = [asyncio.ensure_future(consume(feed.methods[stream])) for stream in streams]
+    start = loop.time()
+    first = last = None
+    seen = 0
+    try:
+        while True:
+            done = [consumer for consumer in consumers if consumer.done()]
+            if done:
+                done[0].result()
+            messages = received()
+            time_now = loop.time()
+            if messages != seen:
+                seen = messages
+                last = time_now
+                if first is None:
+                    first = time_now
+            elif seen >= count * len(streams) and time_now - last > idle:
+                break
+            if time_now - start > timeout:
+                raise asyncio.TimeoutError('received ' + str(seen) + ' messages in ' + str(timeout) + ' seconds')
+            await asyncio.sleep(0.001)
+    finally:
+        for consumer in consumers:
+            consumer.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+    latency = dict((stage, Histogram()) for stage in STAGES)
+    for client in exchange.clients.values():
+        if client.latencies is not None:
+            for histograms in client.latencies.histograms.values():
+                for stage in STAGES:
+                    latency[stage].merge(histograms[stage])
+    seconds = max(last - first, 1e-6)
+    return {
+        'exchange': exchange.id,
+        'messages': seen,
+        'seconds': seconds,
+        'rate': seen / seconds,
+        'latency': dict((stage, latency[stage].summary()) for stage in STAGES),
+        'maxrss': max_rss(),
+    }
@@ -183,6 +183,12 @@ export default class Client {
         return result
     }
 
+    batchedIds (id: Str): Str[] {
+        // the ids of the messages that were sent as one message with this id
+        // subscriptions are only sent together in python, see options['ws']['coalesceSubscriptions']
+        return [ id ]
+    }
+
     log (... args: any[]) {
         console.log (... args)
         // console.dir (args, { depth: null })
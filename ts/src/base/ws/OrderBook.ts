@@ -102,6 +102,9 @@ class OrderBook implements CustomOrderBookProp {
     reset (snapshot = {}) {
         this.asks.index.fill (Number.MAX_VALUE)
         this.asks.length = 0
+        if (this.asks.strings !== undefined) {
+            this.asks.strings.clear ()
+        }
         if (snapshot.asks) {
             for (let i = 0; i < snapshot.asks.length; i++) {
                 this.asks.storeArray (snapshot.asks[i])
@@ -109,6 +112,9 @@ class OrderBook implements CustomOrderBookProp {
         }
         this.bids.index.fill (Number.MAX_VALUE)
         this.bids.length = 0
+        if (this.bids.strings !== undefined) {
+            this.bids.strings.clear ()
+        }
         if (snapshot.bids) {
             for (let i = 0; i < snapshot.bids.length; i++) {
                 this.bids.storeArray (snapshot.bids[i])
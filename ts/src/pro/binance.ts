@@ -97,6 +97,12 @@ export default class binance extends binanceRest {
             },
             'options': {
                 'returnRateLimits': false,
+                // options['ws']['coalesceSubscriptions'] merges the params of the subscriptions sent together
+                'subscriptionBatch': {
+                    'field': 'params',
+                    'id': 'id',
+                    'limit': 200,
+                },
                 'streamLimits': {
                     'spot': 50, // max 1024
                     'margin': 50, // max 1024
@@ -879,9 +885,7 @@ export default class binance extends binanceRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        this.handleDeltasWithKeys (bookside, deltas);
     }
 
     handleOrderBookMessage (client: Client, message, orderbook) {
@@ -1025,14 +1029,18 @@ export default class binance extends binanceRest {
         //
         const id = this.safeString (message, 'id');
         const subscriptionsById = this.indexBy (client.subscriptions, 'id');
-        const subscription = this.safeValue (subscriptionsById, id, {});
-        const method = this.safeValue (subscription, 'method');
-        if (method !== undefined) {
-            method.call (this, client, message, subscription);
-        }
-        const isUnSubMessage = this.safeBool (subscription, 'unsubscribe', false);
-        if (isUnSubMessage) {
-            this.handleUnSubscription (client, subscription);
+        // a message sent together with others acknowledges all of them, see Client.batchedIds
+        const ids = client.batchedIds (id);
+        for (let i = 0; i < ids.length; i++) {
+            const subscription = this.safeValue (subscriptionsById, ids[i], {});
+            const method = this.safeValue (subscription, 'method');
+            if (method !== undefined) {
+                method.call (this, client, message, subscription);
+            }
+            const isUnSubMessage = this.safeBool (subscription, 'unsubscribe', false);
+            if (isUnSubMessage) {
+                this.handleUnSubscription (client, subscription);
+            }
         }
         return message;
     }
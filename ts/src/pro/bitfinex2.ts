@@ -624,7 +624,8 @@ export default class bitfinex2 extends bitfinex2Rest {
                     const size = (amount < 0) ? -amount : amount;
                     const side = (amount < 0) ? 'asks' : 'bids';
                     const bookside = orderbook[side];
-                    bookside.storeArray ([ price, size, counter ]);
+                    // the checksum uses the signed amount
+                    bookside.storeStringArray ([ price, size, counter ], [ this.numberToString (price), this.numberToString (amount) ]);
                 }
             }
             orderbook['symbol'] = symbol;
@@ -650,7 +651,8 @@ export default class bitfinex2 extends bitfinex2Rest {
                 const size = Precise.stringLt (amount, '0') ? Precise.stringNeg (amount) : amount;
                 const side = Precise.stringLt (amount, '0') ? 'asks' : 'bids';
                 const bookside = orderbookItem[side];
-                bookside.storeArray ([ this.parseNumber (price), this.parseNumber (size), this.parseNumber (counter) ]);
+                const parsedPrice = this.parseNumber (price);
+                bookside.storeStringArray ([ parsedPrice, this.parseNumber (size), this.parseNumber (counter) ], [ this.numberToString (parsedPrice), this.numberToString (this.parseNumber (amount)) ]);
             }
             client.resolve (orderbook, messageHash);
         }
@@ -676,17 +678,33 @@ export default class bitfinex2 extends bitfinex2Rest {
         const isRaw = (prec === 'R0');
         const idToCheck = isRaw ? 2 : 0;
         // pepperoni pizza from bitfinex
-        for (let i = 0; i < depth; i++) {
-            const bid = this.safeValue (bids, i);
-            const ask = this.safeValue (asks, i);
-            if (bid !== undefined) {
-                stringArray.push (this.numberToString (bids[i][idToCheck]));
-                stringArray.push (this.numberToString (bids[i][1]));
+        if (isRaw) {
+            for (let i = 0; i < depth; i++) {
+                const bid = this.safeValue (bids, i);
+                const ask = this.safeValue (asks, i);
+                if (bid !== undefined) {
+                    stringArray.push (this.numberToString (bids[i][idToCheck]));
+                    stringArray.push (this.numberToString (bids[i][1]));
+                }
+                if (ask !== undefined) {
+                    stringArray.push (this.numberToString (asks[i][idToCheck]));
+                    const aski1 = asks[i][1];
+                    stringArray.push (this.numberToString (-aski1));
+                }
             }
-            if (ask !== undefined) {
-                stringArray.push (this.numberToString (asks[i][idToCheck]));
-                const aski1 = asks[i][1];
-                stringArray.push (this.numberToString (-aski1));
+        } else {
+            // price level books keep the checksum strings of their top levels
+            const bidStrings = bids.topStrings (depth);
+            const askStrings = asks.topStrings (depth);
+            for (let i = 0; i < depth; i++) {
+                if (i * 2 < bidStrings.length) {
+                    stringArray.push (bidStrings[i * 2]);
+                    stringArray.push (bidStrings[i * 2 + 1]);
+                }
+                if (i * 2 < askStrings.length) {
+                    stringArray.push (askStrings[i * 2]);
+                    stringArray.push (askStrings[i * 2 + 1]);
+                }
             }
         }
         const payload = stringArray.join (':');
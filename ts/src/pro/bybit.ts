@@ -102,6 +102,12 @@ export default class bybit extends bybitRest {
                 },
             },
             'options': {
+                // options['ws']['coalesceSubscriptions'] merges the args of the subscriptions sent together, spot takes 10 per message
+                'subscriptionBatch': {
+                    'field': 'args',
+                    'id': 'req_id',
+                    'limit': 10,
+                },
                 'watchTicker': {
                     'name': 'tickers', // 'tickers' for 24hr statistical ticker or 'tickers_lt' for leverage token ticker
                 },
@@ -1012,9 +1018,7 @@ export default class bybit extends bybitRest {
     }
 
     handleDeltas (bookside, deltas) {
-        for (let i = 0; i < deltas.length; i++) {
-            this.handleDelta (bookside, deltas[i]);
-        }
+        this.handleDeltasWithKeys (bookside, deltas);
     }
 
     async watchTrades (symbol: string, since: Int = undefined, limit: Int = undefined, params = {}): Promise<Trade[]> {
@@ -2558,6 +2562,8 @@ export default class bybit extends bybitRest {
         //     },
         // }
         const reqId = this.safeString (message, 'req_id');
+        // a message sent together with others acknowledges all of them, see Client.batchedIds
+        const reqIds = client.batchedIds (reqId);
         const keys = Object.keys (client.subscriptions);
         for (let i = 0; i < keys.length; i++) {
             const messageHash = keys[i];
@@ -2568,7 +2574,7 @@ export default class bybit extends bybitRest {
             if (messageHash.startsWith ('unsubscribe')) {
                 const subscription = client.subscriptions[messageHash];
                 const subId = this.safeString (subscription, 'id');
-                if (reqId !== subId) {
+                if (!this.inArray (subId, reqIds)) {
                     continue;
                 }
                 const messageHashes = this.safeList (subscription, 'messageHashes', []);